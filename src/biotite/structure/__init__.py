@@ -82,6 +82,8 @@ __author__ = "Patrick Kunzmann"
 
 from .atoms import *
 from .bonds import *
+from .builder import *
+from .categorical import *
 from .celllist import *
 from .compare import *
 from .error import *
@@ -90,6 +92,7 @@ from .geometry import *
 from .hbond import *
 from .integrity import *
 from .mechanics import *
+from .pairwise import *
 from .residues import *
 from .sasa import *
 from .sse import *
@@ -5,6 +5,8 @@
 from .adjacency import *
 from .atoms import *
 from .bonds import *
+from .builder import *
+from .categorical import *
 from .celllist import *
 from .compare import *
 from .error import *
@@ -13,6 +15,7 @@ from .geometry import *
 from .hbond import *
 from .integrity import *
 from .mechanics import *
+from .pairwise import *
 from .residues import *
 from .sasa import *
 from .sse import *
@@ -8,12 +8,14 @@ This module contains the main types of the `Structure` subpackage:
 """
 
 __author__ = "Patrick Kunzmann"
-__all__ = ["Atom", "AtomArray", "AtomArrayStack", "array", "stack", "coord"]
+__all__ = ["Atom", "AtomView", "AtomArray", "AtomArrayStack", "array",
+           "stack", "coord"]
 
 import numbers
 import abc
 import numpy as np
 from .bonds import BondList
+from .categorical import CategoricalArray
 from ..copyable import Copyable
 
 
@@ -32,6 +34,8 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
         self._array_length = length
         self._coord = None
         self._bonds = None
+        # Residue starts cached by 'get_residue_starts()'
+        self._residue_starts = None
         self.add_annotation("chain_id", dtype="U3")
         self.add_annotation("res_id", dtype=int)
         self.add_annotation("res_name", dtype="U3")
@@ -75,6 +79,7 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
         if category not in self._annot:
             self._annot[str(category)] = np.zeros(self._array_length,
                                                   dtype=dtype)
+            self._residue_starts = None
             
     def del_annotation(self, category):
         """
@@ -85,8 +90,9 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
         category : str
             The annotation category to be removed.
         """
-        if category not in self._annot:
+        if category in self._annot:
             del self._annot[str(category)]
+            self._residue_starts = None
             
     def get_annotation(self, category):
         """
@@ -117,18 +123,24 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
         ----------
         category : str
             The annotation category to be set.
-        array : ndarray or None
+        array : ndarray or CategoricalArray
             The new value of the annotation category. The size of the
             array must be the same as the array length.
+            A `CategoricalArray` reduces the memory consumption and
+            speeds up comparisons for annotations with few distinct
+            values.
         """
-        if not isinstance(array, np.ndarray):
-            raise TypeError("Annotation must be an 'ndarray'")
+        if not isinstance(array, (np.ndarray, CategoricalArray)):
+            raise TypeError(
+                "Annotation must be an 'ndarray' or 'CategoricalArray'"
+            )
         if len(array) != self._array_length:
             raise IndexError(
                 f"Expected array length {self._array_length}, "
                 f"but got {len(array)}"
             )
         self._annot[category] = array
+        self._residue_starts = None
         
     def get_annotation_categories(self):
         """
@@ -141,16 +153,133 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
         """
         return list(self._annot.keys())
             
+    def view(self, index):
+        """
+        Obtain a subarray (substack), that shares the annotation arrays
+        and coordinates with this object, instead of copying them.
+
+        In contrast to indexing via ``[]``, only basic indices
+        (slices and integers) are accepted, which guarantees that no
+        annotation array or coordinates are copied.
+        This makes repeated selection of e.g. chains or residue windows
+        from a large structure cheap.
+
+        Parameters
+        ----------
+        index : int or slice or tuple(int or slice, int or slice)
+            The atoms to be selected.
+            For an `AtomArrayStack` this may also be an integer or a
+            slice selecting models, or a tuple selecting models and
+            atoms.
+            An integer model index gives an `AtomArray`.
+
+        Returns
+        -------
+        view : AtomArray or AtomArrayStack or AtomView
+            The view of the selected atoms (models).
+            An integer atom index gives an `AtomView` of a single atom.
+
+        Notes
+        -----
+        Like for *NumPy* views, in-place modifications of the shared
+        arrays in the view (e.g. ``view.res_id[0] = 42`` or
+        ``view.coord += 1``) also affect this object, and vice versa.
+        Assigning a new annotation array or new coordinates to the
+        view (e.g. ``view.res_id = new_res_id``) only affects the view.
+        Use `copy()` to obtain an independent object.
+        
+        If all atoms are selected, the view also shares the
+        `BondList`, otherwise the `BondList` of the view is created
+        from the bonds of the selected atoms.
+        """
+        if isinstance(self, AtomArray):
+            if isinstance(index, tuple):
+                if len(index) == 2 and index[0] is Ellipsis:
+                    index = index[1]
+                else:
+                    raise IndexError(
+                        "'AtomArray' does not accept multidimensional "
+                        "indices"
+                    )
+            if isinstance(index, numbers.Integral):
+                return AtomView(self, index)
+            return self._atom_view(index)
+
+        if isinstance(index, tuple):
+            if len(index) != 2:
+                raise IndexError(
+                    "'AtomArrayStack' does not accept an index "
+                    "with more than two dimensions"
+                )
+            model_index, atom_index = index
+        else:
+            model_index, atom_index = index, slice(None)
+        if model_index is Ellipsis:
+            model_index = slice(None)
+        if isinstance(model_index, numbers.Integral):
+            # The stack is reduced to an array
+            array = AtomArray(0)
+            array._annot = dict(self._annot)
+            array._array_length = self._array_length
+            array._coord = self._coord[model_index]
+            array._bonds = self._bonds
+            array._residue_starts = self._residue_starts
+            return array.view(atom_index)
+        elif isinstance(model_index, slice):
+            if isinstance(atom_index, numbers.Integral):
+                raise IndexError(
+                    "A view of a single atom requires an integer model index"
+                )
+            new_stack = self._atom_view(atom_index)
+            new_stack._coord = new_stack._coord[model_index]
+            return new_stack
+        else:
+            raise IndexError(
+                f"A view requires an integer or a slice as model index, "
+                f"not '{type(model_index).__name__}'"
+            )
+
+    def _atom_view(self, index):
+        """
+        Create a view of this object for the given atom slice.
+        """
+        if index is Ellipsis:
+            index = slice(None)
+        if not isinstance(index, slice):
+            raise IndexError(
+                f"A view requires a slice as atom index, "
+                f"not '{type(index).__name__}'"
+            )
+        new_object = self._new_instance(self._coord[..., index, :])
+        for name, annotation in self._annot.items():
+            new_object._annot[name] = annotation[index]
+        if index.indices(self._array_length) == (0, self._array_length, 1):
+            # All atoms are selected
+            # -> bonds and residues of the view and this object are equal
+            new_object._bonds = self._bonds
+            new_object._residue_starts = self._residue_starts
+        elif self._bonds is not None:
+            new_object._bonds = self._bonds[index]
+        return new_object
+
+    def _new_instance(self, coord):
+        """
+        Create an instance of the same class with the given
+        coordinates and without annotation arrays.
+        Neither annotation arrays nor coordinates are allocated.
+        """
+        if isinstance(self, AtomArray):
+            new_object = AtomArray(0)
+        else:
+            new_object = AtomArrayStack(0, 0)
+        new_object._annot = {}
+        new_object._array_length = coord.shape[-2]
+        new_object._coord = coord
+        return new_object
+            
     def _subarray(self, index):
         # Index is one dimensional (boolean mask, index array)
-        new_coord = self._coord[..., index, :]
-        new_length = new_coord.shape[-2]
-        if isinstance(self, AtomArray):
-            new_object = AtomArray(new_length)
-        elif isinstance(self, AtomArrayStack):
-            new_depth = new_coord.shape[-3]
-            new_object = AtomArrayStack(new_depth, new_length)
-        new_object._coord = new_coord
+        new_object = self._new_instance(self._coord[..., index, :])
         if self._bonds is not None:
             new_object._bonds = self._bonds[index]
         for annotation in self._annot:
@@ -163,6 +292,7 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
             if isinstance(index, numbers.Integral):
                 for name in self._annot:
                     self._annot[name][index] = atom._annot[name]
+                self._residue_starts = None
                 self._coord[..., index, :] = atom.coord
             else:
                 raise TypeError(
@@ -177,6 +307,7 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
                 self._annot[name] = np.delete(self._annot[name], index, axis=0)
             self._coord = np.delete(self._coord, index, axis=-2)
             self._array_length = self._coord.shape[-2]
+            self._residue_starts = None
             if self._bonds is not None:
                 mask = np.ones(self._bonds.get_atom_count(), dtype=bool)
                 mask[index] = False
@@ -233,6 +364,13 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
         from the dictionary.
         Exposes coordinates.
         """
+        if attr == "_annot":
+            # The annotation dictionary is not set yet,
+            # e.g. while unpickling
+            # -> prevent infinite recursion
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{attr}'"
+            )
         if attr == "coord":
             return self._coord
         if attr == "bonds":
@@ -426,6 +564,8 @@ class Atom(object):
                        self.coord[0], self.coord[1], self.coord[2])
     
     def __eq__(self, item):
+        if isinstance(item, AtomView):
+            item = item.to_atom()
         if not isinstance(item, Atom):
             return False
         if not np.array_equal(self.coord, item.coord):
@@ -440,6 +580,124 @@ class Atom(object):
     def __ne__(self, item):
         return not self == item
 
+
+class AtomView(object):
+    """
+    A lightweight representation of a single atom in an `AtomArray`.
+
+    In contrast to an `Atom`, an `AtomView` does not copy the
+    annotations and coordinates of the atom, but reads them lazily from
+    the annotation arrays and coordinates of the parent array.
+    Hence, the creation of an `AtomView` is cheap, which makes it
+    suitable for per-atom access in loops over large arrays.
+    Setting an annotation or the coordinates of an `AtomView` modifies
+    the parent array.
+
+    An `AtomView` is usually obtained via `AtomArray.view()` with an
+    integer index.
+
+    Parameters
+    ----------
+    array : AtomArray
+        The parent array.
+    index : int
+        The index of the atom in the parent array.
+
+    Attributes
+    ----------
+    {annot} : scalar
+        Annotations for this atom.
+    coord : ndarray, dtype=float
+        ndarray containing the x, y and z coordinate of the atom.
+        This is a view of the coordinates of the parent array.
+
+    Examples
+    --------
+
+    >>> atom_array = array([
+    ...     Atom([1,2,3], chain_id="A", atom_name="N"),
+    ...     Atom([2,3,4], chain_id="A", atom_name="CA")
+    ... ])
+    >>> atom = atom_array.view(1)
+    >>> print(atom.atom_name)
+    CA
+    >>> atom.chain_id = "B"
+    >>> print(atom_array.chain_id)
+    ['A' 'B']
+    """
+
+    __slots__ = ("_array", "_index")
+
+    def __init__(self, array, index):
+        if not isinstance(index, numbers.Integral):
+            raise TypeError(
+                f"Index must be integer, not '{type(index).__name__}'"
+            )
+        length = array.array_length()
+        if index < -length or index >= length:
+            raise IndexError(
+                f"Index {index} is out of range "
+                f"for an array of length {length}"
+            )
+        if index < 0:
+            index += length
+        super().__setattr__("_array", array)
+        super().__setattr__("_index", index)
+
+    @property
+    def coord(self):
+        return self._array._coord[self._index]
+
+    def to_atom(self):
+        """
+        Create an `Atom`, that contains a copy of the annotations and
+        coordinates of this atom.
+
+        Returns
+        -------
+        atom : Atom
+            The atom.
+        """
+        return self._array.get_atom(self._index)
+
+    def __getattr__(self, attr):
+        if attr in AtomView.__slots__:
+            # The slots are not set yet, e.g. while unpickling
+            # -> prevent infinite recursion
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{attr}'"
+            )
+        annotation = self._array._annot.get(attr)
+        if annotation is None:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{attr}'"
+            )
+        return annotation[self._index]
+
+    def __setattr__(self, attr, value):
+        if attr == "coord":
+            self._array._coord[self._index] = value
+        elif attr in self._array._annot:
+            self._array._annot[attr][self._index] = value
+        else:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{attr}'"
+            )
+
+    def __reduce__(self):
+        return AtomView, (self._array, self._index)
+
+    def __str__(self):
+        return str(self.to_atom())
+
+    def __eq__(self, item):
+        if isinstance(item, AtomView):
+            item = item.to_atom()
+        return self.to_atom() == item
+
+    def __ne__(self, item):
+        return not self == item
+
     
 class AtomArray(_AtomArrayBase):
     """
@@ -479,6 +737,12 @@ class AtomArray(_AtomArrayBase):
     ----------
     length : int
         The fixed amount of atoms in the array.
+    coord_dtype : dtype, optional
+        The data type of the coordinates.
+        By default, the coordinates have double precision.
+        ``np.float32`` halves the memory consumption of the coordinates
+        and avoids conversions in functions, that compute internally
+        with single precision.
     
     Attributes
     ----------
@@ -528,12 +792,12 @@ class AtomArray(_AtomArrayBase):
     ['A' 'C' 'A']
     """
     
-    def __init__(self, length):
+    def __init__(self, length, coord_dtype=float):
         super().__init__(length)
         if length is None:
             self._coord = None
         else:
-            self._coord = np.full((length, 3), np.nan, dtype=float)
+            self._coord = np.full((length, 3), np.nan, dtype=coord_dtype)
     
     def get_atom(self, index):
         """
@@ -556,6 +820,54 @@ class AtomArray(_AtomArrayBase):
             kwargs[name] = annotation[index]
         return Atom(coord = self._coord[index], kwargs=kwargs)
     
+    def as_records(self):
+        """
+        Convert the atom array into a structured `ndarray`, with one
+        record per atom.
+
+        The structured array contains a field for each annotation
+        category and a ``coord`` field with the x, y and z coordinates.
+        Accessing a record (e.g. ``records[i]``) is much cheaper than
+        creating an `Atom` via ``array[i]``, so this representation is
+        suitable, if the atoms need to be processed one by one.
+        The records are a copy of the data, i.e. modifications of the
+        records do not affect the atom array.
+
+        Returns
+        -------
+        records : ndarray, dtype=structured
+            The atom records.
+
+        See Also
+        --------
+        AtomView
+
+        Examples
+        --------
+
+        >>> atom_array = array([
+        ...     Atom([1,2,3], chain_id="A", res_id=1, atom_name="N"),
+        ...     Atom([2,3,4], chain_id="A", res_id=1, atom_name="CA")
+        ... ])
+        >>> records = atom_array.as_records()
+        >>> print(records.dtype.names)
+        ('chain_id', 'res_id', 'res_name', 'hetero', 'atom_name', 'element', 'coord')
+        >>> print(records[1]["atom_name"], records[1]["coord"])
+        CA [2. 3. 4.]
+        """
+        annotations = {
+            name: np.asarray(annotation)
+            for name, annotation in self._annot.items()
+        }
+        dtype = [(name, annotation.dtype)
+                 for name, annotation in annotations.items()]
+        dtype.append(("coord", self._coord.dtype, (3,)))
+        records = np.empty(self._array_length, dtype=dtype)
+        for name, annotation in annotations.items():
+            records[name] = annotation
+        records["coord"] = self._coord
+        return records
+    
     def __iter__(self):
         """
         Iterate through the array.
@@ -662,7 +974,7 @@ class AtomArray(_AtomArrayBase):
         return "\n".join([str(atom) for atom in self])
     
     def __copy_create__(self):
-        return AtomArray(self.array_length())
+        return AtomArray(self.array_length(), self._coord.dtype)
 
 
 class AtomArrayStack(_AtomArrayBase):
@@ -695,6 +1007,11 @@ class AtomArrayStack(_AtomArrayBase):
     length : int
         The fixed amount of atoms in each array in the stack. When
         indexing, this is the length of the second dimension.
+    coord_dtype : dtype, optional
+        The data type of the coordinates.
+        By default, the coordinates have double precision.
+        ``np.float32`` halves the memory consumption of the coordinates,
+        which is especially relevant for large trajectories.
     
     Attributes
     ----------
@@ -740,12 +1057,12 @@ class AtomArrayStack(_AtomArrayBase):
       [6 7 8]]]
     """
     
-    def __init__(self, depth, length):
+    def __init__(self, depth, length, coord_dtype=float):
         super().__init__(length)
         if depth == None or length == None:
             self._coord = None
         else:
-            self._coord = np.zeros((depth, length, 3), dtype=float)
+            self._coord = np.zeros((depth, length, 3), dtype=coord_dtype)
     
     def get_array(self, index):
         """
@@ -931,7 +1248,9 @@ class AtomArrayStack(_AtomArrayBase):
         return string
     
     def __copy_create__(self):
-        return AtomArrayStack(self.stack_depth(), self.array_length())
+        return AtomArrayStack(
+            self.stack_depth(), self.array_length(), self._coord.dtype
+        )
 
 
 def array(atoms):
@@ -940,7 +1259,7 @@ def array(atoms):
     
     Parameters
     ----------
-    atoms : iterable(Atom)
+    atoms : iterable(Atom or AtomView)
         The atoms to be combined in an array.
     
     Returns
@@ -960,6 +1279,8 @@ def array(atoms):
     >>> print(atom_array.array_length())
     3
     """
+    atoms = [atom.to_atom() if isinstance(atom, AtomView) else atom
+             for atom in atoms]
     # Check if all atoms have the same annotation names
     # Equality check requires sorting
     names = sorted(atoms[0]._annot.keys())
@@ -1027,7 +1348,9 @@ def stack(arrays):
         # Check if all arrays share equal annotations
         if not array.equal_annotations(arrays[0]):
             raise ValueError("The atom arrays have unequal annotations")
-    array_stack = AtomArrayStack(array_count, arrays[0].array_length())
+    # The coordinates are not allocated here,
+    # as they are replaced by the stacked coordinates anyway
+    array_stack = AtomArrayStack(0, arrays[0].array_length())
     for name, annotation in arrays[0]._annot.items():
         array_stack._annot[name] = annotation
     coord_list = [array._coord for array in arrays] 
@@ -1041,25 +1364,30 @@ def coord(item):
     """
     Get the atom coordinates of the given array.
     
-    This may be directly and `Atom`, `AtomArray` or `AtomArrayStack` or
-    alternatively an (n x 3) or (m x n x 3) `ndarray`
-    containing the coordinates.
+    This may be directly and `Atom`, `AtomView`, `AtomArray` or
+    `AtomArrayStack` or alternatively an (n x 3) or (m x n x 3)
+    `ndarray` containing the coordinates.
     
     Parameters
     ----------
-    item : `Atom`, `AtomArray` or `AtomArrayStack` or ndarray
-        Takes the coord attribute, if `item` is `Atom`, `AtomArray` or
-        `AtomArrayStack`, or directly returns a given `ndarray`.
+    item : `Atom`, `AtomView`, `AtomArray` or `AtomArrayStack` or ndarray
+        Takes the coord attribute, if `item` is `Atom`, `AtomView`,
+        `AtomArray` or `AtomArrayStack`, or directly returns a given
+        `ndarray`.
     
     Returns
     -------
     coord : ndarray
         Atom coordinates.
+        Floating point coordinates keep their data type, e.g. single
+        precision coordinates are not converted into double precision.
     """
 
-    if type(item) in (Atom, AtomArray, AtomArrayStack):
+    if type(item) in (Atom, AtomView, AtomArray, AtomArrayStack):
         return item.coord
     elif isinstance(item, np.ndarray):
-        return item.astype(float, copy=False)
+        if np.issubdtype(item.dtype, np.floating):
+            return item
+        return item.astype(float)
     else:
         return np.array(item, dtype=float)
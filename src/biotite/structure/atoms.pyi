@@ -15,6 +15,7 @@ from typing import (
 )
 import numpy as np
 from .bonds import BondList
+from .categorical import CategoricalArray
 from .copyable import Copyable 
 
 
@@ -40,7 +41,9 @@ class _AtomArrayBase(Copyable):
     def add_annotation(self, category: str, dtype: Union[Type, str]) -> None: ...
     def del_annotation(self, category: str) -> None: ...
     def get_annotation(self, category: str) -> np.ndarray: ...
-    def set_annotation(self, category: str, array: np.ndarray) -> None: ...
+    def set_annotation(
+        self, category: str, array: Union[np.ndarray, CategoricalArray]
+    ) -> None: ...
     def get_annotation_categories(self) -> List[str]: ...
     def equal_annotations(
         self,
@@ -74,9 +77,30 @@ class Atom:
     def __eq__(self, item: object) -> bool: ...
 
 
+class AtomView:
+    coord: np.ndarray
+    chain_id: str
+    res_id: int
+    res_name: str
+    hetero: bool
+    atom_name: str
+    element: str
+    atom_id: int
+    b_factor: float
+    occupancy: float
+    charge: int
+    def __init__(self, array: AtomArray, index: int) -> None: ...
+    def to_atom(self) -> Atom: ...
+    def __str__(self) -> str: ...
+    def __eq__(self, item: object) -> bool: ...
+
+
 class AtomArray(_AtomArrayBase, Sequence[Atom]):
-    def __init__(self, length: int) -> None: ...
+    def __init__(
+        self, length: int, coord_dtype: np.dtype = float
+    ) -> None: ...
     def get_atom(self, index: int) -> Atom: ...
+    def as_records(self) -> np.ndarray: ...
     def insert(self, index: int, item: Atom) -> None: ...
     def __iter__(self) -> Iterator[Atom]: ...
     @overload
@@ -85,6 +109,10 @@ class AtomArray(_AtomArrayBase, Sequence[Atom]):
     def __getitem__(
         self, index: Union[MutableSequence[int], MutableSequence[bool], slice]
     ) -> AtomArray: ...
+    @overload
+    def view(self, index: int) -> AtomView: ...
+    @overload
+    def view(self, index: slice) -> AtomArray: ...
     def __setitem__(self, index: int, atom: Atom) -> None: ...
     def __delitem__(self, index: int) -> None: ...
     def __len__(self) -> int: ...
@@ -93,7 +121,9 @@ class AtomArray(_AtomArrayBase, Sequence[Atom]):
 
 
 class AtomArrayStack(_AtomArrayBase, Sequence[AtomArray]):
-    def __init__(self, depth: int, length: int) -> None: ...
+    def __init__(
+        self, depth: int, length: int, coord_dtype: np.dtype = float
+    ) -> None: ...
     def get_array(self, index: int) -> AtomArray: ...
     def stack_depth(self) -> int: ...
     def __iter__(self) -> Iterator[AtomArray]: ...
@@ -126,6 +156,12 @@ class AtomArrayStack(_AtomArrayBase, Sequence[AtomArray]):
     def __getitem__(
         self, index: Union[MutableSequence[int], MutableSequence[bool], slice]
     ) -> AtomArrayStack: ...
+    @overload
+    def view(self, index: Union[slice, Tuple[slice, slice]]) -> AtomArrayStack: ...
+    @overload
+    def view(self, index: Union[int, Tuple[int, slice]]) -> AtomArray: ...
+    @overload
+    def view(self, index: Tuple[int, int]) -> AtomView: ...
     def __setitem__(self, index: int, atom: AtomArray) -> None: ...
     def __delitem__(self, index: int) -> None: ...
     def __len__(self) -> int: ...
@@ -133,10 +169,10 @@ class AtomArrayStack(_AtomArrayBase, Sequence[AtomArray]):
     def __str__(self) -> str: ...
 
 
-def array(atoms: Sequence[Atom]) -> AtomArray: ...
+def array(atoms: Sequence[Union[Atom, AtomView]]) -> AtomArray: ...
 
 def stack(arrays: Sequence[AtomArray]) -> AtomArrayStack: ...
 
 def coord(
-    item: Union[AtomArrayStack, AtomArray, Atom, np.ndarray]
+    item: Union[AtomArrayStack, AtomArray, Atom, AtomView, np.ndarray]
 ) -> np.ndarray: ...
\ No newline at end of file
@@ -26,6 +26,7 @@ class BondList(Copyable):
     def get_atom_count(self) -> int: ...
     def get_bond_count(self) -> int: ...
     def get_bonds(self, atom_index: int) -> Tuple[np.ndarray, np.ndarray]: ...
+    def get_all_bonds(self) -> Tuple[np.ndarray, np.ndarray]: ...
     def add_bond(
         self, index1: int, index2: int, bond_type: BondType = BondType.ANY
     ) -> None: ...
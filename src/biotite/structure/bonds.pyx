@@ -93,6 +93,14 @@ class BondList(Copyable):
     sanitized: Redundant bonds are removed, and each bond entry is
     sorted so that the lower one of the two atom indices is in the first
     column.
+
+    For the queries of bonded atoms via `get_bonds()` and
+    `get_all_bonds()`, an adjacency representation in the
+    *compressed sparse row* (CSR) format is created on demand:
+    For each atom the bonded atoms are stored contiguously, so that
+    each query only requires to look up the respective range.
+    The adjacency representation is reused for subsequent queries,
+    until the bonds are modified.
     
     Examples
     --------
@@ -119,6 +127,8 @@ class BondList(Copyable):
 
     def __init__(self, uint32 atom_count, np.ndarray bonds=None):
         self._atom_count = atom_count
+        # Adjacency representation created by '_get_adjacency()'
+        self._adjacency = None
         if bonds is not None:
             if (bonds[:,:2] >= atom_count).any():
                 raise ValueError(
@@ -145,22 +155,21 @@ class BondList(Copyable):
                     "(n,2) or (n,3)"
                 )
             self._remove_redundant_bonds()
-            self._max_bonds_per_atom = self._get_max_bonds_per_atom()
         else:
             # Create empty bond list
             self._bonds = np.zeros((0, 3), dtype=np.uint32)
-            self._max_bonds_per_atom = 0
 
     def __copy_create__(self):
         # Create empty bond list to prevent
         # unnecessary removal of redundant atoms
-        # and calculation of maximum bonds per atom
         return BondList(self._atom_count)
     
     def __copy_fill__(self, clone):
         # The bonds are added here
         clone._bonds = self._bonds.copy()
-        clone._max_bonds_per_atom = self._max_bonds_per_atom
+        # The adjacency representation is immutable
+        # and can therefore be shared
+        clone._adjacency = self._adjacency
     
     def offset_indices(self, int offset):
         """
@@ -195,6 +204,7 @@ class BondList(Copyable):
         self._bonds[:,0] += offset
         self._bonds[:,1] += offset
         self._atom_count += offset
+        self._adjacency = None
     
     def as_array(self):
         """
@@ -269,32 +279,70 @@ class BondList(Copyable):
         >>> print(bonds)
         [0 3 4]
         """
-        cdef int i=0, j=0
-        cdef uint32[:,:] all_bonds_v = self._bonds
-        # Pessimistic array allocation:
-        # assume size is equal to the atom with most bonds
-        cdef np.ndarray bonds = np.zeros(self._max_bonds_per_atom,
-                                         dtype=np.uint32)
-        cdef uint32[:] bonds_v = bonds
-        cdef np.ndarray bond_types = np.zeros(self._max_bonds_per_atom,
-                                              dtype=np.uint8)
-        cdef uint8[:] bond_types_v = bond_types
-        for i in range(all_bonds_v.shape[0]):
-            # If a bond is found for the desired atom index
-            # at the first or second position of the bond,
-            # then append the the index of the respective other position
-            if all_bonds_v[i,0] == atom_index:
-                bonds_v[j] = all_bonds_v[i,1]
-                bond_types_v[j] = all_bonds_v[i,2]
-                j += 1
-            elif all_bonds_v[i,1] == atom_index:
-                bonds_v[j] = all_bonds_v[i,0]
-                bond_types_v[j] = all_bonds_v[i,2]
-                j += 1
-        # Trim to correct size
-        bonds = bonds[:j]
-        bond_types = bond_types[:j]
-        return bonds, bond_types
+        if atom_index >= self._atom_count:
+            return (
+                np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.uint8)
+            )
+        indptr, partners, bond_types = self._get_adjacency()
+        cdef int64 start = indptr[atom_index]
+        cdef int64 stop = indptr[atom_index+1]
+        # Copy to protect the adjacency representation from modification
+        return partners[start:stop].copy(), bond_types[start:stop].copy()
+    
+    def get_all_bonds(self):
+        """
+        get_all_bonds()
+
+        For each atom, obtain the indices of the atoms bonded to it as
+        well as the corresponding bond types.
+
+        This is equivalent to calling `get_bonds()` for each atom, but
+        considerably faster.
+
+        Returns
+        -------
+        bonds : np.ndarray, dtype=np.int32, shape=(n,k)
+            The indices of connected atoms for each of the *n* atoms,
+            where *k* is the maximum number of bonds of an atom.
+            The rows of atoms with less than *k* bonds are padded
+            with -1.
+        bond_types : np.ndarray, dtype=np.int8, shape=(n,k)
+            Array of integers, interpreted as `BondType` instances.
+            This array specifies the type (or order) of the bonds to
+            the connected atoms.
+            Padding values are -1.
+        
+        See also
+        --------
+        get_bonds
+
+        Examples
+        --------
+
+        >>> bond_list = BondList(4, np.array([(0,1),(0,3),(1,2)]))
+        >>> bonds, types = bond_list.get_all_bonds()
+        >>> print(bonds)
+        [[ 1  3]
+         [ 0  2]
+         [ 1 -1]
+         [ 0 -1]]
+        """
+        indptr, partners, bond_types = self._get_adjacency()
+        bond_counts = np.diff(indptr)
+        max_bonds = np.max(bond_counts) if len(bond_counts) > 0 else 0
+        all_bonds = np.full((self._atom_count, max_bonds), -1, dtype=np.int32)
+        all_bond_types = np.full(
+            (self._atom_count, max_bonds), -1, dtype=np.int8
+        )
+        # The position of each entry of the adjacency representation
+        # in the padded arrays
+        rows = np.repeat(np.arange(self._atom_count), bond_counts)
+        columns = np.arange(len(partners)) - np.repeat(
+            indptr[:-1], bond_counts
+        )
+        all_bonds[rows, columns] = partners
+        all_bond_types[rows, columns] = bond_types
+        return all_bonds, all_bond_types
     
     def add_bond(self, uint32 index1, uint32 index2, bond_type=BondType.ANY):
         """
@@ -335,7 +383,7 @@ class BondList(Copyable):
                 np.array([(index1, index2, int(bond_type))], dtype=np.uint32),
                 axis=0
             )
-            self._max_bonds_per_atom = self._get_max_bonds_per_atom()
+        self._adjacency = None
 
     def remove_bond(self, uint32 index1, uint32 index2):
         """
@@ -359,11 +407,7 @@ class BondList(Copyable):
             # the reverse check is omitted
             if (all_bonds_v[i,0] == index1 and all_bonds_v[i,1] == index2):
                 self._bonds = np.delete(self._bonds, i, axis=0)
-        # The maximum bonds per atom is not recalculated,
-        # since the value can only be decreased on bond removal
-        # Since this value is only used for pessimistic array allocation
-        # in 'get_bonds()', the slightly larger memory usage is a better
-        # option than the repetitive call of _get_max_bonds_per_atom()
+        self._adjacency = None
 
     def remove_bonds(self, bond_list):
         """
@@ -395,10 +439,7 @@ class BondList(Copyable):
                         mask_v[i] = False
         # Remove the bonds
         self._bonds = self._bonds[mask.astype(np.bool, copy=False)]
-        # The maximum bonds per atom is not recalculated
-        # (see 'remove_bond())
-        #for bond in bond_list._bonds:
-        #    self.remove_bond(bond[0], bond[1])
+        self._adjacency = None
 
     def merge(self, bond_list):
         """
@@ -455,15 +496,13 @@ class BondList(Copyable):
         cdef uint32 merged_count = self._atom_count + bond_list._atom_count
         cdef merged_bond_list = BondList(merged_count)
         # Array is not used in constructor to prevent unnecessary
-        # maximum and redundant bond calculation
+        # redundant bond calculation
         merged_bond_list._bonds = merged_bonds
-        merged_bond_list._max_bonds_per_atom \
-            = max(self._max_bonds_per_atom, merged_bond_list._max_bonds_per_atom)
         return merged_bond_list
 
     def __getitem__(self, index):
-        cdef copy = self.copy()
-        cdef uint32[:,:] all_bonds_v = copy._bonds
+        cdef copy
+        cdef uint32[:,:] all_bonds_v
         # Boolean mask representation of the index
         cdef np.ndarray mask
         cdef uint8[:] mask_v
@@ -476,8 +515,10 @@ class BondList(Copyable):
         cdef uint32* index1_ptr
         cdef uint32* index2_ptr
         if isinstance(index, numbers.Integral):
-            return copy.get_bonds(index)
+            return self.get_bonds(index)
         else:
+            copy = self.copy()
+            all_bonds_v = copy._bonds
             mask = _to_bool_mask(index, length=copy._atom_count)
             offsets = np.cumsum(~mask.astype(bool, copy=False),
                                 dtype=np.uint32)
@@ -503,7 +544,7 @@ class BondList(Copyable):
             # by the input index
             copy._bonds = copy._bonds[removal_filter.astype(bool, copy=False)]
             copy._atom_count = len(np.nonzero(mask)[0])
-            copy._max_bonds_per_atom = copy._get_max_bonds_per_atom()
+            copy._adjacency = None
             return copy
     
     def __str__(self):
@@ -515,19 +556,33 @@ class BondList(Copyable):
         return (self._atom_count == item._atom_count and
                 np.array_equal(self._bonds, item._bonds))
 
-    def _get_max_bonds_per_atom(self):
-        cdef int i
-        cdef uint32[:,:] all_bonds_v = self._bonds
-        # Create array that counts number of occurences of each index
-        cdef np.ndarray index_count = np.zeros(self._atom_count,
-                                               dtype=np.uint32)
-        cdef uint32[:] index_count_v = index_count
-        for i in range(all_bonds_v.shape[0]):
-            # Increment count of both indices found in bond list at i
-            index_count_v[all_bonds_v[i,0]] += 1
-            index_count_v[all_bonds_v[i,1]] += 1
-        return np.max(index_count_v)
-    
+    def _get_adjacency(self):
+        """
+        Get the adjacency representation of the bonds in the
+        *compressed sparse row* (CSR) format.
+
+        The bonded atoms and bond types of the atom *i* are
+        ``partners[indptr[i] : indptr[i+1]]`` and
+        ``bond_types[indptr[i] : indptr[i+1]]``, respectively,
+        in the order of the bonds in the internal `ndarray`.
+        The representation is created only once and reused until the
+        bonds are modified.
+        """
+        if self._adjacency is None:
+            # Each bond appears for both of its atoms
+            atoms = self._bonds[:,:2].reshape(-1)
+            partners = self._bonds[:,[1,0]].reshape(-1)
+            bond_types = np.repeat(self._bonds[:,2], 2).astype(np.uint8)
+            # Stable sorting retains the order of bonds for each atom
+            order = np.argsort(atoms, kind="stable")
+            indptr = np.zeros(self._atom_count + 1, dtype=np.int64)
+            np.cumsum(
+                np.bincount(atoms, minlength=self._atom_count),
+                out=indptr[1:]
+            )
+            self._adjacency = (indptr, partners[order], bond_types[order])
+        return self._adjacency
+
     def _remove_redundant_bonds(self):
         cdef int j
         cdef uint32[:,:] all_bonds_v = self._bonds
@@ -0,0 +1,361 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+"""
+This module provides classes for the incremental construction of atom
+arrays and atom array stacks.
+"""
+
+__author__ = "Patrick Kunzmann"
+__all__ = ["AtomArrayBuilder", "StackBuilder"]
+
+import numpy as np
+from .atoms import Atom, AtomArray, AtomArrayStack, array as to_array
+from .bonds import BondList
+
+
+class AtomArrayBuilder(object):
+    """
+    Build an `AtomArray` by appending atoms or atom arrays
+    incrementally.
+
+    Concatenating many atom arrays via ``+`` copies all previously
+    concatenated atoms in each step, which has a quadratic time
+    complexity.
+    In contrast, this class stores the atoms in preallocated arrays,
+    whose capacity is doubled when required, so that appending takes
+    amortized linear time.
+
+    The annotation categories of the built array are the categories,
+    that exist in all appended atoms, like for the concatenation via
+    ``+``.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        The number of atoms, space is initially reserved for.
+
+    Examples
+    --------
+
+    >>> builder = AtomArrayBuilder()
+    >>> for i in range(3):
+    ...     builder.append(Atom([i, i, i], chain_id="A", res_id=i+1))
+    >>> builder.append(array([Atom([5, 5, 5], chain_id="B", res_id=1)]))
+    >>> atom_array = builder.build()
+    >>> print(atom_array.chain_id)
+    ['A' 'A' 'A' 'B']
+    >>> print(atom_array.res_id)
+    [1 2 3 1]
+    """
+
+    def __init__(self, capacity=0):
+        if capacity < 0:
+            raise ValueError("The capacity must not be negative")
+        self._initial_capacity = capacity
+        self._reset()
+
+    def array_length(self):
+        """
+        Get the number of atoms appended so far.
+
+        Returns
+        -------
+        length : int
+            The number of atoms.
+        """
+        return self._length
+
+    def append(self, atoms):
+        """
+        Append atoms to the array to be built.
+
+        Parameters
+        ----------
+        atoms : Atom or AtomArray
+            The atom(s) to be appended.
+        """
+        if isinstance(atoms, Atom):
+            atoms = to_array([atoms])
+        elif not isinstance(atoms, AtomArray):
+            raise TypeError(
+                f"Expected 'Atom' or 'AtomArray', "
+                f"but got '{type(atoms).__name__}'"
+            )
+        start = self._length
+        stop = start + atoms.array_length()
+        self._reserve(stop)
+
+        if self._annot is None:
+            # First atoms define the annotation categories
+            self._annot = {
+                name: np.zeros(self._capacity, dtype=np.asarray(annot).dtype)
+                for name, annot in atoms._annot.items()
+            }
+        for name in list(self._annot.keys()):
+            if name not in atoms._annot:
+                # Keep only annotations, which exist in all atoms
+                del self._annot[name]
+                continue
+            annot = np.asarray(atoms._annot[name])
+            buffer = self._annot[name]
+            dtype = np.promote_types(buffer.dtype, annot.dtype)
+            if dtype != buffer.dtype:
+                # e.g. longer strings than before
+                buffer = buffer.astype(dtype)
+                self._annot[name] = buffer
+            buffer[start : stop] = annot
+
+        if self._coord is None:
+            self._coord = np.zeros(
+                (self._capacity, 3), dtype=atoms.coord.dtype
+            )
+        self._coord[start : stop] = atoms.coord
+
+        if atoms.bonds is not None:
+            bonds = atoms.bonds.as_array()
+            bonds[:, :2] += start
+            self._bonds.append(bonds)
+        self._length = stop
+
+    def build(self):
+        """
+        Create the `AtomArray` from the appended atoms.
+
+        The annotation arrays and coordinates of the returned array
+        are views of the internal arrays of this object, i.e. the atoms
+        are not copied again.
+        Afterwards this builder is empty again.
+
+        Returns
+        -------
+        array : AtomArray
+            The built atom array.
+        """
+        # Start with an empty array to prevent the allocation of
+        # annotation arrays and coordinates, that would be replaced anyway
+        atom_array = AtomArray(0)
+        if self._annot is not None:
+            atom_array._array_length = self._length
+            atom_array._annot = {
+                name: buffer[:self._length]
+                for name, buffer in self._annot.items()
+            }
+            atom_array._coord = self._coord[:self._length]
+        if len(self._bonds) > 0:
+            atom_array.bonds = BondList(
+                self._length, np.concatenate(self._bonds, axis=0)
+            )
+        self._reset()
+        return atom_array
+
+    def _reserve(self, length):
+        """
+        Ensure that the capacity is at least `length`.
+        """
+        if length <= self._capacity:
+            return
+        # Amortized growth
+        new_capacity = max(length, 2 * self._capacity)
+        if self._annot is not None:
+            for name, buffer in self._annot.items():
+                self._annot[name] = _expand(buffer, new_capacity)
+        if self._coord is not None:
+            self._coord = _expand(self._coord, new_capacity)
+        self._capacity = new_capacity
+
+    def _reset(self):
+        self._capacity = self._initial_capacity
+        self._length = 0
+        self._annot = None
+        self._coord = None
+        self._bonds = []
+
+
+class StackBuilder(object):
+    """
+    Build an `AtomArrayStack` by appending models incrementally.
+
+    Stacking models via `stack()` requires all models to be in memory
+    as separate arrays, and appending models to an existing stack
+    copies all previous models.
+    In contrast, this class stores the coordinates in a preallocated
+    array, whose capacity is doubled when required, so that appending
+    takes amortized linear time.
+
+    The annotation arrays and bonds of the built stack are taken from
+    `template` or, if not given, from the first appended model.
+    The coordinates have the data type of the template coordinates,
+    unless coordinates with a more precise data type are appended.
+
+    Parameters
+    ----------
+    template : AtomArray or AtomArrayStack, optional
+        The atoms, the annotations are taken from.
+        If not given, the first appended model must be an `AtomArray`
+        or `AtomArrayStack`.
+    capacity : int, optional
+        The number of models, space is initially reserved for.
+
+    Examples
+    --------
+
+    >>> template = array([
+    ...     Atom([0, 0, 0], atom_name="N"), Atom([1, 1, 1], atom_name="CA")
+    ... ])
+    >>> builder = StackBuilder(template)
+    >>> for i in range(3):
+    ...     builder.append(template.coord + i)
+    >>> stack = builder.build()
+    >>> print(stack.stack_depth())
+    3
+    >>> print(stack.coord[2])
+    [[2. 2. 2.]
+     [3. 3. 3.]]
+    """
+
+    def __init__(self, template=None, capacity=0):
+        if capacity < 0:
+            raise ValueError("The capacity must not be negative")
+        self._template = None
+        if template is not None:
+            self._set_template(template)
+        self._initial_capacity = capacity
+        self._reset()
+
+    def stack_depth(self):
+        """
+        Get the number of models appended so far.
+
+        Returns
+        -------
+        depth : int
+            The number of models.
+        """
+        return self._depth
+
+    def append(self, models):
+        """
+        Append one or multiple models to the stack to be built.
+
+        Parameters
+        ----------
+        models : AtomArray or AtomArrayStack or ndarray, shape=(n,3) or shape=(m,n,3), dtype=float
+            The model(s) to be appended.
+            An `AtomArray` or `AtomArrayStack` must have the same
+            annotations as the template.
+            Alternatively, only the coordinates of the model(s) can be
+            given.
+        """
+        if isinstance(models, (AtomArray, AtomArrayStack)):
+            if self._template is None:
+                self._set_template(models)
+            elif not models.equal_annotations(self._template):
+                raise ValueError(
+                    "The models have unequal annotations to the template"
+                )
+            coord = models.coord
+        else:
+            if self._template is None:
+                raise TypeError(
+                    "A template is required for appending coordinates"
+                )
+            coord = np.asarray(models)
+        if coord.ndim == 2:
+            coord = coord[np.newaxis, ...]
+        if coord.ndim != 3 or coord.shape[1:] != (self._length, 3):
+            raise IndexError(
+                f"Expected coordinates with shape (m,{self._length},3), "
+                f"but got {coord.shape}"
+            )
+
+        start = self._depth
+        stop = start + coord.shape[0]
+        self._reserve(stop)
+        dtype = np.promote_types(self._coord.dtype, coord.dtype)
+        if dtype != self._coord.dtype:
+            # e.g. double precision coordinates for a template with
+            # single precision coordinates
+            self._coord = self._coord.astype(dtype)
+        self._coord[start : stop] = coord
+        self._depth = stop
+
+    def build(self):
+        """
+        Create the `AtomArrayStack` from the appended models.
+
+        The coordinates of the returned stack are a view of the internal
+        coordinate array of this object, i.e. the coordinates are not
+        copied again.
+        The annotation arrays and bonds are copied from the template,
+        so that the built stack is independent of the template.
+        Afterwards this builder is empty again, but it keeps its
+        template.
+
+        Returns
+        -------
+        stack : AtomArrayStack
+            The built atom array stack.
+        """
+        if self._template is None:
+            raise TypeError(
+                "Cannot build a stack without template or models"
+            )
+        atom_stack = AtomArrayStack(0, 0)
+        atom_stack._array_length = self._length
+        atom_stack._annot = {
+            name: annot.copy() for name, annot in self._template._annot.items()
+        }
+        if self._template._bonds is not None:
+            atom_stack._bonds = self._template._bonds.copy()
+        if self._coord is None:
+            atom_stack._coord = np.zeros(
+                (0, self._length, 3), dtype=self._template.coord.dtype
+            )
+        else:
+            atom_stack._coord = self._coord[:self._depth]
+        self._reset()
+        return atom_stack
+
+    def _set_template(self, template):
+        if not isinstance(template, (AtomArray, AtomArrayStack)):
+            raise TypeError(
+                f"Expected 'AtomArray' or 'AtomArrayStack', "
+                f"but got '{type(template).__name__}'"
+            )
+        self._template = template
+        self._length = template.array_length()
+
+    def _reserve(self, depth):
+        """
+        Ensure that the capacity is at least `depth`.
+        """
+        if self._coord is None:
+            # The coordinates have the precision of the template,
+            # unless more precise coordinates are appended
+            self._coord = np.zeros(
+                (max(depth, self._capacity), self._length, 3),
+                dtype=self._template.coord.dtype
+            )
+            self._capacity = self._coord.shape[0]
+            return
+        if depth <= self._capacity:
+            return
+        # Amortized growth
+        self._capacity = max(depth, 2 * self._capacity)
+        self._coord = _expand(self._coord, self._capacity)
+
+    def _reset(self):
+        self._capacity = self._initial_capacity
+        self._depth = 0
+        self._coord = None
+
+
+def _expand(array, capacity):
+    """
+    Create a copy of `array` with an enlarged first dimension.
+    """
+    expanded = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+    expanded[:len(array)] = array
+    return expanded
@@ -0,0 +1,27 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+from typing import Optional, Union
+import numpy as np
+from .atoms import Atom, AtomArray, AtomArrayStack
+
+
+class AtomArrayBuilder:
+    def __init__(self, capacity: int = 0) -> None: ...
+    def array_length(self) -> int: ...
+    def append(self, atoms: Union[Atom, AtomArray]) -> None: ...
+    def build(self) -> AtomArray: ...
+
+
+class StackBuilder:
+    def __init__(
+        self,
+        template: Optional[Union[AtomArray, AtomArrayStack]] = None,
+        capacity: int = 0
+    ) -> None: ...
+    def stack_depth(self) -> int: ...
+    def append(
+        self, models: Union[AtomArray, AtomArrayStack, np.ndarray]
+    ) -> None: ...
+    def build(self) -> AtomArrayStack: ...
@@ -0,0 +1,379 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+"""
+This module provides a memory efficient array type for annotations
+with few distinct values, e.g. residue or atom names.
+"""
+
+__author__ = "Patrick Kunzmann"
+__all__ = ["CategoricalArray"]
+
+import numbers
+import numpy as np
+from ..copyable import Copyable
+
+
+class CategoricalArray(Copyable):
+    """
+    A one-dimensional array, that stores its values as integer codes
+    pointing to a vocabulary of distinct values (categories).
+
+    A :class:`CategoricalArray` can be used as annotation array of an
+    :class:`AtomArray` or :class:`AtomArrayStack` instead of an
+    :class:`ndarray`, for annotations with only few distinct values,
+    like ``chain_id``, ``res_name``, ``atom_name`` or ``element``.
+    This reduces the memory consumption, since each value requires
+    only one or two bytes instead of four bytes per character.
+    Furthermore, comparisons with a single value (``==``, ``!=``) and
+    :func:`numpy.isin()`/:func:`numpy.in1d()` operate on the integer
+    codes, which is considerably faster than string comparisons.
+
+    The array supports indexing, item assignment, comparisons and
+    the common *NumPy* functions for concatenation, copying and
+    deletion, which preserve the categorical representation.
+    All other *NumPy* functions operate on the decoded values, i.e.
+    an ordinary :class:`ndarray`.
+    An ordinary :class:`ndarray` is also obtained via
+    :func:`numpy.asarray()`.
+
+    Parameters
+    ----------
+    values : array-like
+        The values of the array.
+    categories : array-like, optional
+        The distinct values the array may contain.
+        By default, the categories are the sorted distinct values in
+        `values`.
+        New categories are added automatically, when a value, that is
+        not part of the categories, is assigned to the array.
+
+    Attributes
+    ----------
+    codes : ndarray, dtype=uint
+        The code for each value, i.e. the index of the value in
+        `categories`.
+    categories : ndarray
+        The distinct values the array may contain.
+    dtype : dtype
+        The data type of the decoded values.
+    shape : tuple of int
+        The shape of the array.
+
+    Notes
+    -----
+    Sub-arrays obtained by a slice share the codes and categories with
+    the original array, like slices of an :class:`ndarray`.
+    Only if the number of categories exceeds the range of the code
+    data type, the codes of the modified array are converted into a
+    larger data type and are hence not shared anymore.
+
+    Examples
+    --------
+
+    >>> res_name = CategoricalArray(["ALA", "ALA", "GLY", "ALA", "HOH"])
+    >>> print(res_name)
+    ['ALA' 'ALA' 'GLY' 'ALA' 'HOH']
+    >>> print(res_name.codes)
+    [0 0 1 0 2]
+    >>> print(res_name.categories)
+    ['ALA' 'GLY' 'HOH']
+    >>> print(res_name == "ALA")
+    [ True  True False  True False]
+    >>> res_name[1] = "SER"
+    >>> print(res_name.codes)
+    [0 3 1 0 2]
+    """
+
+    def __init__(self, values, categories=None):
+        values = np.asarray(values)
+        if values.ndim != 1:
+            raise IndexError(
+                f"Expected one-dimensional values, "
+                f"but got {values.ndim} dimensions"
+            )
+        if categories is None:
+            categories, codes = np.unique(values, return_inverse=True)
+            self._vocabulary = _Vocabulary(categories)
+            self._codes = codes.reshape(-1).astype(
+                _code_dtype(len(categories))
+            )
+        else:
+            categories = np.asarray(categories)
+            if len(np.unique(categories)) != len(categories):
+                raise ValueError("The categories must be unique")
+            self._vocabulary = _Vocabulary(categories)
+            self._codes = np.zeros(
+                len(values), dtype=_code_dtype(len(categories))
+            )
+            self._set_values(slice(None), values)
+
+    @staticmethod
+    def _from_codes(codes, vocabulary):
+        """
+        Create a :class:`CategoricalArray` from existing codes and a
+        vocabulary, without copying.
+        """
+        array = CategoricalArray.__new__(CategoricalArray)
+        array._codes = codes
+        array._vocabulary = vocabulary
+        return array
+
+    @property
+    def codes(self):
+        return self._codes
+
+    @property
+    def categories(self):
+        return self._vocabulary.categories
+
+    @property
+    def dtype(self):
+        return self._vocabulary.categories.dtype
+
+    @property
+    def shape(self):
+        return self._codes.shape
+
+    @property
+    def ndim(self):
+        return 1
+
+    @property
+    def size(self):
+        return self._codes.size
+
+    def astype(self, dtype, copy=True):
+        """
+        Decode the array into an :class:`ndarray` of the given type.
+
+        Parameters
+        ----------
+        dtype : dtype
+            The data type of the returned array.
+        copy : bool, optional
+            This parameter has no effect, as decoding always creates
+            a new array.
+            It only exists for compatibility with :class:`ndarray`.
+
+        Returns
+        -------
+        array : ndarray
+            The decoded values.
+        """
+        return np.asarray(self).astype(dtype, copy=False)
+
+    def tolist(self):
+        return np.asarray(self).tolist()
+
+    def __copy_create__(self):
+        return CategoricalArray._from_codes(
+            self._codes.copy(),
+            _Vocabulary(self._vocabulary.categories.copy())
+        )
+
+    def __array__(self, dtype=None, copy=None):
+        values = self._vocabulary.categories[self._codes]
+        if dtype is not None:
+            values = values.astype(dtype, copy=False)
+        return values
+
+    def __len__(self):
+        return len(self._codes)
+
+    def __iter__(self):
+        return iter(np.asarray(self))
+
+    def __getitem__(self, index):
+        codes = self._codes[index]
+        if isinstance(codes, np.ndarray) and codes.ndim == 1:
+            return CategoricalArray._from_codes(codes, self._vocabulary)
+        else:
+            # Single element or multi-dimensional index
+            return self._vocabulary.categories[codes]
+
+    def __setitem__(self, index, value):
+        self._set_values(index, value)
+
+    def _set_values(self, index, value):
+        if isinstance(value, CategoricalArray):
+            if value._vocabulary is self._vocabulary:
+                codes = value._codes
+            else:
+                codes = self._encode(value.categories)[value._codes]
+        else:
+            codes = self._encode(value)
+        self._codes[index] = codes
+
+    def _encode(self, values, add=True):
+        """
+        Get the codes for the given values.
+        If `add` is true, missing values are added as new categories,
+        otherwise the code for missing values is -1.
+        """
+        values = np.asarray(values)
+        codes = self._vocabulary.encode(values, add)
+        # Expand the codes, if they are not representable anymore
+        code_dtype = _code_dtype(len(self._vocabulary.categories))
+        if np.iinfo(code_dtype).max > np.iinfo(self._codes.dtype).max:
+            self._codes = self._codes.astype(code_dtype)
+        return codes
+
+    def __eq__(self, item):
+        if isinstance(item, CategoricalArray):
+            if item._vocabulary is self._vocabulary:
+                return self._codes == item._codes
+            # Encode the categories of the other array with codes of
+            # this array
+            item_codes = self._encode(item.categories, add=False)
+            return self._codes == item_codes[item._codes]
+        if isinstance(item, (str, bytes, numbers.Number)):
+            code = self._encode([item], add=False)[0]
+            if code == -1:
+                return np.zeros(len(self), dtype=bool)
+            return self._codes == code
+        return np.asarray(self) == item
+
+    def __ne__(self, item):
+        return ~(self == item)
+
+    # An array is not hashable
+    __hash__ = None
+
+    def __str__(self):
+        return str(np.asarray(self))
+
+    def __repr__(self):
+        return f"CategoricalArray({repr(np.asarray(self).tolist())})"
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        inputs = [_decode(input) for input in inputs]
+        if "out" in kwargs:
+            kwargs["out"] = tuple(_decode(out) for out in kwargs["out"])
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    def __array_function__(self, func, types, args, kwargs):
+        handler = _HANDLED_FUNCTIONS.get(func)
+        if handler is not None:
+            result = handler(*args, **kwargs)
+            if result is not NotImplemented:
+                return result
+        # Fall back to the decoded values
+        args = [_decode(arg) for arg in args]
+        kwargs = {key: _decode(val) for key, val in kwargs.items()}
+        return func(*args, **kwargs)
+
+
+class _Vocabulary:
+    """
+    The categories of a :class:`CategoricalArray`, that are shared
+    between an array and its sub-arrays.
+    """
+
+    def __init__(self, categories):
+        self.categories = categories
+        self._code_map = None
+
+    def encode(self, values, add):
+        if self._code_map is None:
+            self._code_map = {
+                value: code for code, value
+                in enumerate(self.categories.tolist())
+            }
+        unique_values, inverse = np.unique(values, return_inverse=True)
+        unique_codes = np.zeros(len(unique_values), dtype=np.int64)
+        new_values = []
+        for i, value in enumerate(unique_values.tolist()):
+            code = self._code_map.get(value)
+            if code is None:
+                if add:
+                    code = len(self.categories) + len(new_values)
+                    self._code_map[value] = code
+                    new_values.append(value)
+                else:
+                    code = -1
+            unique_codes[i] = code
+        if new_values:
+            self.categories = np.append(self.categories, new_values)
+        return unique_codes[inverse.reshape(-1)].reshape(values.shape)
+
+
+def _code_dtype(n_categories):
+    """
+    Get the smallest unsigned integer type, that is able to represent
+    the given number of categories.
+    """
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if n_categories <= np.iinfo(dtype).max + 1:
+            return dtype
+    return np.uint64
+
+
+def _decode(item):
+    if isinstance(item, CategoricalArray):
+        return np.asarray(item)
+    elif isinstance(item, (list, tuple)):
+        return type(item)(_decode(element) for element in item)
+    else:
+        return item
+
+
+def _concatenate(arrays, axis=0, **kwargs):
+    arrays = list(arrays)
+    if kwargs or axis != 0 \
+       or not all(isinstance(array, CategoricalArray) for array in arrays):
+            return NotImplemented
+    if all(array._vocabulary is arrays[0]._vocabulary for array in arrays):
+        return CategoricalArray._from_codes(
+            np.concatenate([array._codes for array in arrays]),
+            arrays[0]._vocabulary
+        )
+    concat = arrays[0].copy()
+    # Add the categories of the other arrays to the vocabulary
+    code_arrays = [concat._codes] + [
+        concat._encode(array.categories)[array._codes]
+        for array in arrays[1:]
+    ]
+    concat._codes = np.concatenate(code_arrays).astype(concat._codes.dtype)
+    return concat
+
+
+def _copy(array, **kwargs):
+    if kwargs:
+        return NotImplemented
+    return array.copy()
+
+
+def _delete(array, obj, axis=None):
+    if not isinstance(array, CategoricalArray) or axis not in (None, 0):
+        return NotImplemented
+    return CategoricalArray._from_codes(
+        np.delete(array._codes, obj), array._vocabulary
+    )
+
+
+def _isin(element, test_elements, assume_unique=False, invert=False):
+    if not isinstance(element, CategoricalArray):
+        return NotImplemented
+    # Decide for each category, whether it is contained
+    # and use the result as lookup table for the codes
+    is_contained = np.isin(
+        element.categories, _decode(test_elements), invert=invert
+    )
+    return is_contained[element._codes]
+
+
+def _in1d(ar1, ar2, assume_unique=False, invert=False, **kwargs):
+    if kwargs:
+        return NotImplemented
+    return _isin(ar1, ar2, invert=invert)
+
+
+_HANDLED_FUNCTIONS = {
+    np.concatenate: _concatenate,
+    np.copy:        _copy,
+    np.delete:      _delete,
+    np.isin:        _isin,
+    np.in1d:        _in1d,
+}
@@ -0,0 +1,36 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+from typing import Any, Iterator, List, Optional, Tuple, Union
+import numpy as np
+from ..copyable import Copyable
+
+
+class CategoricalArray(Copyable):
+    def __init__(
+        self, values: Any, categories: Optional[Any] = None
+    ) -> None: ...
+    @property
+    def codes(self) -> np.ndarray: ...
+    @property
+    def categories(self) -> np.ndarray: ...
+    @property
+    def dtype(self) -> np.dtype: ...
+    @property
+    def shape(self) -> Tuple[int]: ...
+    @property
+    def ndim(self) -> int: ...
+    @property
+    def size(self) -> int: ...
+    def astype(self, dtype: Any, copy: bool = True) -> np.ndarray: ...
+    def tolist(self) -> List[Any]: ...
+    def __array__(
+        self, dtype: Optional[Any] = None, copy: Optional[bool] = None
+    ) -> np.ndarray: ...
+    def __len__(self) -> int: ...
+    def __iter__(self) -> Iterator[Any]: ...
+    def __getitem__(self, index: Any) -> Union[CategoricalArray, Any]: ...
+    def __setitem__(self, index: Any, value: Any) -> None: ...
+    def __eq__(self, item: object) -> np.ndarray: ...  # type: ignore
+    def __ne__(self, item: object) -> np.ndarray: ...  # type: ignore
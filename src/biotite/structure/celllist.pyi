@@ -2,21 +2,35 @@
 # under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
 # information.
 
-from typing import Union
+from typing import Union, Tuple, Optional
 import numpy as np
 from .atoms import AtomArray
 
 
 class CellList:
     def __init__(
-        self, atom_array: Union[AtomArray, np.ndarray], cell_size: float
+        self,
+        atom_array: Union[AtomArray, np.ndarray],
+        cell_size: float,
+        box: Optional[np.ndarray] = None,
+        backend: str = "dense"
     ) -> None: ...
+    def update(self, atom_array: Union[AtomArray, np.ndarray]) -> None: ...
     def create_adjacency_matrix(
-        self, threshold_distance: float
-    ) -> np.ndarray: ...
+        self, threshold_distance: float, sparse: bool = False
+    ) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]: ...
+    def get_atom_pairs(self, radius: float) -> np.ndarray: ...
     def get_atoms(
-        self, coord: np.ndarray, radius: Union[float, np.ndarray]
+        self,
+        coord: np.ndarray,
+        radius: Union[float, np.ndarray],
+        as_mask: bool = False,
+        threads: int = 1
     ) -> np.ndarray: ...
     def get_atoms_in_cells(
-        self,coord: np.ndarray, cell_radius: Union[float, np.ndarray] = 1
+        self,
+        coord: np.ndarray,
+        cell_radius: Union[float, np.ndarray] = 1,
+        as_mask: bool = False,
+        threads: int = 1
     ) -> np.ndarray: ...
\ No newline at end of file
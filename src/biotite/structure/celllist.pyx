@@ -12,19 +12,19 @@ __all__ = ["CellList"]
 
 cimport cython
 cimport numpy as np
-from libc.stdlib cimport realloc, malloc, free
+from libc.math cimport floor
 
+from concurrent.futures import ThreadPoolExecutor
 from .atoms import coord as to_coord
 import numpy as np
 
-ctypedef np.uint64_t ptr
 ctypedef np.float32_t float32
 ctypedef np.uint8_t uint8
 
 
 cdef class CellList:
     """
-    __init__(atom_array, cell_size)
+    __init__(atom_array, cell_size, box=None, backend="dense")
     
     This class enables the efficient search of atoms in vicinity of a
     defined location.
@@ -47,35 +47,84 @@ cdef class CellList:
         The coordinate interval each cell has for x, y and z axis.
         The amount of cells depends on the range of coordinates in the
         `atom_array` and the `cell_size`.
+    box : ndarray, dtype=float, shape=(3,3), optional
+        If this parameter is set, periodic boundary conditions are
+        taken into account:
+        The rows of `box` are the three box vectors of the
+        (possibly triclinic) simulation box.
+        Atoms are searched across the box boundaries and
+        distances are measured between the closest periodic copies of
+        two atoms (minimum image convention).
+        The box must be given in the same unit as the coordinates.
+        The search radius must not exceed half of the distance between
+        opposing box faces, as otherwise multiple periodic copies of the
+        same atom would be within the radius.
+    backend : {'dense', 'sparse'}, optional
+        Determines how the cells are stored.
+        The ``'dense'`` backend allocates the complete grid of cells,
+        so its memory requirement scales with the volume spanned by the
+        atoms.
+        The ``'sparse'`` backend only stores the cells, that contain
+        atoms, so its memory requirement scales with the amount of
+        atoms.
+        Looking up a cell is a binary search instead of a direct
+        access, hence the ``'sparse'`` backend is slower, but it is the
+        better choice for systems with large empty regions, e.g.
+        systems with few distant atoms.
+    
+    Notes
+    -----
+    In the periodic case, the cells are a division of the simulation
+    box into equal parallelepipeds. Hence, the amount of cells depends
+    on the box and the `cell_size`, but not on the range of the
+    coordinates.
             
     Examples
     --------
     
     >>> cell_list = CellList(atom_array, cell_size=5)
     >>> near_atoms = atom_array[cell_list.get_atoms([1,2,3], radius=7)]
+    
+    Find atoms across the boundaries of a simulation box:
+    
+    >>> box = np.diag([40.0, 40.0, 40.0])
+    >>> cell_list = CellList(atom_array, cell_size=5, box=box)
+    
+    Use the sparse backend for a structure containing distant atoms:
+    
+    >>> cell_list = CellList(atom_array, cell_size=5, backend="sparse")
     """
     
     cdef float32[:,:] _coord
-    cdef ptr[:,:,:] _cells
-    cdef int[:,:,:] _cell_length
+    # The atom indices sorted by their cell:
+    # The atoms in the cell at slot 's' are
+    # '_cell_indices[_cell_offsets[s] : _cell_offsets[s+1]]'
+    # For the dense backend the slot is the flattened cell index,
+    # for the sparse backend it is the position of the flattened cell
+    # index in the sorted '_cell_keys'
+    cdef int[:] _cell_indices
+    cdef np.int64_t[:] _cell_offsets
+    cdef bint _sparse
+    cdef np.int64_t[:] _cell_keys
+    # The amount of atoms in each cell and the cell slot of each atom,
+    # required for 'update()'
+    cdef np.int64_t[:] _cell_lengths
+    cdef np.int64_t[:] _atom_cells
+    cdef int _grid_shape[3]
     cdef float _cellsize
     cdef float32[:] _min_coord
     cdef float32[:] _max_coord
     cdef int _max_cell_length
+    cdef bint _periodic
+    cdef double[:,:] _box
+    cdef double[:,:] _inv_box
+    cdef float _max_radius
     
     @cython.initializedcheck(False)
     @cython.boundscheck(False)
     @cython.wraparound(False)
-    def __cinit__(self, atom_array not None, float cell_size):
-        cdef float32 x, y, z
-        cdef int i, j, k
-        cdef int atom_array_i
-        cdef int* cell_ptr = NULL
-        cdef int length
-        
-        if self._has_initialized_cells():
-            raise Exception("Duplicate call of constructor")
-        self._cells = None
+    def __cinit__(self, atom_array not None, float cell_size, box=None,
+                  backend="dense"):
         if cell_size <= 0:
             raise ValueError("Cell size must be greater than 0")
         coord = to_coord(atom_array)
@@ -83,51 +132,232 @@ cdef class CellList:
             raise ValueError("Atom array must not be empty")
         if np.isnan(coord).any():
             raise ValueError("Coordinates contain NaN values")
-        self._coord = coord.astype(np.float32)
         self._cellsize = cell_size
-        # calculate how many cells are required for each dimension
-        min_coord = np.min(coord, axis=0).astype(np.float32)
-        max_coord = np.max(coord, axis=0).astype(np.float32)
+        if backend == "dense":
+            self._sparse = False
+        elif backend == "sparse":
+            self._sparse = True
+        else:
+            raise ValueError(f"Unknown backend '{backend}'")
+        if box is not None:
+            box = np.asarray(box, dtype=np.float64)
+            if box.shape != (3,3):
+                raise ValueError("The box must be a 3x3 matrix")
+            volume = abs(np.linalg.det(box))
+            if volume == 0:
+                raise ValueError("The box vectors are linearly dependent")
+            self._periodic = True
+            inv_box = np.linalg.inv(box)
+            self._box = box
+            self._inv_box = inv_box
+            # Atoms outside of the box are represented by their
+            # periodic copy inside the box
+            coord = _move_inside_box(coord, inv_box, box)
+            # The cells divide the box into equal parallelepipeds:
+            # The amount of cells in each dimension is determined by the
+            # distance between the opposing faces of the box
+            face_dist = volume / np.linalg.norm(
+                np.cross(box[[1,2,0]], box[[2,0,1]]), axis=-1
+            )
+            cell_count = np.maximum((face_dist / cell_size).astype(int), 1)
+            # Larger radii would include multiple copies of an atom
+            self._max_radius = np.min(face_dist) / 2
+            min_coord = np.zeros(3, dtype=np.float32)
+            max_coord = np.sum(box, axis=0).astype(np.float32)
+        else:
+            self._periodic = False
+            # calculate how many cells are required for each dimension
+            min_coord = np.min(coord, axis=0).astype(np.float32)
+            max_coord = np.max(coord, axis=0).astype(np.float32)
+            cell_count = (
+                ((max_coord - min_coord) / cell_size) +1
+            ).astype(int)
+        self._coord = coord.astype(np.float32)
         self._min_coord = min_coord
         self._max_coord = max_coord
-        cell_count = (((max_coord - min_coord) / cell_size) +1).astype(int)
-        # ndarray of pointers to C-arrays
-        # containing indices to atom array
-        self._cells = np.zeros(cell_count, dtype=np.uint64)
-        # Stores the length of the C-arrays
-        self._cell_length = np.zeros(cell_count, dtype=np.int32)
-        # Fill cells
-        for atom_array_i in range(self._coord.shape[0]):
-            x = self._coord[atom_array_i, 0]
-            y = self._coord[atom_array_i, 1]
-            z = self._coord[atom_array_i, 2]
+        self._set_grid_shape(cell_count)
+        self._atom_cells = np.zeros(self._coord.shape[0], dtype=np.int64)
+        self._fill_cells()
+    
+    def update(self, atom_array not None):
+        """
+        update(atom_array)
+        
+        Update the cell list with new coordinates of the same atoms,
+        e.g. from the next frame of a trajectory.
+
+        Instead of creating a new cell list, only atoms that moved
+        into another cell are reassigned.
+        If all atoms stay in their cells, the cells are left untouched.
+        In the aperiodic case, the cell grid is only extended, if atoms
+        moved outside of it, otherwise the grid is retained.
+        The atoms found afterwards are the same as for a newly created
+        `CellList`.
+        
+        Parameters
+        ----------
+        atom_array : AtomArray or ndarray, dtype=float, shape=(n,3)
+            The new coordinates of the atoms.
+            The amount of atoms must be equal to the amount of atoms
+            the cell list was created with.
+        
+        Examples
+        --------
+
+        >>> cell_list = CellList(stack[0], cell_size=5)
+        >>> for model in stack:
+        ...     cell_list.update(model)
+        ...     near_atoms = cell_list.get_atoms([1,2,3], radius=7)
+        """
+        cdef int atom_i
+        cdef int i=0, j=0, k=0
+        cdef np.int64_t old_cell, new_cell
+        cdef int moved_count = 0
+        cdef bint refill = False
+        
+        coord = to_coord(atom_array)
+        if coord.shape != (self._coord.shape[0], 3):
+            raise IndexError(
+                f"Expected coordinates for {self._coord.shape[0]} atoms, "
+                f"but got shape {coord.shape}"
+            )
+        if np.isnan(coord).any():
+            raise ValueError("Coordinates contain NaN values")
+        if self._periodic:
+            coord = self._wrap_coord(coord)
+        else:
+            min_coord = np.min(coord, axis=0).astype(np.float32)
+            max_coord = np.max(coord, axis=0).astype(np.float32)
+            if (min_coord < np.asarray(self._min_coord)).any() or \
+               (max_coord > np.asarray(self._max_coord)).any():
+                    # Atoms moved outside of the grid
+                    # -> Extend the grid and refill all cells
+                    min_coord = np.minimum(
+                        min_coord, np.asarray(self._min_coord)
+                    )
+                    max_coord = np.maximum(
+                        max_coord, np.asarray(self._max_coord)
+                    )
+                    self._min_coord = min_coord
+                    self._max_coord = max_coord
+                    self._set_grid_shape((
+                        ((max_coord - min_coord) / self._cellsize) + 1
+                    ).astype(int))
+                    refill = True
+        if refill:
+            self._coord = coord.astype(np.float32)
+            self._fill_cells()
+            return
+        cdef float32[:,:] coord_v = coord.astype(np.float32)
+        self._coord = coord_v
+        
+        # Move the atoms that changed their cell
+        cdef np.int64_t[:] atom_cells = self._atom_cells
+        cdef np.int64_t[:] cell_lengths = self._cell_lengths
+        for atom_i in range(coord_v.shape[0]):
+            self._get_cell_index(
+                coord_v[atom_i, 0], coord_v[atom_i, 1], coord_v[atom_i, 2],
+                &i, &j, &k
+            )
+            new_cell = self._flat_cell_index(i, j, k)
+            if self._sparse:
+                if new_cell != self._cell_keys[atom_cells[atom_i]]:
+                    # The new cell might not exist yet
+                    # -> Refill the sparse cells
+                    self._fill_cells()
+                    return
+            else:
+                old_cell = atom_cells[atom_i]
+                if new_cell != old_cell:
+                    atom_cells[atom_i] = new_cell
+                    cell_lengths[old_cell] -= 1
+                    cell_lengths[new_cell] += 1
+                    moved_count += 1
+        if moved_count > 0:
+            self._sort_into_cells()
+    
+    cdef void _set_grid_shape(self, cell_count) except *:
+        cdef int i
+        if self._sparse and np.prod(cell_count, dtype=float) >= 2**62:
+            raise ValueError("The cell grid is too large")
+        for i in range(3):
+            self._grid_shape[i] = cell_count[i]
+    
+    @cython.initializedcheck(False)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void _fill_cells(self) except *:
+        # Fill cells via counting sort:
+        # In the first pass the amount of atoms in each cell is counted
+        # and the offsets of each cell in the index array are obtained,
+        # in the second pass the atom indices are put into the cells
+        cdef int atom_i
+        cdef int i=0, j=0, k=0
+        cdef float32[:,:] coord = self._coord
+        cdef np.int64_t[:] atom_cells = self._atom_cells
+        for atom_i in range(coord.shape[0]):
             # Get cell indices for coordinates
-            self._get_cell_index(x, y, z, &i, &j, &k)
-            # Increment cell length and reallocate
-            length = self._cell_length[i,j,k] + 1
-            cell_ptr = <int*>self._cells[i,j,k]
-            cell_ptr = <int*>realloc(cell_ptr, length * sizeof(int))
-            if not cell_ptr:
-                raise MemoryError()
-            # Potentially increase max cell length
-            if length > self._max_cell_length:
-                self._max_cell_length = length
-            # Store atom array index in respective cell
-            cell_ptr[length-1] = atom_array_i
-            # Store new cell pointer and length
-            self._cell_length[i,j,k] = length
-            self._cells[i,j,k] = <ptr> cell_ptr
-            
-    def __dealloc__(self):
-        if self._has_initialized_cells():
-            deallocate_ptrs(self._cells)
+            self._get_cell_index(
+                coord[atom_i, 0], coord[atom_i, 1], coord[atom_i, 2],
+                &i, &j, &k
+            )
+            atom_cells[atom_i] = self._flat_cell_index(i, j, k)
+        if self._sparse:
+            # Only the occupied cells get a slot
+            cell_keys, slots, cell_lengths = np.unique(
+                np.asarray(atom_cells), return_inverse=True,
+                return_counts=True
+            )
+            self._cell_keys = cell_keys
+            self._atom_cells = slots.astype(np.int64, copy=False)
+            self._cell_lengths = cell_lengths.astype(np.int64, copy=False)
+        else:
+            self._cell_lengths = np.bincount(
+                np.asarray(atom_cells),
+                minlength = <np.int64_t> self._grid_shape[0]
+                          * self._grid_shape[1]
+                          * self._grid_shape[2]
+            ).astype(np.int64, copy=False)
+        self._sort_into_cells()
     
     @cython.initializedcheck(False)
     @cython.boundscheck(False)
     @cython.wraparound(False)
-    def create_adjacency_matrix(self, float32 threshold_distance):
+    cdef void _sort_into_cells(self) except *:
+        # Put the atom indices into the cells based on the
+        # already determined cell of each atom and cell lengths
+        cdef int atom_i
+        cdef np.int64_t cell_i
+        cdef np.int64_t[:] atom_cells = self._atom_cells
+        cell_lengths = np.asarray(self._cell_lengths)
+        self._max_cell_length = np.max(cell_lengths)
+        cdef np.ndarray offsets = np.zeros(
+            len(cell_lengths) + 1, dtype=np.int64
+        )
+        np.cumsum(cell_lengths, out=offsets[1:])
+        self._cell_offsets = offsets
+        # The next free position in each cell
+        cdef np.int64_t[:] fill_pos = offsets[:-1].copy()
+        cdef int[:] cell_indices = np.zeros(atom_cells.shape[0], dtype=np.int32)
+        for atom_i in range(atom_cells.shape[0]):
+            cell_i = atom_cells[atom_i]
+            cell_indices[fill_pos[cell_i]] = atom_i
+            fill_pos[cell_i] += 1
+        self._cell_indices = cell_indices
+    
+    def __reduce__(self):
+        # The cells are restored from the (wrapped) coordinates,
+        # which requires only linear time
+        box = np.asarray(self._box) if self._periodic else None
+        backend = "sparse" if self._sparse else "dense"
+        return CellList, (
+            np.asarray(self._coord), self._cellsize, box, backend
+        )
+    
+    def create_adjacency_matrix(self, float32 threshold_distance,
+                                bint sparse=False):
         """
-        create_adjacency_matrix(threshold_distance)
+        create_adjacency_matrix(threshold_distance, sparse=False)
         
         Create an adjacency matrix for the atoms in this cell list.
 
@@ -142,11 +372,28 @@ cdef class CellList:
             The threshold distance. All atom pairs that have a distance
             lower than this value are indicated by `True` values in
             the resulting matrix.
+        sparse : bool, optional
+            If true, the adjacency matrix is returned in the compressed
+            sparse row (CSR) format instead of a dense boolean matrix.
+            The memory requirement is proportional to the amount of
+            adjacent atom pairs, instead of the squared amount of
+            atoms.
         
         Returns
         -------
         matrix : ndarray, dtype=bool
             An *n x n* adjacency matrix.
+            Only returned with `sparse` set to false.
+        indptr, indices : ndarray, dtype=int64 and ndarray, dtype=int32
+            The adjacency matrix in CSR format:
+            The indices of the atoms adjacent to atom *i* are
+            ``indices[indptr[i] : indptr[i+1]]``.
+            The indices in each row are not necessarily sorted.
+            Only returned with `sparse` set to true.
+        
+        See Also
+        --------
+        get_atom_pairs
         
         Notes
         -----
@@ -162,23 +409,169 @@ cdef class CellList:
         >>> atom_array = atom_array[atom_array.atom_name == "CA"]
         >>> cell_list = struc.CellList(atom_array, 5)
         >>> matrix = cell_list.create_adjacency_matrix(5)
+        
+        Obtain the same information in CSR format:
+
+        >>> indptr, indices = cell_list.create_adjacency_matrix(
+        ...     5, sparse=True
+        ... )
+        >>> adjacent_to_first = indices[indptr[0] : indptr[1]]
         """
         if threshold_distance < 0:
             raise ValueError("Threshold must be a positive value")
-        cdef int i=0, j=0
-        cdef int index
-        cdef int[:,:] adjacent_indices = self.get_atoms(
-            np.asarray(self._coord), threshold_distance
+        indptr, indices = self._find_adjacent_atoms(threshold_distance, False)
+        if sparse:
+            return indptr, indices
+        else:
+            matrix = np.zeros(
+                (self._coord.shape[0], self._coord.shape[0]), dtype=bool
+            )
+            rows = np.repeat(
+                np.arange(self._coord.shape[0]), np.diff(indptr)
+            )
+            matrix[rows, indices] = True
+            return matrix
+    
+    def get_atom_pairs(self, float32 radius):
+        """
+        get_atom_pairs(radius)
+        
+        Find all pairs of atoms in this cell list, that have a maximum
+        distance to each other.
+
+        In contrast to `create_adjacency_matrix()`, the result is a
+        compact list of atom index pairs:
+        Each pair is only reported once and atoms are not paired with
+        themselves.
+        Hence, the memory requirement is proportional to the amount of
+        contacts, rather than to the squared amount of atoms.
+        
+        Parameters
+        ----------
+        radius : float
+            The maximum distance between two atoms of a pair.
+        
+        Returns
+        -------
+        pairs : ndarray, dtype=int32, shape=(k,2)
+            The indices of the atom pairs, that are in `radius`
+            distance to each other.
+            The index in the first column is always lower than the
+            index in the second column.
+        
+        See Also
+        --------
+        create_adjacency_matrix
+        
+        Examples
+        --------
+        
+        >>> cell_list = struc.CellList(atom_array, 5)
+        >>> pairs = cell_list.get_atom_pairs(5)
+        >>> contacts_per_atom = np.bincount(
+        ...     pairs.flatten(), minlength=atom_array.array_length()
+        ... )
+        """
+        if radius < 0:
+            raise ValueError("Radius must be a positive value")
+        indptr, indices = self._find_adjacent_atoms(radius, True)
+        pairs = np.zeros((len(indices), 2), dtype=np.int32)
+        pairs[:, 0] = np.repeat(
+            np.arange(self._coord.shape[0], dtype=np.int32), np.diff(indptr)
         )
-        return self._as_mask(adjacent_indices)
+        pairs[:, 1] = indices
+        return pairs
+    
+    @cython.initializedcheck(False)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef tuple _find_adjacent_atoms(self, float32 radius, bint only_higher):
+        # Find all atoms within 'radius' for each atom in the cell list
+        # and return them in CSR format (indptr, indices)
+        # If 'only_higher' is true, only adjacent atoms with a higher
+        # index than the respective atom are recorded
+        cdef int atom_i, adj_atom_i
+        cdef int i=0, j=0, k=0
+        cdef int adj_i, adj_j, adj_k
+        cdef int wrap_i, wrap_j, wrap_k
+        cdef int img_i=0, img_j=0, img_k=0
+        cdef int start_i, start_j, start_k
+        cdef int stop_i, stop_j, stop_k
+        cdef float32 x1, y1, z1
+        cdef float32 shift_x, shift_y, shift_z
+        cdef float32 sq_radius = radius * radius
+        cdef int cell_r = <int>(radius / self._cellsize) + 1
+        cdef long count = 0
         
+        if self._periodic:
+            self._check_radius(radius)
+        
+        cdef float32[:,:] coord = self._coord
+        cdef int[:] cell_indices = self._cell_indices
+        cdef np.int64_t[:] cell_offsets = self._cell_offsets
+        cdef np.int64_t cell_i, slot_i
+        
+        cdef np.ndarray indptr = np.zeros(coord.shape[0] + 1, dtype=np.int64)
+        cdef np.int64_t[:] indptr_v = indptr
+        # Initial guess for the required amount of memory,
+        # the array grows if necessary
+        cdef np.ndarray indices = np.zeros(
+            max(coord.shape[0] * self._max_cell_length, 1), dtype=np.int32
+        )
+        cdef int[:] indices_v = indices
+        
+        for atom_i in range(coord.shape[0]):
+            x1 = coord[atom_i, 0]
+            y1 = coord[atom_i, 1]
+            z1 = coord[atom_i, 2]
+            self._get_cell_index(x1, y1, z1, &i, &j, &k)
+            self._get_adjacent_range(i, cell_r, 0, False, &start_i, &stop_i)
+            self._get_adjacent_range(j, cell_r, 1, False, &start_j, &stop_j)
+            self._get_adjacent_range(k, cell_r, 2, False, &start_k, &stop_k)
+            for adj_i in range(start_i, stop_i):
+                wrap_i = _wrap_index(adj_i, self._grid_shape[0], &img_i)
+                for adj_j in range(start_j, stop_j):
+                    wrap_j = _wrap_index(adj_j, self._grid_shape[1], &img_j)
+                    for adj_k in range(start_k, stop_k):
+                        wrap_k = _wrap_index(adj_k, self._grid_shape[2], &img_k)
+                        self._get_image_shift(
+                            img_i, img_j, img_k, &shift_x, &shift_y, &shift_z
+                        )
+                        slot_i = self._get_cell_slot(wrap_i, wrap_j, wrap_k)
+                        if slot_i == -1:
+                            # Empty cell
+                            continue
+                        for cell_i in range(
+                            cell_offsets[slot_i], cell_offsets[slot_i+1]
+                        ):
+                            adj_atom_i = cell_indices[cell_i]
+                            if only_higher and adj_atom_i <= atom_i:
+                                continue
+                            if squared_distance(
+                                x1, y1, z1,
+                                coord[adj_atom_i, 0] + shift_x,
+                                coord[adj_atom_i, 1] + shift_y,
+                                coord[adj_atom_i, 2] + shift_z
+                            ) <= sq_radius:
+                                if count >= indices_v.shape[0]:
+                                    # Double the capacity
+                                    indices = np.concatenate(
+                                        [indices, np.zeros_like(indices)]
+                                    )
+                                    indices_v = indices
+                                indices_v[count] = adj_atom_i
+                                count += 1
+            indptr_v[atom_i+1] = count
+        
+        return indptr, indices[:count]
     
     @cython.initializedcheck(False)
     @cython.boundscheck(False)
     @cython.wraparound(False)
-    def get_atoms(self, np.ndarray coord, radius, bint as_mask=False):
+    def get_atoms(self, np.ndarray coord, radius, bint as_mask=False,
+                  int threads=1):
         """
-        get_atoms(coord, radius, as_mask=False)
+        get_atoms(coord, radius, as_mask=False, threads=1)
         
         Find atoms with a maximum distance from given coordinates.
         
@@ -205,6 +598,10 @@ cdef class CellList:
         as_mask : bool, optional
             If true, the result is returned as boolean mask, instead
             of an index array
+        threads : int, optional
+            The amount of threads, that process the positions in `coord`
+            in parallel.
+            By default, the positions are processed in a single thread.
         
         Returns
         -------
@@ -270,62 +667,30 @@ cdef class CellList:
         [104 114  45  46  55  44  54 105 271 273 265 268 269 272 275]
         [ 46  55 273 268 269 272 274 275]
         """
-        cdef int i=0, j=0
-        cdef int array_i = 0
-        cdef int max_array_length = 0
-        cdef int coord_index
-        cdef float32 x1, y1, z1, x2, y2, z2
-        cdef float32 sq_dist
-        cdef float32 sq_radius
-        cdef float32[:] sq_radii
+        cdef int max_array_length
+        cdef np.ndarray sq_radii
         cdef np.ndarray cell_radii
         
-        cdef int[:,:] all_indices
-        cdef int[:,:] indices
-        cdef float32[:,:] coord_v
-        
         coord, radius, is_multi_coord, is_multi_radius \
             = _prepare_vectorization(coord, radius, np.float32)
-        if is_multi_radius:
-            sq_radii = radius * radius
-            cell_radii = np.floor_divide(
-                radius, self._cellsize
-            ).astype(np.int32) + 1
-        else:
-            # All radii are equal
-            sq_radii = np.full(
-                len(coord), radius[0]*radius[0], dtype=np.float32
-            )
-            cell_radii = np.full(
-                len(coord), int(radius[0]/self._cellsize)+1, dtype=np.int32
-            )
-
-        all_indices = self.get_atoms_in_cells(coord, cell_radii)
+        if self._periodic:
+            self._check_radius(np.max(radius))
+            coord = self._wrap_coord(coord)
+        sq_radii = radius * radius
+        cell_radii = np.floor_divide(
+            radius, self._cellsize
+        ).astype(np.int32) + 1
         
-        # Filter all indices from all_indices,
-        # where squared distance is smaller than squared radius
-        indices = np.full(
-            (all_indices.shape[0], all_indices.shape[1]), -1, dtype=np.int32
+        # Worst case assumption on index array length requirement
+        # (see 'get_atoms_in_cells()')
+        cdef int length \
+            = (2*np.max(cell_radii) + 1)**3 * self._max_cell_length
+        indices = np.full((len(coord), length), -1, dtype=np.int32)
+        # Fill index array with the indices of atoms,
+        # where the squared distance is smaller than squared radius
+        max_array_length = self._find_atoms(
+            coord, indices, cell_radii, sq_radii, True, threads
         )
-        coord_v = coord
-        for i in range(all_indices.shape[0]):
-            sq_radius = sq_radii[i]
-            x1 = coord_v[i,0]
-            y1 = coord_v[i,1]
-            z1 = coord_v[i,2]
-            array_i = 0
-            for j in range(all_indices.shape[1]):
-                coord_index = all_indices[i,j]
-                if coord_index != -1:
-                    x2 = self._coord[coord_index, 0]
-                    y2 = self._coord[coord_index, 1]
-                    z2 = self._coord[coord_index, 2]
-                    sq_dist = squared_distance(x1, y1, z1, x2, y2, z2)
-                    if sq_dist <= sq_radius:
-                        indices[i, array_i] = coord_index
-                        array_i += 1
-            if array_i > max_array_length:
-                max_array_length = array_i
         
         if as_mask:
             matrix = self._as_mask(indices)
@@ -335,16 +700,17 @@ cdef class CellList:
                 return matrix[0]
         else:
             if is_multi_coord:
-                return np.asarray(indices)[:, :max_array_length]
+                return indices[:, :max_array_length]
             else:
-                return np.asarray(indices)[0, :max_array_length]
+                return indices[0, :max_array_length]
     
     @cython.boundscheck(False)
     @cython.wraparound(False)
     def get_atoms_in_cells(self, np.ndarray coord,
-                           cell_radius=1, bint as_mask=False):
+                           cell_radius=1, bint as_mask=False,
+                           int threads=1):
         """
-        get_atoms_in_cells(coord, cell_radius=1, as_mask=False)
+        get_atoms_in_cells(coord, cell_radius=1, as_mask=False, threads=1)
         
         Find atoms with a maximum cell distance from given
         coordinates.
@@ -383,6 +749,13 @@ cdef class CellList:
             `ndarray`.
             By default atoms are searched in the cell of `coord`
             and directly adjacent cells (cell_radius = 1).
+        as_mask : bool, optional
+            If true, the result is returned as boolean mask, instead
+            of an index array
+        threads : int, optional
+            The amount of threads, that process the positions in `coord`
+            in parallel.
+            By default, the positions are processed in a single thread.
         
         Returns
         -------
@@ -404,6 +777,8 @@ cdef class CellList:
         """
         coord, cell_radius, is_multi_coord, is_multi_radius \
             = _prepare_vectorization(coord, cell_radius, np.int32)
+        if self._periodic:
+            coord = self._wrap_coord(coord)
         
         cdef int max_cell_radius
         if is_multi_radius:
@@ -419,8 +794,9 @@ cdef class CellList:
         cdef int length = (2*max_cell_radius + 1)**3 * self._max_cell_length
         array_indices = np.full((len(coord), length), -1, dtype=np.int32)
         # Fill index array
-        cdef int max_array_length \
-            = self._get_atoms_in_cells(coord, array_indices, cell_radius)
+        cdef int max_array_length = self._find_atoms(
+            coord, array_indices, cell_radius, None, False, threads
+        )
         if as_mask:
             matrix = self._as_mask(array_indices)
             if is_multi_coord:
@@ -434,30 +810,74 @@ cdef class CellList:
                 return array_indices[0, :max_array_length]
             
     
+    def _find_atoms(self, float32[:,:] coord, int[:,:] indices,
+                    int[:] cell_radius, float32[:] sq_radius,
+                    bint check_distance, int threads):
+        # Distribute the positions in equal parts over the threads
+        # (see '_get_atoms_in_cells()' for the parameters)
+        if threads < 1:
+            raise ValueError("At least one thread is required")
+        if threads == 1:
+            return self._find_atoms_in_chunk(
+                coord, indices, cell_radius, sq_radius, check_distance
+            )
+        bounds = np.linspace(0, coord.shape[0], threads+1).astype(int)
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            futures = [
+                executor.submit(
+                    self._find_atoms_in_chunk,
+                    coord[start : stop],
+                    indices[start : stop],
+                    cell_radius[start : stop],
+                    sq_radius[start : stop] if check_distance else None,
+                    check_distance
+                )
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            ]
+            return max([future.result() for future in futures])
+    
+    def _find_atoms_in_chunk(self, float32[:,:] coord, int[:,:] indices,
+                             int[:] cell_radius, float32[:] sq_radius,
+                             bint check_distance):
+        cdef int max_array_length
+        # The GIL is released to allow parallel execution in threads
+        with nogil:
+            max_array_length = self._get_atoms_in_cells(
+                coord, indices, cell_radius, sq_radius, check_distance
+            )
+        return max_array_length
+    
+    @cython.initializedcheck(False)
     @cython.boundscheck(False)
     @cython.wraparound(False)
     cdef int _get_atoms_in_cells(self,
                                  float32[:,:] coord,
                                  int[:,:] indices,
-                                 int[:] cell_radius):
+                                 int[:] cell_radius,
+                                 float32[:] sq_radius,
+                                 bint check_distance) nogil:
         # This method fills the given empty index array
         # with actual indices of adjacent atoms
+        # If 'check_distance' is true, only atoms within the respective
+        # radius in 'sq_radius' are added
         #
         # Since the length of 'indices' (second dimension) is
         # the wort case assumption, this method returns the actual
         # required length, i.e. the highest length of all arrays
         # in this 'array of arrays'
-        cdef int length
-        cdef int* list_ptr
-        cdef float32 x, y,z
+        cdef float32 x, y, z
+        cdef float32 shift_x, shift_y, shift_z
         cdef int i=0, j=0, k=0
         cdef int adj_i, adj_j, adj_k
-        cdef int pos_i, array_i, cell_i
+        cdef int wrap_i, wrap_j, wrap_k
+        cdef int img_i=0, img_j=0, img_k=0
+        cdef int start_i, start_j, start_k
+        cdef int stop_i, stop_j, stop_k
+        cdef int pos_i, array_i
+        cdef int atom_i
         cdef int max_array_length = 0
         cdef int cell_r
-        
-        cdef ptr[:,:,:] cells = self._cells
-        cdef int[:,:,:] cell_length = self._cell_length
+        cdef np.int64_t cell_i, slot_i
 
         for pos_i in range(coord.shape[0]):
             array_i = 0
@@ -466,22 +886,55 @@ cdef class CellList:
             y = coord[pos_i, 1]
             z = coord[pos_i, 2]
             self._get_cell_index(x, y, z, &i, &j, &k)
+            # Without distance check, each cell must be visited only
+            # once, since the image of the visited cell is irrelevant
+            self._get_adjacent_range(
+                i, cell_r, 0, not check_distance, &start_i, &stop_i
+            )
+            self._get_adjacent_range(
+                j, cell_r, 1, not check_distance, &start_j, &stop_j
+            )
+            self._get_adjacent_range(
+                k, cell_r, 2, not check_distance, &start_k, &stop_k
+            )
             # Look into cells of the indices and adjacent cells
             # in all 3 dimensions
-            for adj_i in range(i-cell_r, i+cell_r+1):
-                if (adj_i >= 0 and adj_i < cells.shape[0]):
-                    for adj_j in range(j-cell_r, j+cell_r+1):
-                        if (adj_j >= 0 and adj_j < cells.shape[1]):
-                            for adj_k in range(k-cell_r, k+cell_r+1):
-                                if (adj_k >= 0 and adj_k < cells.shape[2]):
-                                    # Fill index array
-                                    # with indices in cell
-                                    list_ptr = <int*>cells[adj_i, adj_j, adj_k]
-                                    length = cell_length[adj_i, adj_j, adj_k]
-                                    for cell_i in range(length):
-                                        indices[pos_i, array_i] = \
-                                            list_ptr[cell_i]
-                                        array_i += 1
+            for adj_i in range(start_i, stop_i):
+                wrap_i = _wrap_index(adj_i, self._grid_shape[0], &img_i)
+                for adj_j in range(start_j, stop_j):
+                    wrap_j = _wrap_index(adj_j, self._grid_shape[1], &img_j)
+                    for adj_k in range(start_k, stop_k):
+                        wrap_k = _wrap_index(adj_k, self._grid_shape[2], &img_k)
+                        slot_i = self._get_cell_slot(wrap_i, wrap_j, wrap_k)
+                        if slot_i == -1:
+                            # Empty cell
+                            continue
+                        if not check_distance:
+                            # Fill index array with indices in cell
+                            for cell_i in range(
+                                self._cell_offsets[slot_i],
+                                self._cell_offsets[slot_i+1]
+                            ):
+                                indices[pos_i, array_i] \
+                                    = self._cell_indices[cell_i]
+                                array_i += 1
+                            continue
+                        self._get_image_shift(
+                            img_i, img_j, img_k, &shift_x, &shift_y, &shift_z
+                        )
+                        for cell_i in range(
+                            self._cell_offsets[slot_i],
+                            self._cell_offsets[slot_i+1]
+                        ):
+                            atom_i = self._cell_indices[cell_i]
+                            if squared_distance(
+                                x, y, z,
+                                self._coord[atom_i, 0] + shift_x,
+                                self._coord[atom_i, 1] + shift_y,
+                                self._coord[atom_i, 2] + shift_z
+                            ) <= sq_radius[pos_i]:
+                                indices[pos_i, array_i] = atom_i
+                                array_i += 1
             if array_i > max_array_length:
                 max_array_length = array_i
         return max_array_length
@@ -492,10 +945,108 @@ cdef class CellList:
     @cython.wraparound(False)
     @cython.cdivision(True)
     cdef inline void _get_cell_index(self, float32 x, float32 y, float32 z,
-                             int* i, int* j, int* k):
-        i[0] = <int>((x - self._min_coord[0]) / self._cellsize)
-        j[0] = <int>((y - self._min_coord[1]) / self._cellsize)
-        k[0] = <int>((z - self._min_coord[2]) / self._cellsize)
+                                     int* i, int* j, int* k) nogil:
+        if self._periodic:
+            # The cells are equal divisions of the fractional coordinates
+            i[0] = _fractional_cell_index(
+                x*self._inv_box[0,0] + y*self._inv_box[1,0]
+                + z*self._inv_box[2,0],
+                self._grid_shape[0]
+            )
+            j[0] = _fractional_cell_index(
+                x*self._inv_box[0,1] + y*self._inv_box[1,1]
+                + z*self._inv_box[2,1],
+                self._grid_shape[1]
+            )
+            k[0] = _fractional_cell_index(
+                x*self._inv_box[0,2] + y*self._inv_box[1,2]
+                + z*self._inv_box[2,2],
+                self._grid_shape[2]
+            )
+        else:
+            i[0] = <int>((x - self._min_coord[0]) / self._cellsize)
+            j[0] = <int>((y - self._min_coord[1]) / self._cellsize)
+            k[0] = <int>((z - self._min_coord[2]) / self._cellsize)
+    
+    cdef inline np.int64_t _flat_cell_index(self, int i, int j, int k) nogil:
+        return (<np.int64_t>i * self._grid_shape[1] + j) \
+               * self._grid_shape[2] + k
+    
+    @cython.initializedcheck(False)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef inline np.int64_t _get_cell_slot(self, int i, int j, int k) nogil:
+        # Get the position of the cell in '_cell_offsets'
+        # or -1 if the cell is not occupied (only for sparse backend)
+        cdef np.int64_t key = self._flat_cell_index(i, j, k)
+        if not self._sparse:
+            return key
+        # Binary search in the sorted keys of occupied cells
+        cdef np.int64_t low = 0
+        cdef np.int64_t high = self._cell_keys.shape[0] - 1
+        cdef np.int64_t mid
+        while low <= high:
+            mid = (low + high) // 2
+            if self._cell_keys[mid] < key:
+                low = mid + 1
+            elif self._cell_keys[mid] > key:
+                high = mid - 1
+            else:
+                return mid
+        return -1
+    
+    @cython.initializedcheck(False)
+    cdef inline void _get_adjacent_range(self, int center, int cell_radius,
+                                         int dim, bint unique,
+                                         int* start, int* stop) nogil:
+        # Get the range of cell indices in the given dimension,
+        # that are within 'cell_radius' of the 'center' cell index
+        # In the periodic case, the indices may exceed the grid and
+        # need to be wrapped via '_wrap_index()'
+        # If 'unique' is true, the range never covers multiple periodic
+        # copies of the same cell
+        cdef int cell_count = self._grid_shape[dim]
+        if self._periodic:
+            start[0] = center - cell_radius
+            if unique:
+                stop[0] = start[0] + min(2*cell_radius + 1, cell_count)
+            else:
+                stop[0] = center + cell_radius + 1
+        else:
+            start[0] = max(center - cell_radius, 0)
+            stop[0] = min(center + cell_radius + 1, cell_count)
+    
+    @cython.initializedcheck(False)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef inline void _get_image_shift(self, int img_i, int img_j, int img_k,
+                                      float32* shift_x, float32* shift_y,
+                                      float32* shift_z) nogil:
+        # Get the translation vector from the atoms in the box to
+        # their periodic copy in the box with the given image indices
+        if img_i == 0 and img_j == 0 and img_k == 0:
+            shift_x[0] = 0
+            shift_y[0] = 0
+            shift_z[0] = 0
+        else:
+            shift_x[0] = img_i*self._box[0,0] + img_j*self._box[1,0] \
+                       + img_k*self._box[2,0]
+            shift_y[0] = img_i*self._box[0,1] + img_j*self._box[1,1] \
+                       + img_k*self._box[2,1]
+            shift_z[0] = img_i*self._box[0,2] + img_j*self._box[1,2] \
+                       + img_k*self._box[2,2]
+    
+    def _check_radius(self, radius):
+        if radius > self._max_radius:
+            raise ValueError(
+                f"A radius of {radius:.2f} is too large for the box, "
+                f"the maximum is {self._max_radius:.2f}"
+            )
+    
+    def _wrap_coord(self, coord):
+        return _move_inside_box(
+            coord, np.asarray(self._inv_box), np.asarray(self._box)
+        ).astype(np.float32)
     
     @cython.initializedcheck(False)
     @cython.boundscheck(False)
@@ -527,18 +1078,6 @@ cdef class CellList:
                     break
                 matrix[i, index] = True
         return np.asarray(matrix, dtype=bool)
-    
-    cdef inline bint _has_initialized_cells(self):
-        # Memoryviews are not initialized on class creation
-        # This method checks if a the _cells memoryview was initialized
-        # and is not None
-        try:
-            if self._cells is not None:
-                return True
-            else:
-                return False
-        except AttributeError:
-            return False
 
 
 def _prepare_vectorization(np.ndarray coord, radius, radius_dtype):
@@ -609,19 +1148,43 @@ def _prepare_vectorization(np.ndarray coord, radius, radius_dtype):
     return coord, radius, is_multi_coord, is_multi_radius
 
 
-cdef inline void deallocate_ptrs(ptr[:,:,:] ptrs):
-    cdef int i, j, k
-    cdef int* cell_ptr
-    # Free cell pointers
-    for i in range(ptrs.shape[0]):
-        for j in range(ptrs.shape[1]):
-            for k in range(ptrs.shape[2]):
-                cell_ptr = <int*>ptrs[i,j,k]
-                free(cell_ptr)
+def _move_inside_box(coord, inv_box, box):
+    """
+    Move the given coordinates into the box spanned by `box`, by
+    wrapping the fractional coordinates into the interval *[0, 1)*.
+    """
+    fractions = np.dot(coord, inv_box)
+    fractions -= np.floor(fractions)
+    return np.dot(fractions, box)
+
+
+cdef inline int _fractional_cell_index(double fraction,
+                                       int cell_count) nogil:
+    fraction -= floor(fraction)
+    cdef int index = <int>(fraction * cell_count)
+    # Rounding errors may lead to index out of range
+    if index >= cell_count:
+        return cell_count - 1
+    if index < 0:
+        return 0
+    return index
+
+
+cdef inline int _wrap_index(int index, int cell_count, int* image) nogil:
+    # Map a cell index outside of the cell grid into the grid and
+    # report the periodic image the index belonged to
+    image[0] = 0
+    while index < 0:
+        index += cell_count
+        image[0] -= 1
+    while index >= cell_count:
+        index -= cell_count
+        image[0] += 1
+    return index
 
 
 cdef inline float32 squared_distance(float32 x1, float32 y1, float32 z1,
-                    float32 x2, float32 y2, float32 z2):
+                    float32 x2, float32 y2, float32 z2) nogil:
     cdef float32 diff_x = x2 - x1
     cdef float32 diff_y = y2 - y1
     cdef float32 diff_z = z2 - z1
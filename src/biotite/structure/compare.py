@@ -8,10 +8,11 @@ comparing multiple structures with each other.
 """
 
 __author__ = "Patrick Kunzmann"
-__all__ = ["rmsd", "rmsf", "average"]
+__all__ = ["rmsd", "rmsf", "average", "rmsd_stream", "rmsf_stream",
+           "average_stream"]
 
 import numpy as np
-from .atoms import Atom, AtomArray, AtomArrayStack
+from .atoms import Atom, AtomArray, AtomArrayStack, coord as to_coord
 from .util import vector_dot
 
 
@@ -117,6 +118,206 @@ def average(atom_arrays):
     return mean_array
 
 
+def rmsd_stream(reference, chunks):
+    """
+    Calculate the RMSD of a trajectory, that is given in chunks of
+    frames, compared to a reference structure.
+
+    This function gives the same values as `rmsd()`, but only a
+    single chunk is in memory at once.
+    Hence, it is suitable for long trajectories that do not fit into
+    memory as a whole, for example using the chunks from
+    `TrajectoryFile.read_chunks()`.
+
+    Parameters
+    ----------
+    reference : AtomArray
+        Reference structure.
+    chunks : iterable object of (ndarray, dtype=float, shape=(m,n,3) or AtomArrayStack)
+        The trajectory frames.
+        Each chunk contains the coordinates of *m* consecutive frames
+        for the *n* atoms in `reference`.
+
+    Returns
+    -------
+    rmsd : ndarray, dtype=float, shape=(t,)
+        The RMSD between each of the *t* frames and the reference.
+
+    See Also
+    --------
+    rmsd
+    """
+    if type(reference) != AtomArray:
+        raise ValueError("Reference must be AtomArray")
+    rmsd_values = []
+    for coord in _chunk_coord(chunks, reference.array_length()):
+        dif = coord - reference.coord
+        rmsd_values.append(np.sqrt(np.mean(vector_dot(dif, dif), axis=-1)))
+    if len(rmsd_values) == 0:
+        return np.zeros(0, dtype=reference.coord.dtype)
+    return np.concatenate(rmsd_values)
+
+
+def rmsf_stream(reference, chunks):
+    """
+    Calculate the RMSF of a trajectory, that is given in chunks of
+    frames, compared to a reference structure.
+
+    This function gives the same values as `rmsf()`, but only a
+    single chunk is in memory at once and the memory requirement is
+    independent of the trajectory length.
+    If no reference is given, the RMSF is calculated with respect to
+    the average structure of the trajectory.
+    In this case the average structure and the fluctuations are
+    calculated together in a single pass over the chunks.
+
+    Parameters
+    ----------
+    reference : AtomArray or None
+        Reference structure.
+        If None, the average structure of the trajectory is used
+        as reference, i.e. the result is equal to
+        ``rmsf(average(stack), stack)``.
+    chunks : iterable object of (ndarray, dtype=float, shape=(m,n,3) or AtomArrayStack)
+        The trajectory frames.
+        Each chunk contains the coordinates of *m* consecutive frames
+        for the *n* atoms in `reference`.
+
+    Returns
+    -------
+    rmsf : ndarray, dtype=float, shape=(n,)
+        RMSF between the trajectory and the reference structure.
+        The index corresponds to the atoms in the annotation arrays.
+
+    See Also
+    --------
+    rmsf, average_stream
+
+    Notes
+    -----
+    Without a reference, the mean coordinates and the squared
+    deviations from them are updated for each chunk using the
+    parallel variant of *Welford*'s algorithm [1]_, which is
+    numerically stable.
+
+    References
+    ----------
+
+    .. [1] TF Chan, GH Golub, RJ LeVeque,
+       "Updating formulae and a pairwise algorithm for computing sample
+       variances."
+       COMPSTAT 1982, 30-41 (1982).
+    """
+    if reference is None:
+        n_frames, _, sq_dev = _accumulate_moments(chunks, None)
+    else:
+        if type(reference) != AtomArray:
+            raise ValueError("Reference must be AtomArray")
+        n_frames = 0
+        sq_dev = np.zeros(reference.array_length(), dtype=np.float64)
+        for coord in _chunk_coord(chunks, reference.array_length()):
+            dif = coord - reference.coord
+            sq_dev += np.sum(vector_dot(dif, dif), axis=0)
+            n_frames += len(coord)
+    if n_frames == 0:
+        raise ValueError("The trajectory contains no frames")
+    return np.sqrt(sq_dev / n_frames)
+
+
+def average_stream(template, chunks):
+    """
+    Calculate the average structure of a trajectory, that is given in
+    chunks of frames.
+
+    This function gives the same structure as `average()`, but only
+    a single chunk is in memory at once and the memory requirement is
+    independent of the trajectory length.
+
+    Parameters
+    ----------
+    template : AtomArray
+        The template, the atom annotations are taken from.
+    chunks : iterable object of (ndarray, dtype=float, shape=(m,n,3) or AtomArrayStack)
+        The trajectory frames.
+        Each chunk contains the coordinates of *m* consecutive frames
+        for the *n* atoms in `template`.
+
+    Returns
+    -------
+    average : AtomArray
+        Structure with averaged atom coordinates.
+
+    See Also
+    --------
+    average, rmsf_stream
+    """
+    n_frames, mean, _ = _accumulate_moments(chunks, template.array_length())
+    if n_frames == 0:
+        raise ValueError("The trajectory contains no frames")
+    mean_array = template.copy()
+    mean_array.coord = mean.astype(template.coord.dtype)
+    return mean_array
+
+
+def _accumulate_moments(chunks, n_atoms):
+    """
+    Calculate the number of frames, the mean coordinates and the sum
+    of squared deviations from the mean of each atom in a single pass
+    over the chunks.
+
+    Returns
+    -------
+    n_frames : int
+        The number of frames.
+    mean : ndarray, dtype=float, shape=(n,3)
+        The mean coordinates.
+    sq_dev : ndarray, dtype=float, shape=(n,)
+        The sum of squared deviations from the mean over all frames.
+    """
+    n_frames = 0
+    mean = None
+    sq_dev = None
+    for coord in _chunk_coord(chunks, n_atoms):
+        n_chunk_frames = len(coord)
+        if n_chunk_frames == 0:
+            continue
+        coord = coord.astype(np.float64, copy=False)
+        chunk_mean = np.mean(coord, axis=0)
+        dif = coord - chunk_mean
+        chunk_sq_dev = np.sum(vector_dot(dif, dif), axis=0)
+        if mean is None:
+            mean = chunk_mean
+            sq_dev = chunk_sq_dev
+        else:
+            # Merge the moments of the chunk with the moments of all
+            # previous frames
+            total_frames = n_frames + n_chunk_frames
+            delta = chunk_mean - mean
+            mean = mean + delta * (n_chunk_frames / total_frames)
+            sq_dev = sq_dev + chunk_sq_dev + vector_dot(delta, delta) \
+                     * (n_frames * n_chunk_frames / total_frames)
+        n_frames += n_chunk_frames
+    return n_frames, mean, sq_dev
+
+
+def _chunk_coord(chunks, n_atoms):
+    """
+    Yield the coordinates of each chunk as *(m,n,3)* array.
+    """
+    for chunk in chunks:
+        coord = to_coord(chunk)
+        if coord.ndim == 2:
+            # A single frame
+            coord = coord[np.newaxis, ...]
+        if coord.ndim != 3 or coord.shape[-1] != 3 \
+           or (n_atoms is not None and coord.shape[1] != n_atoms):
+                raise IndexError(
+                    f"Expected chunks with shape (m,{n_atoms},3), "
+                    f"but got {coord.shape}"
+                )
+        yield coord
+
+
 def _sq_euclidian(reference, subject):
     """
     Calculate squared euclidian distance between atoms in two
@@ -2,7 +2,7 @@
 # under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
 # information.
 
-from typing import Union, overload
+from typing import Iterable, Optional, Union, overload
 import numpy as np
 from .atoms import AtomArray, AtomArrayStack
 
@@ -15,3 +15,18 @@ def rmsd(reference: AtomArray, subject: AtomArrayStack) -> np.ndarray: ...
 def rmsf(reference: AtomArray, subject: AtomArrayStack) -> np.ndarray: ...
 
 def average(atom_arrays: AtomArrayStack) -> AtomArray: ...
+
+def rmsd_stream(
+    reference: AtomArray,
+    chunks: Iterable[Union[np.ndarray, AtomArrayStack]]
+) -> np.ndarray: ...
+
+def rmsf_stream(
+    reference: Optional[AtomArray],
+    chunks: Iterable[Union[np.ndarray, AtomArrayStack]]
+) -> np.ndarray: ...
+
+def average_stream(
+    template: AtomArray,
+    chunks: Iterable[Union[np.ndarray, AtomArrayStack]]
+) -> AtomArray: ...
@@ -10,6 +10,7 @@ in a structure, mainly lenghts and angles.
 __author__ = "Patrick Kunzmann"
 __all__ = ["distance", "centroid", "angle", "dihedral", "dihedral_backbone"]
 
+import itertools
 import numpy as np
 from .atoms import Atom, AtomArray, AtomArrayStack, coord
 from .util import vector_dot, norm_vector
@@ -17,7 +18,7 @@ from .filter import filter_backbone
 from .error import BadStructureError
 
 
-def distance(atoms1, atoms2):
+def distance(atoms1, atoms2, box=None):
     """
     Measure the euclidian distance between atoms.
     
@@ -27,6 +28,12 @@ def distance(atoms1, atoms2):
         The atoms to measure the distances between. The dimensions may
         vary. Alternatively an ndarray containing the coordinates can be
         provided.
+    box : ndarray, shape=(3,3) or shape=(m,3,3), optional
+        If this parameter is set, periodic boundary conditions are
+        taken into account (minimum image convention), based on
+        the box vectors given with this parameter.
+        The shape *(m,3,3)* is only allowed, when the input coordinates
+        comprise multiple models, i.e. one box is given for each model.
     
     Returns
     -------
@@ -43,6 +50,8 @@ def distance(atoms1, atoms2):
         dif = v2 - v1
     else:
         dif = v1 - v2
+    if box is not None:
+        dif = _minimum_image(dif, box)
     dist = np.sqrt(vector_dot(dif, dif))
     return dist
 
@@ -67,7 +76,7 @@ def centroid(atoms):
     return np.mean(coord(atoms), axis=-2)
 
 
-def angle(atom1, atom2, atom3):
+def angle(atom1, atom2, atom3, box=None):
     """
     Measure the angle between 3 atoms.
     
@@ -76,6 +85,12 @@ def angle(atom1, atom2, atom3):
     atoms1, atoms2, atoms3 : ndarray or Atom or AtomArray or AtomArrayStack
         The atoms to measure the angle between. Alternatively an
         ndarray containing the coordinates can be provided.
+    box : ndarray, shape=(3,3) or shape=(m,3,3), optional
+        If this parameter is set, periodic boundary conditions are
+        taken into account (minimum image convention), based on
+        the box vectors given with this parameter.
+        The shape *(m,3,3)* is only allowed, when the input coordinates
+        comprise multiple models, i.e. one box is given for each model.
     
     Returns
     -------
@@ -86,12 +101,15 @@ def angle(atom1, atom2, atom3):
     """
     v1 = coord(atom1) - coord(atom2)
     v2 = coord(atom3) - coord(atom2)
+    if box is not None:
+        v1 = _minimum_image(v1, box)
+        v2 = _minimum_image(v2, box)
     norm_vector(v1)
     norm_vector(v2)
     return np.arccos(vector_dot(v1,v2))
 
 
-def dihedral(atom1, atom2, atom3, atom4):
+def dihedral(atom1, atom2, atom3, atom4, box=None):
     """
     Measure the dihedral angle between 4 atoms.
     
@@ -101,6 +119,12 @@ def dihedral(atom1, atom2, atom3, atom4):
         The atoms to measure the dihedral angle between.
         Alternatively an ndarray containing the coordinates can be
         provided.
+    box : ndarray, shape=(3,3) or shape=(m,3,3), optional
+        If this parameter is set, periodic boundary conditions are
+        taken into account (minimum image convention), based on
+        the box vectors given with this parameter.
+        The shape *(m,3,3)* is only allowed, when the input coordinates
+        comprise multiple models, i.e. one box is given for each model.
     
     Returns
     -------
@@ -116,6 +140,10 @@ def dihedral(atom1, atom2, atom3, atom4):
     v1 = coord(atom2) - coord(atom1)
     v2 = coord(atom3) - coord(atom2)
     v3 = coord(atom4) - coord(atom3)
+    if box is not None:
+        v1 = _minimum_image(v1, box)
+        v2 = _minimum_image(v2, box)
+        v3 = _minimum_image(v3, box)
     norm_vector(v1)
     norm_vector(v2)
     norm_vector(v3)
@@ -202,9 +230,9 @@ def dihedral_backbone(atom_array, chain_id):
         angle_coord_shape = (len(bb_coord)//3, 3, 4)
     elif isinstance(atom_array, AtomArrayStack):
         angle_coord_shape = (bb_coord.shape[0], bb_coord.shape[1]//3, 3, 4)
-    phi_coord   = np.full(angle_coord_shape, np.nan)
-    psi_coord   = np.full(angle_coord_shape, np.nan)
-    omega_coord = np.full(angle_coord_shape, np.nan)
+    phi_coord   = np.full(angle_coord_shape, np.nan, dtype=bb_coord.dtype)
+    psi_coord   = np.full(angle_coord_shape, np.nan, dtype=bb_coord.dtype)
+    omega_coord = np.full(angle_coord_shape, np.nan, dtype=bb_coord.dtype)
     
     # Indices for coordinates of CA atoms 
     ca_i = np.arange(bb_coord.shape[-2]//3) * 3 + 1
@@ -229,3 +257,43 @@ def dihedral_backbone(atom_array, chain_id):
                         omega_coord[...,2], omega_coord[...,3])
     
     return phi, psi, omega
+
+
+def _minimum_image(dif, box):
+    """
+    Get the shortest periodic copies of the given difference vectors,
+    with respect to the given box vectors.
+    """
+    box = np.asarray(box, dtype=float)
+    if box.ndim == 3:
+        # One box for each model
+        # -> Align the box to the model axis of the difference vectors
+        if dif.ndim < 3 or dif.shape[0] != box.shape[0]:
+            raise ValueError(
+                f"{box.shape[0]} boxes were given, but the coordinates "
+                f"do not comprise the same amount of models"
+            )
+        box = box.reshape((box.shape[0],) + (1,)*(dif.ndim-2) + (3,3))
+    elif box.shape != (3,3):
+        raise ValueError("The box must be a 3x3 matrix or a stack of them")
+    # Fractional coordinates of the difference vectors,
+    # moved into the interval [-0.5, 0.5]
+    fractions = np.matmul(dif[..., np.newaxis, :], np.linalg.inv(box))
+    fractions -= np.round(fractions)
+    min_dif = np.matmul(fractions, box)[..., 0, :]
+    is_orthogonal = (box[..., ~np.eye(3, dtype=bool)] == 0).all()
+    if is_orthogonal:
+        return min_dif
+    # In a triclinic box the rounded fractions do not necessarily
+    # give the shortest vector
+    # -> Check the periodic copies in the surrounding boxes as well
+    min_sq_dist = vector_dot(min_dif, min_dif)
+    for shift in itertools.product((-1, 0, 1), repeat=3):
+        if shift == (0, 0, 0):
+            continue
+        shifted_dif = np.matmul(fractions + np.array(shift), box)[..., 0, :]
+        sq_dist = vector_dot(shifted_dif, shifted_dif)
+        is_shorter = np.asarray(sq_dist < min_sq_dist)
+        min_dif = np.where(is_shorter[..., np.newaxis], shifted_dif, min_dif)
+        min_sq_dist = np.where(is_shorter, sq_dist, min_sq_dist)
+    return min_dif
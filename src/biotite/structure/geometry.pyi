@@ -2,14 +2,15 @@
 # under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
 # information.
 
-from typing import Union, Tuple
+from typing import Union, Tuple, Optional
 import numpy as np
 from .atoms import AtomArray, AtomArrayStack
 
 
 def distance(
     atoms1: Union[AtomArrayStack, AtomArray, np.ndarray],
-    atoms2: Union[AtomArrayStack, AtomArray, np.ndarray]
+    atoms2: Union[AtomArrayStack, AtomArray, np.ndarray],
+    box: Optional[np.ndarray] = None
 ) -> Union[np.ndarray, float]: ...
 
 def centroid(
@@ -19,14 +20,16 @@ def centroid(
 def angle(
     atom1: Union[AtomArrayStack, AtomArray, np.ndarray],
     atom2: Union[AtomArrayStack, AtomArray, np.ndarray],
-    atom3: Union[AtomArrayStack, AtomArray, np.ndarray]
+    atom3: Union[AtomArrayStack, AtomArray, np.ndarray],
+    box: Optional[np.ndarray] = None
 ) -> Union[np.ndarray, float]: ...
 
 def dihedral(
     atom1: Union[AtomArrayStack, AtomArray, np.ndarray],
     atom2: Union[AtomArrayStack, AtomArray, np.ndarray],
     atom3: Union[AtomArrayStack, AtomArray, np.ndarray],
-    atom4: Union[AtomArrayStack, AtomArray, np.ndarray]
+    atom4: Union[AtomArrayStack, AtomArray, np.ndarray],
+    box: Optional[np.ndarray] = None
 ) -> Union[np.ndarray, float]: ...
 
 def dihedral_backbone(
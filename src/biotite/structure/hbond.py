@@ -7,8 +7,10 @@ This module provides functions for hydrogen bonding calculation.
 """
 
 __author__ = "Daniel Bauer, Patrick Kunzmann"
-__all__ = ["hbond", "hbond_frequency"]
+__all__ = ["hbond", "hbond_stream", "hbond_frequency"]
 
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from .geometry import distance, angle
 import numpy as np
 from .atoms import AtomArrayStack, stack
@@ -114,6 +116,7 @@ def hbond(atoms, selection1=None, selection2=None, selection1_type='both',
 
     See Also
     --------
+    hbond_stream
     hbond_frequency
 
     References
@@ -224,36 +227,6 @@ def _hbond(atoms, donor_mask, acceptor_mask,
     donor_mask    &= donor_element_mask
     acceptor_mask &= acceptor_element_mask
     
-    def _get_bonded_hydrogens(array, donor_mask, cutoff=1.5):
-        """
-        Helper function to find indices of associated hydrogens in atoms
-        for all donors in atoms[donor_mask].
-        The criterium is that the hydrogen must be in the same residue
-        and the distance must be smaller than the cutoff.
-
-        """
-        coord = array.coord
-        res_id = array.res_id
-        hydrogen_mask = (array.element == "H")
-        
-        donor_hydrogen_mask = np.zeros(len(array), dtype=bool)
-        associated_donor_indices = np.full(len(array), -1, dtype=int)
-
-        donor_indices = np.where(donor_mask)[0]
-        for donor_i in donor_indices:
-            candidate_mask = hydrogen_mask & (res_id == res_id[donor_i])
-            distances = distance(
-                coord[donor_i], coord[candidate_mask]
-            )
-            donor_h_indices = np.where(candidate_mask)[0][distances <= cutoff]
-            for i in donor_h_indices:
-                associated_donor_indices[i] = donor_i
-                donor_hydrogen_mask[i] = True
-        
-        return donor_hydrogen_mask, associated_donor_indices
-            
-
-    # TODO use BondList if available
     donor_h_mask, associated_donor_indices \
         = _get_bonded_hydrogens(atoms[0], donor_mask)
     donor_h_i = np.where(donor_h_mask)[0]
@@ -274,10 +247,16 @@ def _hbond(atoms, donor_mask, acceptor_mask,
         (len(acceptor_i), len(donor_h_i)),
         dtype=bool
     )
+    cell_list = None
     for model_i in range(atoms.stack_depth()):
         donor_h_coord = coord[model_i, donor_h_mask]
         acceptor_coord = coord[model_i, acceptor_mask]
-        cell_list = CellList(donor_h_coord, cell_size=cutoff_dist)
+        # The cell list is only updated with the atom movement
+        # from the last model, instead of creating a new one
+        if cell_list is None:
+            cell_list = CellList(donor_h_coord, cell_size=cutoff_dist)
+        else:
+            cell_list.update(donor_h_coord)
         possible_bonds |= cell_list.get_atoms_in_cells(
             acceptor_coord, as_mask=True
         )
@@ -314,6 +293,201 @@ def _hbond(atoms, donor_mask, acceptor_mask,
     return triplets, hbond_mask
 
 
+def _get_bonded_hydrogens(array, donor_mask, cutoff=1.5):
+    """
+    Helper function to find indices of associated hydrogens in atoms
+    for all donors in atoms[donor_mask].
+    If the atoms have an associated `BondList`, the hydrogen atoms
+    bonded to the donors are taken from it.
+    Otherwise, the criterium is that the hydrogen must be in the same
+    residue and the distance must be smaller than the cutoff.
+    """
+    hydrogen_mask = (array.element == "H")
+    
+    donor_hydrogen_mask = np.zeros(array.array_length(), dtype=bool)
+    associated_donor_indices = np.full(array.array_length(), -1, dtype=int)
+    
+    if array.bonds is not None:
+        bonds = array.bonds.as_array()[:, :2].astype(int)
+        # Each bond is stored only once
+        # -> the hydrogen may be the first or second atom of a bond
+        for donor_i, h_i in ((bonds[:,0], bonds[:,1]),
+                             (bonds[:,1], bonds[:,0])):
+            is_donor_h = donor_mask[donor_i] & hydrogen_mask[h_i]
+            associated_donor_indices[h_i[is_donor_h]] = donor_i[is_donor_h]
+            donor_hydrogen_mask[h_i[is_donor_h]] = True
+        return donor_hydrogen_mask, associated_donor_indices
+    
+    donor_indices = np.where(donor_mask)[0]
+    hydrogen_indices = np.where(hydrogen_mask)[0]
+    if len(donor_indices) == 0 or len(hydrogen_indices) == 0:
+        return donor_hydrogen_mask, associated_donor_indices
+    # Find all hydrogen atoms within the cutoff of each donor
+    # in a single cell list query
+    cell_list = CellList(array.coord[hydrogen_indices], cell_size=cutoff)
+    adjacent = cell_list.get_atoms(array.coord[donor_indices], cutoff)
+    donor_i = np.repeat(donor_indices, adjacent.shape[1])
+    h_i = adjacent.flatten()
+    is_adjacent = (h_i != -1)
+    donor_i = donor_i[is_adjacent]
+    h_i = hydrogen_indices[h_i[is_adjacent]]
+    # The hydrogen must be in the same residue as the donor
+    is_same_res = (array.res_id[donor_i] == array.res_id[h_i])
+    donor_i = donor_i[is_same_res]
+    h_i = h_i[is_same_res]
+    associated_donor_indices[h_i] = donor_i
+    donor_hydrogen_mask[h_i] = True
+    
+    return donor_hydrogen_mask, associated_donor_indices
+
+
+def hbond_stream(template, chunks, selection1=None, selection2=None,
+                 selection1_type='both', cutoff_dist=2.5, cutoff_angle=120,
+                 donor_elements=('O', 'N', 'S'),
+                 acceptor_elements=('O', 'N', 'S'), processes=1):
+    """
+    Find hydrogen bonds in a trajectory, that is given in chunks of
+    frames.
+
+    This function gives the same hydrogen bonds as `hbond()`, but
+    only a limited number of chunks is in memory at once.
+    Hence, it is suitable for long trajectories that do not fit into
+    memory as a whole, for example using the chunks from
+    `TrajectoryFile.read_chunks()`.
+    The chunks can be distributed over multiple processes.
+    The hydrogen atoms are assigned to the donors based on `template`,
+    hence its coordinates should be representative, e.g. the first
+    frame of the trajectory.
+
+    Parameters
+    ----------
+    template : AtomArray
+        The template, the atom annotations (e.g. elements) are taken
+        from.
+    chunks : iterable object of (ndarray, dtype=float, shape=(m,n,3) or AtomArrayStack)
+        The trajectory frames.
+        Each chunk contains the coordinates of *m* consecutive frames
+        for the *n* atoms in `template`.
+    selection1, selection2, selection1_type, cutoff_dist, cutoff_angle, donor_elements, acceptor_elements
+        See `hbond()`.
+    processes : int, optional
+        The amount of processes, the chunks are distributed over.
+        By default, all chunks are processed in the current process.
+
+    Returns
+    -------
+    triplets : ndarray, dtype=int, shape=(n,3)
+        *n x 3* matrix containing the indices of every Donor-H..Acceptor
+        interaction that is available in any of the frames.
+        The three matrix columns are *D_index*, *H_index*, *A_index*.
+        The triplets are ordered by their first occurrence in the
+        trajectory.
+    indptr, indices : ndarray, dtype=int
+        The sparse occupancy of the interactions in each frame,
+        in *compressed sparse row* format:
+        ``indices[indptr[f] : indptr[f+1]]`` are the indices in
+        `triplets` of the hydrogen bonds present in frame *f*.
+
+    See Also
+    --------
+    hbond
+
+    Examples
+    --------
+
+    >>> stack = load_structure("path/to/1l2y.pdb")
+    >>> chunks = [stack.coord[i : i+10] for i in range(0, len(stack), 10)]
+    >>> triplets, (indptr, indices) = hbond_stream(stack[0], chunks)
+    >>> hbonds_per_model = np.diff(indptr)
+    >>> print(hbonds_per_model)
+    [14 15 15 13 11 13  9 14  9 15 13 13 15 11 11 13 11 14 14 13 14 13 15 17
+     14 12 15 12 12 13 13 13 12 12 11 15 10 11]
+    """
+    if processes < 1:
+        raise ValueError("At least one process is required")
+    params = dict(
+        selection1=selection1, selection2=selection2,
+        selection1_type=selection1_type,
+        cutoff_dist=cutoff_dist, cutoff_angle=cutoff_angle,
+        donor_elements=donor_elements, acceptor_elements=acceptor_elements
+    )
+    if processes == 1:
+        chunk_results = (
+            _hbond_chunk(template, chunk, params) for chunk in chunks
+        )
+        return _merge_chunk_results(chunk_results)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return _merge_chunk_results(
+            _submit_chunks(executor, processes, template, chunks, params)
+        )
+
+
+def _submit_chunks(executor, processes, template, chunks, params):
+    """
+    Yield the results of the chunks in the order of the chunks.
+    Only a limited number of chunks is submitted to the executor at
+    once, so that the chunks are not read faster than they are
+    processed.
+    """
+    pending = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(_hbond_chunk, template, chunk, params))
+        if len(pending) >= 2 * processes:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _hbond_chunk(template, chunk, params):
+    if isinstance(chunk, AtomArrayStack):
+        chunk = chunk.coord
+    # The template is prepended as first model,
+    # since the hydrogen atoms are assigned to the donors based on the
+    # first model
+    # -> consistent triplets over all chunks
+    atoms = stack([template])
+    atoms.coord = np.concatenate(
+        [template.coord[np.newaxis, ...], np.asarray(chunk)], axis=0
+    )
+    triplets, mask = hbond(atoms, **params)
+    mask = mask[1:]
+    is_counted = mask.any(axis=0)
+    return triplets[is_counted], mask[:, is_counted]
+
+
+def _merge_chunk_results(chunk_results):
+    """
+    Merge the triplets and masks of each chunk into common triplets and
+    a sparse occupancy.
+    """
+    # Map each triplet to its index in the merged triplets
+    triplet_indices = {}
+    frame_counts = []
+    all_indices = []
+    for triplets, mask in chunk_results:
+        global_indices = np.array(
+            [triplet_indices.setdefault(tuple(triplet), len(triplet_indices))
+             for triplet in triplets.tolist()],
+            dtype=int
+        )
+        frame_counts.append(np.count_nonzero(mask, axis=1))
+        # Row-major order -> indices are ordered by frame
+        all_indices.append(global_indices[np.where(mask)[1]])
+    
+    triplets = np.array(list(triplet_indices.keys()), dtype=int) \
+               .reshape(-1, 3)
+    if len(frame_counts) == 0:
+        return triplets, (np.zeros(1, dtype=int), np.zeros(0, dtype=int))
+    frame_counts = np.concatenate(frame_counts)
+    indices = np.concatenate(all_indices)
+    indptr = np.zeros(len(frame_counts) + 1, dtype=int)
+    np.cumsum(frame_counts, out=indptr[1:])
+    # Sort the interaction indices within each frame
+    frames = np.repeat(np.arange(len(frame_counts)), frame_counts)
+    indices = indices[np.lexsort((indices, frames))]
+    return triplets, (indptr, indices)
+
+
 def hbond_frequency(mask):
     """
     Get the relative frequency of each hydrogen bond in a multi-model
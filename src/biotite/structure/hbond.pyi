@@ -2,7 +2,7 @@
 # under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
 # information.
 
-from typing import Union, Tuple, Optional, Sequence, overload
+from typing import Union, Tuple, Optional, Sequence, Iterable, overload
 import numpy as np
 from .atoms import AtomArray, AtomArrayStack
 
@@ -28,4 +28,17 @@ def hbond(
     acceptor_elements: Sequence = ('O', 'N', 'S')
 ) -> Tuple[np.ndarray, np.ndarray]: ...
 
+def hbond_stream(
+    template: AtomArray,
+    chunks: Iterable[Union[np.ndarray, AtomArrayStack]],
+    selection1: Optional[np.ndarray] = None,
+    selection2: Optional[np.ndarray] = None,
+    selection1_type: str = "both",
+    cutoff_dist: float = 2.5,
+    cutoff_angle: float = 120,
+    donor_elements: Sequence = ('O', 'N', 'S'),
+    acceptor_elements: Sequence = ('O', 'N', 'S'),
+    processes: int = 1
+) -> Tuple[np.ndarray, Tuple[np.ndarray, np.ndarray]]: ...
+
 def hbond_frequency(mask: np.ndarray) -> np.ndarray: ...
\ No newline at end of file
@@ -96,26 +96,38 @@ def check_duplicate_atoms(array):
     
     Returns
     -------
-    duplicate : ndarray, dtype=bool
+    duplicate : ndarray, dtype=int
         Contains the indices of duplicate atoms. The first occurence of
         an atom is not counted as duplicate.
     """
-    duplicates = []
-    annots = [array.get_annotation(category) for category
-              in array.get_annotation_categories()]
-    for i in range(1, array.array_length()):
-        # Start with assumption that all atoms in the array
-        # until index i are duplicates of the atom at index i
-        is_dublicate = np.full(i, True, dtype=bool)
-        for annot in annots:
-            # For each annotation array filter out the atoms until
-            # index i that have an unequal annotation
-            # to the atom at index i 
-            is_dublicate &= (annot[:i] == annot[i])
-        # After checking all annotation arrays,
-        # if there still is any duplicate to the atom at index i,
-        # add i the the list of duplicate atom indices
-        if is_dublicate.any():
-            duplicates.append(i)
-    return np.array(duplicates)
+    if array.array_length() == 0:
+        return np.zeros(0, dtype=int)
+    # Represent each annotation array by integer codes, where equal
+    # annotation values have equal codes
+    codes = np.stack([
+        _encode_annotation(array.get_annotation(category))
+        for category in array.get_annotation_categories()
+    ])
+    # Sort the atoms by all annotations:
+    # Duplicate atoms are adjacent in the sorted order and since the
+    # sort is stable, the first occurence of an atom comes first
+    order = np.lexsort(codes[::-1])
+    sorted_codes = codes[:, order]
+    is_duplicate = np.all(sorted_codes[:, 1:] == sorted_codes[:, :-1], axis=0)
+    return np.sort(order[1:][is_duplicate])
 
+
+def _encode_annotation(annotation):
+    """
+    Map the values of an annotation array to integer codes, where equal
+    values have equal codes.
+
+    As *NaN* is not equal to any value, including *NaN* itself, each
+    *NaN* value obtains a code of its own.
+    """
+    codes = np.unique(annotation, return_inverse=True)[1].reshape(-1)
+    if np.issubdtype(annotation.dtype, np.floating):
+        nan_mask = np.isnan(annotation)
+        nan_count = np.count_nonzero(nan_mask)
+        codes[nan_mask] = codes.max() + 1 + np.arange(nan_count)
+    return codes
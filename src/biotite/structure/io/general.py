@@ -15,7 +15,7 @@ import io
 from ..atoms import AtomArray, AtomArrayStack
 
 
-def load_structure(file_path, template=None):
+def load_structure(file_path, template=None, coord_dtype=None):
     """
     Load an atom array or stack from a structure file without the need
     to manually instantiate a `File` object.
@@ -30,6 +30,12 @@ def load_structure(file_path, template=None):
         The path to structure file.
     template : AtomArray or AtomArrayStack or file-like object or str, optional
         Only required when reading a trajectory file.
+    coord_dtype : dtype, optional
+        The data type of the coordinates in the returned structure.
+        By default, the coordinates have the precision the file format
+        provides, i.e. single precision for MMTF and trajectory files,
+        double precision for the text based formats and the stored
+        precision for NPZ files.
     
     Returns
     -------
@@ -47,7 +53,7 @@ def load_structure(file_path, template=None):
     """
     # Optionally load template from file
     if isinstance(template, (io.IOBase, str)):
-        template = load_structure(template)
+        template = load_structure(template, coord_dtype=coord_dtype)
 
     # We only need the suffix here
     filename, suffix = os.path.splitext(file_path)
@@ -55,7 +61,7 @@ def load_structure(file_path, template=None):
         from .pdb import PDBFile
         file = PDBFile()
         file.read(file_path)
-        array = file.get_structure()
+        array = file.get_structure(coord_dtype=coord_dtype)
         if isinstance(array, AtomArrayStack) and array.stack_depth() == 1:
             # Stack containing only one model -> return as atom array
             return array[0]
@@ -65,7 +71,7 @@ def load_structure(file_path, template=None):
         from .pdbx import PDBxFile, get_structure
         file = PDBxFile()
         file.read(file_path)
-        array = get_structure(file)
+        array = get_structure(file, coord_dtype=coord_dtype)
         if isinstance(array, AtomArrayStack) and array.stack_depth() == 1:
             # Stack containing only one model -> return as atom array
             return array[0]
@@ -75,7 +81,7 @@ def load_structure(file_path, template=None):
         from .gro import GROFile
         file = GROFile()
         file.read(file_path)
-        array = file.get_structure()
+        array = file.get_structure(coord_dtype=coord_dtype)
         if isinstance(array, AtomArrayStack) and array.stack_depth() == 1:
             # Stack containing only one model -> return as atom array
             return array[0]
@@ -85,7 +91,7 @@ def load_structure(file_path, template=None):
         from .mmtf import MMTFFile, get_structure
         file = MMTFFile()
         file.read(file_path)
-        array = get_structure(file)
+        array = get_structure(file, coord_dtype=coord_dtype)
         if isinstance(array, AtomArrayStack) and array.stack_depth() == 1:
             # Stack containing only one model -> return as atom array
             return array[0]
@@ -96,6 +102,8 @@ def load_structure(file_path, template=None):
         file = NpzFile()
         file.read(file_path)
         array = file.get_structure()
+        if coord_dtype is not None:
+            array.coord = array.coord.astype(coord_dtype, copy=False)
         if isinstance(array, AtomArrayStack) and array.stack_depth() == 1:
             # Stack containing only one model -> return as atom array
             return array[0]
@@ -107,21 +115,30 @@ def load_structure(file_path, template=None):
         from .trr import TRRFile
         file = TRRFile()
         file.read(file_path)
-        return file.get_structure(template)
+        array = file.get_structure(template)
+        if coord_dtype is not None:
+            array.coord = array.coord.astype(coord_dtype, copy=False)
+        return array
     elif suffix == ".xtc":
         if template is None:
             raise TypeError("Template must be specified for trajectory files")
         from .xtc import XTCFile
         file = XTCFile()
         file.read(file_path)
-        return file.get_structure(template)
+        array = file.get_structure(template)
+        if coord_dtype is not None:
+            array.coord = array.coord.astype(coord_dtype, copy=False)
+        return array
     elif suffix == ".tng":
         if template is None:
             raise TypeError("Template must be specified for trajectory files")
         from .tng import TNGFile
         file = TNGFile()
         file.read(file_path)
-        return file.get_structure(template)
+        array = file.get_structure(template)
+        if coord_dtype is not None:
+            array.coord = array.coord.astype(coord_dtype, copy=False)
+        return array
     else:
         raise ValueError(f"Unknown file format '{suffix}'")
 
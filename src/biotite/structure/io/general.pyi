@@ -3,6 +3,7 @@
 # information.
 
 from typing import Optional, Union, TextIO, BinaryIO
+import numpy as np
 from .atoms import AtomArrayStack, AtomArray
 
 
@@ -10,7 +11,8 @@ def load_structure(
     file_path: str,
     template: Union[
         AtomArrayStack, AtomArray, TextIO, BinaryIO, str, None
-    ] = None
+    ] = None,
+    coord_dtype: Optional[np.dtype] = None
 ) -> Union[AtomArray, AtomArrayStack]: ...
 
 def save_structure(file_path: str, array: AtomArrayStack) -> None: ...
@@ -46,7 +46,7 @@ class GROFile(TextFile):
     
     """
     
-    def get_structure(self, model=None):
+    def get_structure(self, model=None, coord_dtype=None):
         """
         Get an `AtomArray` or `AtomArrayStack` from the GRO file.
         
@@ -59,12 +59,19 @@ class GROFile(TextFile):
             If this parameter is omitted, an `AtomArrayStack` containing
             all models will be returned, even if the structure contains
             only one model.
+        coord_dtype : dtype, optional
+            The data type of the coordinates in the returned structure.
+            ``np.float32`` halves the memory required for the
+            coordinates.
+            By default, the coordinates have double precision.
         
         Returns
         -------
         array : AtomArray or AtomArrayStack
             The return type depends on the `model` parameter.
         """
+        if coord_dtype is None:
+            coord_dtype = float
 
         def is_int(line):
             """
@@ -101,7 +108,7 @@ class GROFile(TextFile):
                                         "model instead")
             depth = len(model_start_i)
             length = model_atom_counts[0]
-            array = AtomArrayStack(depth, length)
+            array = AtomArrayStack(depth, length, coord_dtype)
 
             # Line indices for annotation determination is determined
             # from model 1
@@ -114,7 +121,7 @@ class GROFile(TextFile):
                 )
 
             length = model_atom_counts[model-1]
-            array = AtomArray(length)
+            array = AtomArray(length, coord_dtype)
 
             annot_i = get_atom_line_i(model_start_i[model-1], length)
             coord_i = get_atom_line_i(model_start_i[model-1], length)
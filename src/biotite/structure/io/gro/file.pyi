@@ -2,7 +2,8 @@
 # under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
 # information.
 
-from typing import Union, overload
+from typing import Union, overload, Optional
+import numpy as np
 from ...atoms import AtomArray, AtomArrayStack
 from ....file import TextFile
 
@@ -10,11 +11,11 @@ from ....file import TextFile
 class GROFile(TextFile):
     @overload
     def get_structure(
-        self, model: None = None
+        self, model: None = None, coord_dtype: Optional[np.dtype] = None
     ) -> AtomArrayStack: ...
     @overload
     def get_structure(
-        self, model: int
+        self, model: int, coord_dtype: Optional[np.dtype] = None
     ) -> AtomArray: ...
     def set_structure(
         self, array: Union[AtomArray, AtomArrayStack]
@@ -60,12 +60,12 @@ def set_structure(file, array):
     cdef array_length = array.array_length()
     
     # Get annotation arrays from atom array (stack)
-    cdef np.ndarray arr_chain_id  = array.chain_id
+    cdef np.ndarray arr_chain_id  = np.asarray(array.chain_id)
     cdef np.ndarray arr_res_id    = array.res_id
-    cdef np.ndarray arr_res_name  = array.res_name
+    cdef np.ndarray arr_res_name  = np.asarray(array.res_name)
     cdef np.ndarray arr_hetero    = array.hetero
-    cdef np.ndarray arr_atom_name = array.atom_name
-    cdef np.ndarray arr_element   = array.element
+    cdef np.ndarray arr_atom_name = np.asarray(array.atom_name)
+    cdef np.ndarray arr_element   = np.asarray(array.element)
     cdef np.ndarray arr_charge    = None
     if "charge" in array.get_annotation_categories():
         arr_charge = array.charge
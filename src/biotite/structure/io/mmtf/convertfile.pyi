@@ -2,7 +2,8 @@
 # under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
 # information.
 
-from typing import Union, Tuple, List, overload
+from typing import Union, Tuple, List, overload, Optional
+import numpy as np
 from ...atoms import AtomArray, AtomArrayStack
 from .file import MMTFFile
 
@@ -14,7 +15,8 @@ def get_structure(
     insertion_code: List[Tuple[int, str]] = [],
     altloc: List[Tuple[int, str]] = [],
     extra_fields: List[str] = [],
-    include_bonds: bool = False
+    include_bonds: bool = False,
+    coord_dtype: Optional[np.dtype] = None
 ) -> AtomArrayStack: ...
 @overload
 def get_structure(
@@ -23,5 +25,6 @@ def get_structure(
     insertion_code: List[Tuple[int, str]] = [],
     altloc: List[Tuple[int, str]] = [],
     extra_fields: List[str] = [],
-    include_bonds: bool = False
+    include_bonds: bool = False,
+    coord_dtype: Optional[np.dtype] = None
 ) -> AtomArray: ...
\ No newline at end of file
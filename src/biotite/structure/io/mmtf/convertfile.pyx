@@ -27,10 +27,10 @@ ctypedef np.float32_t float32
 
     
 def get_structure(file, model=None, insertion_code=[], altloc=[],
-                  extra_fields=[], include_bonds=False):
+                  extra_fields=[], include_bonds=False, coord_dtype=None):
     """
     get_structure(file, model=None, insertion_code=[], altloc=[],
-                  extra_fields=[], include_bonds=False)
+                  extra_fields=[], include_bonds=False, coord_dtype=None)
     
     Get an `AtomArray` or `AtomArrayStack` from the MMTF file.
     
@@ -63,6 +63,10 @@ def get_structure(file, model=None, insertion_code=[], altloc=[],
         If set to true, an `BondList` will be created for the resulting
         `AtomArray` containing the bond information from the file.
         (Default: False)
+    coord_dtype : dtype, optional
+        The data type of the coordinates in the returned structure.
+        By default, the coordinates keep the single precision they
+        are stored with in the MMTF file.
     
     Returns
     -------
@@ -159,13 +163,17 @@ def get_structure(file, model=None, insertion_code=[], altloc=[],
             raise BadStructureError("The models in the file have unequal "
                                     "amount of atoms, give an explicit "
                                     "model instead")
-        array = AtomArrayStack(depth, length)
+        # The coordinates are not allocated here,
+        # as they are replaced by the stacked coordinates anyway
+        array = AtomArrayStack(0, length)
         array.coord = np.stack(
             [x_coord,
              y_coord,
              z_coord],
              axis=1
         ).reshape(depth, length, 3)
+        if coord_dtype is not None:
+            array.coord = array.coord.astype(coord_dtype, copy=False)
         # Create inscode and altloc arrays for the final filtering
         if altloc_all is not None:
             altloc_array = altloc_all[:length]
@@ -209,7 +217,9 @@ def get_structure(file, model=None, insertion_code=[], altloc=[],
             start_i += _get_model_length(m, res_type_i, chains_per_model,
                                          res_per_chain, atoms_per_res)
         stop_i = start_i + length
-        array = AtomArray(length)
+        array = AtomArray(
+            length, x_coord.dtype if coord_dtype is None else coord_dtype
+        )
         array.coord[:,0] = x_coord[start_i : stop_i]
         array.coord[:,1] = y_coord[start_i : stop_i]
         array.coord[:,2] = z_coord[start_i : stop_i]
@@ -282,12 +292,12 @@ def _fill_annotations(int model, array,
                       np.ndarray atom_names, np.ndarray elements,
                       np.ndarray charges):
     # Get annotation arrays from atom array (stack)
-    cdef np.ndarray chain_id  = array.chain_id
+    cdef np.ndarray chain_id  = np.asarray(array.chain_id)
     cdef np.ndarray res_id    = array.res_id
-    cdef np.ndarray res_name  = array.res_name
+    cdef np.ndarray res_name  = np.asarray(array.res_name)
     cdef np.ndarray hetero    = array.hetero
-    cdef np.ndarray atom_name = array.atom_name
-    cdef np.ndarray element   = array.element
+    cdef np.ndarray atom_name = np.asarray(array.atom_name)
+    cdef np.ndarray element   = np.asarray(array.element)
     cdef np.ndarray charge
     if extra_charge:
         charge = array.charge
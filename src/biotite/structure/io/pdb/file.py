@@ -60,7 +60,7 @@ class PDBFile(TextFile):
     """
 
     def get_structure(self, model=None, insertion_code=[], altloc=[],
-                      extra_fields=[]):
+                      extra_fields=[], coord_dtype=None):
         """
         Get an `AtomArray` or `AtomArrayStack` from the PDB file.
         
@@ -90,12 +90,19 @@ class PDBFile(TextFile):
             that should be stored in the output array or stack.
             There are 4 optional annotation identifiers:
             'atom_id', 'b_factor', 'occupancy' and 'charge'.
+        coord_dtype : dtype, optional
+            The data type of the coordinates in the returned structure.
+            ``np.float32`` halves the memory required for the
+            coordinates.
+            By default, the coordinates have double precision.
         
         Returns
         -------
         array : AtomArray or AtomArrayStack
             The return type depends on the `model` parameter.
         """
+        if coord_dtype is None:
+            coord_dtype = float
         # Line indices where a new model starts
         model_start_i = np.array([i for i in range(len(self.lines))
                                   if self.lines[i].startswith(("MODEL"))],
@@ -120,7 +127,7 @@ class PDBFile(TextFile):
                                         "model instead")
             depth = len(model_start_i)
             length = len(atom_line_i) // len(model_start_i)
-            array = AtomArrayStack(depth, length)
+            array = AtomArrayStack(depth, length, coord_dtype)
             # Line indices for annotation determination
             # Annotation is determined from model 1,
             # therefore from ATOM records before second MODEL record
@@ -133,7 +140,7 @@ class PDBFile(TextFile):
         
         else:
             length = len(atom_line_i) // len(model_start_i)
-            array = AtomArray(length)
+            array = AtomArray(length, coord_dtype)
             last_model = len(model_start_i)
             if model < last_model:
                 line_filter = ( ( atom_line_i >= model_start_i[model-1] ) &
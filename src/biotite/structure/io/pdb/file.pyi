@@ -2,7 +2,8 @@
 # under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
 # information.
 
-from typing import Union, List, Tuple, overload
+from typing import Union, List, Tuple, overload, Optional
+import numpy as np
 from ...atoms import AtomArray, AtomArrayStack
 from ....file import TextFile
 
@@ -14,7 +15,8 @@ class PDBFile(TextFile):
         model: None = None,
         insertion_code: List[Tuple[int, str]] = [],
         altloc: List[Tuple[int, str]] = [],
-        extra_fields: List[str] = []
+        extra_fields: List[str] = [],
+        coord_dtype: Optional[np.dtype] = None
     ) -> AtomArrayStack: ...
     @overload
     def get_structure(
@@ -22,7 +24,8 @@ class PDBFile(TextFile):
         model: int,
         insertion_code: List[Tuple[int, str]] = [],
         altloc: List[Tuple[int, str]] = [],
-        extra_fields: List[str] = []
+        extra_fields: List[str] = [],
+        coord_dtype: Optional[np.dtype] = None
     ) -> AtomArray: ...
     def set_structure(
         self,
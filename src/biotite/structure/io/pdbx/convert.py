@@ -44,7 +44,8 @@ def get_sequence(pdbx_file, data_block=None):
 
 
 def get_structure(pdbx_file, model=None, data_block=None,
-                  insertion_code=[], altloc=[], extra_fields=[]):
+                  insertion_code=[], altloc=[], extra_fields=[],
+                  coord_dtype=None):
     """
     Create an `AtomArray` or `AtomArrayStack` from a `atom_site`
     category.
@@ -81,6 +82,10 @@ def get_structure(pdbx_file, model=None, data_block=None,
         'atom_id', 'b_factor', 'occupancy' and 'charge'.
         These will convert the respective subcategory into an
         annotation array with reasonable type.
+    coord_dtype : dtype, optional
+        The data type of the coordinates in the returned structure.
+        ``np.float32`` halves the memory required for the coordinates.
+        By default, the coordinates have double precision.
         
     Returns
     -------
@@ -97,6 +102,8 @@ def get_structure(pdbx_file, model=None, data_block=None,
     304
     
     """
+    if coord_dtype is None:
+        coord_dtype = float
     atom_site_dict = pdbx_file.get_category("atom_site", data_block)
     models = atom_site_dict["pdbx_PDB_model_num"]
     if model is None:
@@ -104,7 +111,7 @@ def get_structure(pdbx_file, model=None, data_block=None,
         model_dict = _get_model_dict(atom_site_dict, 1)
         model_count = int(models[-1])
         model_length = len(model_dict["group_PDB"])
-        stack = AtomArrayStack(model_count, model_length)
+        stack = AtomArrayStack(model_count, model_length, coord_dtype)
         _fill_annotations(stack, model_dict, extra_fields)
         # Check if each model has the same amount of atoms
         # If not, raise exception
@@ -113,7 +120,6 @@ def get_structure(pdbx_file, model=None, data_block=None,
             raise BadStructureError("The models in the file have unequal "
                                     "amount of atoms, give an explicit model "
                                     "instead")
-        stack.coord = np.zeros((model_count, model_length, 3), dtype=float)
         stack.coord[:,:,0] = atom_site_dict["Cartn_x"].reshape((model_count,
                                                                 model_length))
         stack.coord[:,:,1] = atom_site_dict["Cartn_y"].reshape((model_count,
@@ -126,13 +132,12 @@ def get_structure(pdbx_file, model=None, data_block=None,
     else:
         model_dict = _get_model_dict(atom_site_dict, model)
         model_length = len(model_dict["group_PDB"])
-        array = AtomArray(model_length)
+        array = AtomArray(model_length, coord_dtype)
         _fill_annotations(array, model_dict, extra_fields)
         model_filter = (models == str(model))
-        array.coord = np.zeros((model_length, 3), dtype=float)
-        array.coord[:,0]= atom_site_dict["Cartn_x"][model_filter].astype(float)
-        array.coord[:,1]= atom_site_dict["Cartn_y"][model_filter].astype(float)
-        array.coord[:,2]= atom_site_dict["Cartn_z"][model_filter].astype(float)
+        array.coord[:,0] = atom_site_dict["Cartn_x"][model_filter]
+        array.coord[:,1] = atom_site_dict["Cartn_y"][model_filter]
+        array.coord[:,2] = atom_site_dict["Cartn_z"][model_filter]
         array = _filter_inscode_altloc(array, model_dict,
                                        insertion_code, altloc)
         return array
@@ -3,6 +3,7 @@
 # information.
 
 from typing import Optional, Union, Tuple, List, overload
+import numpy as np
 from ...atoms import AtomArray, AtomArrayStack
 from .file import PDBxFile
 from ....sequence.seqtypes import ProteinSequence
@@ -18,7 +19,8 @@ def get_structure(
     data_block: Optional[str] = None,
     insertion_code: List[Tuple[int, str]] = [],
     altloc: List[Tuple[int, str]] = [],
-    extra_fields: List[str] = []
+    extra_fields: List[str] = [],
+    coord_dtype: Optional[np.dtype] = None
 ) -> AtomArrayStack: ...
 @overload
 def get_structure(
@@ -27,7 +29,8 @@ def get_structure(
     data_block: Optional[str] = None,
     insertion_code: List[Tuple[int, str]] = [],
     altloc: List[Tuple[int, str]] = [],
-    extra_fields: List[str] = []
+    extra_fields: List[str] = [],
+    coord_dtype: Optional[np.dtype] = None
 ) -> AtomArray: ...
 
 def set_structure(
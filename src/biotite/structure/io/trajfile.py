@@ -73,6 +73,79 @@ class TrajectoryFile(File, metaclass=abc.ABCMeta):
             self._time  = result[self.output_value_index("time")]
             self._box   = result[self.output_value_index("box")]
     
+    def read_chunks(self, file_name, chunk_size, start=None, stop=None,
+                    atom_i=None):
+        """
+        Iterate over the coordinates of a trajectory file in chunks of
+        frames.
+        
+        In contrast to `read()`, only a chunk of frames is held in
+        memory at once, so that also trajectories can be processed,
+        that do not fit into memory as a whole.
+        The content of this object is not changed.
+        
+        Parameters
+        ----------
+        file_name : str
+            The path of the file to be read.
+            A file-like-object cannot be used.
+        chunk_size : int
+            The maximum amount of frames in each chunk.
+        start : int, optional
+            The frame index, where file parsing is started. If no value
+            is given, parsing starts at the first frame. The index
+            starts at 0.
+        stop : int, optional
+            The exclusive frame index, where file parsing ends.
+            If no value is given, parsing stops after the last frame.
+            The index starts at 0.
+        atom_i : ndarray, dtype=int
+            The atom indices to be read from the file.
+        
+        Yields
+        ------
+        coord : ndarray, dtype=float, shape=(m,n,3)
+            The coordinates of the next chunk of *m* frames.
+        """
+        if chunk_size < 1:
+            raise ValueError("The chunk size must be at least 1")
+        traj_type = self.traj_type()
+        with traj_type(file_name, 'r') as f:
+            if start is not None and start != 0:
+                # Skip frames before start
+                try:
+                    f.seek(start)
+                except (AttributeError, NotImplementedError):
+                    # The trajectory type does not support seeking
+                    # -> discard the leading frames chunk by chunk,
+                    # so that memory usage stays bounded
+                    skipped = 0
+                    while skipped < start:
+                        result = f.read(
+                            min(chunk_size, start - skipped), None, atom_i
+                        )
+                        n_read = len(result[self.output_value_index("coord")])
+                        if n_read == 0:
+                            # End of file
+                            break
+                        skipped += n_read
+                frame_i = start
+            else:
+                frame_i = 0
+            while stop is None or frame_i < stop:
+                if stop is None:
+                    n_frames = chunk_size
+                else:
+                    n_frames = min(chunk_size, stop - frame_i)
+                result = f.read(n_frames, None, atom_i)
+                coord = result[self.output_value_index("coord")]
+                if len(coord) == 0:
+                    # End of file
+                    break
+                frame_i += len(coord)
+                # nm to Angstrom
+                yield coord * 10
+    
     def get_coord(self):
         """
         Extract only the coordinates from the trajectory file.
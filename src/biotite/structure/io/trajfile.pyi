@@ -2,7 +2,7 @@
 # under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
 # information.
 
-from typing import Optional, Union, BinaryIO
+from typing import Optional, Union, BinaryIO, Iterator
 import numpy as np
 from ..atoms import AtomArray, AtomArrayStack
 from ...file import File
@@ -18,6 +18,14 @@ class TrajectoryFile(File[BinaryIO]):
         step:  Optional[int] = None,
         atom_i: Optional[np.ndarray] = None
     ) -> None: ...
+    def read_chunks(
+        self,
+        file_name: str,
+        chunk_size: int,
+        start: Optional[int] = None,
+        stop:  Optional[int] = None,
+        atom_i: Optional[np.ndarray] = None
+    ) -> Iterator[np.ndarray]: ...
     def get_coord(self) -> np.ndarray: ...
     def get_structure(
         self,
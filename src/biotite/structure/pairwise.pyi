@@ -0,0 +1,16 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+from typing import Union, Optional
+import numpy as np
+from .atoms import AtomArrayStack
+
+
+def pairwise_rmsd(
+    atoms: Union[AtomArrayStack, np.ndarray],
+    fit: bool = True,
+    threads: int = 1,
+    out: Optional[np.ndarray] = None,
+    block_size: int = 1024
+) -> np.ndarray: ...
@@ -0,0 +1,344 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+"""
+This module provides the all-vs-all comparison of the models in a
+structure, e.g. for the clustering of trajectory frames.
+"""
+
+__author__ = "Patrick Kunzmann"
+__all__ = ["pairwise_rmsd"]
+
+cimport cython
+cimport numpy as np
+from libc.math cimport sqrt, fabs
+
+from concurrent.futures import ThreadPoolExecutor
+from .atoms import coord as to_coord
+import numpy as np
+
+ctypedef np.float32_t float32
+ctypedef np.float64_t float64
+
+
+# Maximum number of Newton-Raphson iterations for finding the
+# largest eigenvalue of the QCP key matrix
+cdef int _MAX_ITERATIONS = 50
+# Relative precision of the largest eigenvalue
+cdef float64 _EIGENVALUE_PRECISION = 1e-11
+
+
+def pairwise_rmsd(atoms, bint fit=True, int threads=1, out=None,
+                  int block_size=1024):
+    """
+    pairwise_rmsd(atoms, fit=True, threads=1, out=None, block_size=1024)
+
+    Calculate the RMSD between each pair of models in a structure.
+
+    If `fit` is true, the RMSD of each pair is calculated after an
+    optimal superimposition of the two models.
+    Instead of performing an actual superimposition, the minimum
+    RMSD is obtained directly from the largest eigenvalue of the
+    quaternion based key matrix, using the
+    *quaternion characteristic polynomial* (QCP) method [1]_ [2]_.
+
+    Parameters
+    ----------
+    atoms : AtomArrayStack or ndarray, shape=(m,n,3), dtype=float
+        The models to be compared with each other.
+    fit : bool, optional
+        If true, the RMSD is calculated for the optimally superimposed
+        models.
+        Otherwise, the RMSD is calculated from the coordinates as they
+        are.
+    threads : int, optional
+        The number of threads the calculation is distributed over.
+    out : ndarray, shape=(m,m), dtype=float, optional
+        If given, the RMSD values are written into this array, instead
+        of a newly created one.
+        As the array is filled block-wise, this can also be a
+        :class:`numpy.memmap`, if the RMSD matrix does not fit into
+        memory.
+    block_size : int, optional
+        The number of rows of the RMSD matrix that are calculated,
+        before they are written into `out`.
+        Larger values slightly increase the efficiency of the
+        multithreading, at the cost of higher memory consumption.
+
+    Returns
+    -------
+    rmsd : ndarray, shape=(m,m), dtype=float
+        The symmetric RMSD matrix, where ``rmsd[i,j]`` is the RMSD
+        between the models ``i`` and ``j``.
+        If `out` is given, this is `out`, otherwise the array has a
+        *float32* dtype.
+
+    See Also
+    --------
+    rmsd
+    superimpose
+
+    Notes
+    -----
+    The calculation of the RMSD from the largest eigenvalue takes
+    only :math:`O(1)` operations, besides the :math:`O(n)` calculation
+    of the correlation matrix.
+    Hence, the time for calculating the matrix is dominated by the
+    :math:`O(m^2 n)` calculation of correlation matrices.
+
+    References
+    ----------
+
+    .. [1] DL Theobald,
+       "Rapid calculation of RMSDs using a quaternion-based
+       characteristic polynomial."
+       Acta Crystallogr A, 61, 478-480 (2005).
+    .. [2] P Liu, DK Agrafiotis, DL Theobald,
+       "Fast determination of the optimal rotational matrix for
+       macromolecular superpositions."
+       J Comput Chem, 31, 1561-1563 (2010).
+    """
+    if threads < 1:
+        raise ValueError("At least one thread is required")
+    if block_size < 1:
+        raise ValueError("The block size must be positive")
+
+    coord = to_coord(atoms)
+    if coord.ndim != 3 or coord.shape[-1] != 3:
+        raise IndexError(
+            f"Expected coordinates with shape (m,n,3), "
+            f"but got {coord.shape}"
+        )
+    cdef int n_models = coord.shape[0]
+    if out is None:
+        out = np.empty((n_models, n_models), dtype=np.float32)
+    elif out.shape != (n_models, n_models):
+        raise IndexError(
+            f"Expected an output array with shape "
+            f"{(n_models, n_models)}, but got {out.shape}"
+        )
+
+    coord = coord.astype(np.float32, copy=False)
+    if fit:
+        # For the QCP method the models need to be centered
+        # at the origin
+        coord = coord - np.mean(coord, axis=-2, keepdims=True)
+    coord = np.ascontiguousarray(coord, dtype=np.float32)
+    # The inner product of each model with itself
+    cdef float64[:] inner = np.sum(
+        coord.astype(np.float64)**2, axis=(-2, -1)
+    )
+    cdef float32[:,:,:] coord_view = coord
+
+    cdef int block_start, block_stop
+    cdef float64[:,:] block
+    for block_start in range(0, n_models, block_size):
+        block_stop = min(block_start + block_size, n_models)
+        # The block contains the rows from 'block_start' to
+        # 'block_stop' and all columns from 'block_start' onwards,
+        # as the other part of the rows is already known from the
+        # previous blocks due to symmetry
+        block_array = np.zeros(
+            (block_stop - block_start, n_models - block_start),
+            dtype=np.float64
+        )
+        block = block_array
+        _distribute_over_threads(
+            _rmsd_chunk,
+            _balanced_bounds(block_start, block_stop, n_models, threads),
+            coord_view, inner, block_start, fit, block
+        )
+        # Only the upper triangle of the square part of the block
+        # was calculated -> Fill the lower triangle
+        square = block_array[:, :block_stop - block_start]
+        square += square.T
+        out[block_start : block_stop, block_start:] = block_array
+        out[block_stop:, block_start : block_stop] \
+            = block_array[:, block_stop - block_start:].T
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
+
+
+def _balanced_bounds(int start, int stop, int n_models, int threads):
+    """
+    Split the rows `start` to `stop` into ranges, that contain
+    approximately the same number of model pairs in the upper triangle
+    of the RMSD matrix.
+    """
+    # Row 'i' contains 'n_models - i - 1' pairs
+    cum_pairs = np.cumsum(n_models - np.arange(start, stop) - 1)
+    if len(cum_pairs) == 0 or cum_pairs[-1] == 0:
+        return np.array([start, stop])
+    targets = np.linspace(0, cum_pairs[-1], threads+1)[1:-1]
+    inner_bounds = start + np.searchsorted(cum_pairs, targets) + 1
+    return np.concatenate(([start], inner_bounds, [stop])).astype(int)
+
+
+def _distribute_over_threads(function, bounds, *args):
+    """
+    Call ``function(start, stop, *args)`` for each pair of subsequent
+    `bounds` in a separate thread.
+    """
+    if len(bounds) == 2:
+        function(bounds[0], bounds[1], *args)
+        return
+    with ThreadPoolExecutor(max_workers=len(bounds)-1) as executor:
+        futures = [
+            executor.submit(function, chunk_start, chunk_stop, *args)
+            for chunk_start, chunk_stop in zip(bounds[:-1], bounds[1:])
+        ]
+        for future in futures:
+            # Raise exceptions from threads
+            future.result()
+
+
+def _rmsd_chunk(int start, int stop, float32[:,:,:] coord,
+                float64[:] inner, int block_start, bint fit,
+                float64[:,:] block):
+    with nogil:
+        _rmsd_rows(start, stop, coord, inner, block_start, fit, block)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+@cython.cdivision(True)
+cdef void _rmsd_rows(int start, int stop, float32[:,:,:] coord,
+                     float64[:] inner, int block_start, bint fit,
+                     float64[:,:] block) nogil:
+    """
+    Calculate the RMSD of the models in the range `start` to `stop` to
+    all subsequent models and write them into the upper triangle of
+    `block`.
+    """
+    cdef int n_models = coord.shape[0]
+    cdef int n_atoms = coord.shape[1]
+    cdef int i, j
+    cdef float64 sq_dev
+
+    if n_atoms == 0:
+        return
+    for i in range(start, stop):
+        for j in range(i+1, n_models):
+            if fit:
+                sq_dev = _fitted_sq_deviation(
+                    coord, i, j, inner[i] + inner[j]
+                )
+            else:
+                sq_dev = _sq_deviation(coord, i, j)
+            # Negative values may occur due to rounding errors
+            if sq_dev < 0:
+                sq_dev = 0
+            block[i - block_start, j - block_start] = sqrt(sq_dev / n_atoms)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+cdef inline float64 _sq_deviation(float32[:,:,:] coord, int i, int j) nogil:
+    """
+    Calculate the sum of squared deviations between the models `i`
+    and `j`.
+    """
+    cdef int k
+    cdef float64 dx, dy, dz
+    cdef float64 sq_dev = 0
+    for k in range(coord.shape[1]):
+        dx = coord[i,k,0] - coord[j,k,0]
+        dy = coord[i,k,1] - coord[j,k,1]
+        dz = coord[i,k,2] - coord[j,k,2]
+        sq_dev += dx*dx + dy*dy + dz*dz
+    return sq_dev
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+@cython.cdivision(True)
+cdef float64 _fitted_sq_deviation(float32[:,:,:] coord, int i, int j,
+                                  float64 inner_sum) nogil:
+    """
+    Calculate the sum of squared deviations between the centered
+    models `i` and `j` after optimal superimposition, via the QCP
+    method.
+    """
+    cdef int k, l, m
+    cdef float64 ax, ay, az, bx, by, bz
+    cdef float64 sxx=0, sxy=0, sxz=0
+    cdef float64 syx=0, syy=0, syz=0
+    cdef float64 szx=0, szy=0, szz=0
+
+    # Correlation matrix
+    for k in range(coord.shape[1]):
+        ax = coord[i,k,0]
+        ay = coord[i,k,1]
+        az = coord[i,k,2]
+        bx = coord[j,k,0]
+        by = coord[j,k,1]
+        bz = coord[j,k,2]
+        sxx += ax*bx
+        sxy += ax*by
+        sxz += ax*bz
+        syx += ay*bx
+        syy += ay*by
+        syz += ay*bz
+        szx += az*bx
+        szy += az*by
+        szz += az*bz
+
+    # Symmetric and traceless 4x4 key matrix
+    cdef float64 key[4][4]
+    key[0][0] =  sxx + syy + szz
+    key[0][1] =  syz - szy
+    key[0][2] =  szx - sxz
+    key[0][3] =  sxy - syx
+    key[1][1] =  sxx - syy - szz
+    key[1][2] =  sxy + syx
+    key[1][3] =  szx + sxz
+    key[2][2] = -sxx + syy - szz
+    key[2][3] =  syz + szy
+    key[3][3] = -sxx - syy + szz
+    for k in range(4):
+        for l in range(k):
+            key[k][l] = key[l][k]
+
+    # The coefficients of the characteristic polynomial
+    # 'x^4 + c2*x^2 + c1*x + c0' are obtained from the power sums
+    # 'tr(K^p)' of the eigenvalues via the Newton identities,
+    # as the trace of the key matrix is 0
+    cdef float64 key_sq[4][4]
+    cdef float64 trace_2 = 0, trace_3 = 0, trace_4 = 0
+    for k in range(4):
+        for l in range(4):
+            key_sq[k][l] = 0
+            for m in range(4):
+                key_sq[k][l] += key[k][m] * key[m][l]
+    for k in range(4):
+        for l in range(4):
+            trace_2 += key[k][l] * key[k][l]
+            trace_3 += key_sq[k][l] * key[l][k]
+            trace_4 += key_sq[k][l] * key_sq[l][k]
+    cdef float64 c2 = -trace_2 / 2
+    cdef float64 c1 = -trace_3 / 3
+    cdef float64 c0 = (trace_2 * trace_2 / 2 - trace_4) / 4
+
+    # Newton-Raphson iteration for the largest eigenvalue,
+    # starting from its upper bound
+    cdef float64 eigenvalue = inner_sum / 2
+    cdef float64 prev_eigenvalue, sq_eigenvalue, a, b, derivative
+    for k in range(_MAX_ITERATIONS):
+        prev_eigenvalue = eigenvalue
+        sq_eigenvalue = eigenvalue * eigenvalue
+        b = (sq_eigenvalue + c2) * eigenvalue
+        a = b + c1
+        derivative = 2 * sq_eigenvalue * eigenvalue + b + a
+        if derivative == 0:
+            break
+        eigenvalue -= (a * eigenvalue + c0) / derivative
+        if fabs(eigenvalue - prev_eigenvalue) \
+           < fabs(_EIGENVALUE_PRECISION * eigenvalue):
+                break
+
+    return inner_sum - 2 * eigenvalue
@@ -15,9 +15,9 @@ import numpy as np
 from .atoms import AtomArray, AtomArrayStack
 
 
-def get_residue_starts(array):
+def get_residue_starts(array, cache=False):
     """
-    Get the indices in an atom array, whcih indicates the beginning of
+    Get the indices in an atom array, which indicates the beginning of
     a residue.
     
     A new residue starts, either when the residue ID or chain ID
@@ -32,45 +32,45 @@ def get_residue_starts(array):
     ----------
     array : AtomArray or AtomArrayStack
         The atom array (stack) to get the residue starts from.
+    cache : bool, optional
+        If true, the residue starts are stored in `array`.
+        Subsequent calls of this function and all other residue-related
+        functions for the same `array` reuse the stored residue starts
+        instead of recomputing them.
+        The stored residue starts are discarded, when an annotation
+        array of `array` is set, added or removed, or when atoms are
+        set or deleted.
+        However, in-place modifications of annotation arrays (e.g.
+        ``array.res_id[0] = 42``) are not detected.
         
     Returns
     -------
-    starts : ndarray
+    starts : ndarray, dtype=int
         The start indices of resdiues in `array`.
     """
+    cached_starts = getattr(array, "_residue_starts", None)
+    if cached_starts is not None:
+        return cached_starts.copy()
+
     chain_ids = array.chain_id
     res_ids = array.res_id
     res_names = array.res_name
+    if len(res_ids) == 0:
+        return np.zeros(0, dtype=int)
 
-    # Maximum length is length of atom array
-    starts = np.zeros(array.array_length(), dtype=int)
-    starts[0] = 0
-    i = 1
-    # Variables for current values
-    curr_chain_id = chain_ids[0]
-    curr_res_id = res_ids[0]
-    curr_res_name = res_names[0]
+    # Residue ID = -1 -> Hetero residue
+    # -> Cannot rely on residue ID for residue distinction
+    # -> Fall back on residue names
+    is_hetero_residue = (res_ids[1:] == -1)
+    is_change = (chain_ids[1:] != chain_ids[:-1])
+    is_change |= ~is_hetero_residue & (res_ids[1:] != res_ids[:-1])
+    is_change |= is_hetero_residue & (res_names[1:] != res_names[:-1])
+    # The first atom always starts a residue
+    starts = np.concatenate(([0], np.where(is_change)[0] + 1))
 
-    for j in range(array.array_length()):
-        if res_ids[j] != -1:
-            if curr_res_id != res_ids[j] or curr_chain_id != chain_ids[j]:
-                starts[i] = j
-                i += 1
-                curr_chain_id = chain_ids[j]
-                curr_res_id   = res_ids[j]
-                curr_res_name = res_names[j]
-        else:
-            # Residue ID = -1 -> Hetero residue
-            # -> Cannot rely on residue ID for residue distinction
-            # -> Fall back on residue names
-            if curr_res_name != res_names[j] or curr_chain_id != chain_ids[j]:
-                starts[i] = j
-                i += 1
-                curr_chain_id = chain_ids[j]
-                curr_res_id   = res_ids[j]
-                curr_res_name = res_names[j]
-    # Trim to correct size
-    return starts[:i]
+    if cache:
+        array._residue_starts = starts.copy()
+    return starts
 
 
 def apply_residue_wise(array, data, function, axis=None):
@@ -86,6 +86,13 @@ def apply_residue_wise(array, data, function, axis=None):
     `ndarray`) is put as parameter into `function`. Each return value is
     stored as element in the resulting `ndarray`, therefore each element
     corresponds to one residue. 
+
+    If `function` is a *NumPy* reduction (:func:`numpy.sum`,
+    :func:`numpy.nansum`, :func:`numpy.mean`, :func:`numpy.average`,
+    :func:`numpy.min` or :func:`numpy.max`), that is applied along the
+    atom axis, all residues are reduced at once via
+    :meth:`numpy.ufunc.reduceat()`, which is much faster than calling
+    `function` for each residue.
     
     Parameters
     ----------
@@ -156,7 +163,14 @@ def apply_residue_wise(array, data, function, axis=None):
      [  0.34114286   5.57528571  -0.25428571]
      [  1.194       10.41625      1.13016667]]    
     """
-    starts = np.append(get_residue_starts(array), [array.array_length()])
+    starts = get_residue_starts(array)
+    if isinstance(data, np.ndarray) and len(starts) > 0 \
+       and (axis == 0 or (axis is None and data.ndim == 1)):
+        processed_data = _reduce_residue_wise(data, starts, function)
+        if processed_data is not None:
+            return processed_data
+
+    starts = np.append(starts, [array.array_length()])
     # The result array
     processed_data = None
     for i in range(len(starts)-1):
@@ -165,7 +179,6 @@ def apply_residue_wise(array, data, function, axis=None):
             value = function(interval)
         else:
             value = function(interval, axis=axis)
-        value = function(interval, axis=axis)
         # Identify the shape of the resulting array by evaluation
         # of the function return value for the first interval
         if processed_data is None:
@@ -184,6 +197,58 @@ def apply_residue_wise(array, data, function, axis=None):
     return processed_data
 
 
+def _reduce_residue_wise(data, starts, function):
+    """
+    Apply `function` to the residue intervals of `data` along the
+    first axis in a single call, if `function` is a supported *NumPy*
+    reduction.
+
+    Returns
+    -------
+    processed_data : ndarray or None
+        The residue-wise reduced data or None, if `function` is not
+        supported.
+    """
+    reduction = _REDUCTIONS.get(function)
+    if reduction is None:
+        return None
+    if not (np.issubdtype(data.dtype, np.number) or data.dtype == bool):
+        return None
+
+    if reduction in ("min", "max"):
+        ufunc = np.minimum if reduction == "min" else np.maximum
+        return ufunc.reduceat(data, starts, axis=0)
+
+    if reduction == "nansum" and np.issubdtype(data.dtype, np.inexact):
+        data = np.where(np.isnan(data), 0, data)
+    # 'reduceat()' does not upcast small integer types like 'sum()' does
+    # -> use the type 'sum()' would give
+    dtype = np.sum(data[:0], axis=0).dtype
+    if reduction in ("mean", "average"):
+        dtype = np.mean(data[:1], axis=0).dtype
+    sums = np.add.reduceat(data, starts, axis=0, dtype=dtype)
+    if reduction in ("sum", "nansum"):
+        return sums
+    counts = np.diff(np.append(starts, [len(data)]))
+    # Add dimensions to the counts to broadcast over the other axes
+    counts = counts.reshape((-1,) + (1,) * (data.ndim - 1))
+    return (sums / counts).astype(dtype, copy=False)
+
+
+# The NumPy functions, which are computed via 'ufunc.reduceat()'
+# in 'apply_residue_wise()'
+_REDUCTIONS = {
+    np.sum:     "sum",
+    np.nansum:  "nansum",
+    np.mean:    "mean",
+    np.average: "average",
+    np.min:     "min",
+    np.amin:    "min",
+    np.max:     "max",
+    np.amax:    "max",
+}
+
+
 def spread_residue_wise(array, input_data):
     """
     Creates an `ndarray` with residue-wise spreaded values from an input
@@ -240,12 +305,8 @@ def spread_residue_wise(array, input_data):
          'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c'
          'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c']
     """
-    starts = get_residue_starts(array)
-    output_data = np.zeros(array.array_length(), dtype=input_data.dtype)
-    for i in range(len(starts)-1):
-        output_data[starts[i]:starts[i+1]] = input_data[i]
-    output_data[starts[-1]:] = input_data[-1]
-    return output_data
+    starts = np.append(get_residue_starts(array), [array.array_length()])
+    return np.repeat(input_data, np.diff(starts), axis=0)
 
 
 def get_residues(array):
@@ -8,7 +8,7 @@ from .atoms import AtomArray, AtomArrayStack
 
 
 def get_residue_starts(
-    array: Union[AtomArrayStack, AtomArray]
+    array: Union[AtomArrayStack, AtomArray], cache: bool = False
 ) -> np.ndarray: ...
 
 @overload
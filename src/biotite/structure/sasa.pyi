@@ -2,17 +2,36 @@
 # under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
 # information.
 
-from typing import Union, Optional, Callable
+from typing import Union, Optional, Callable, Dict
 import numpy as np
 from .atoms import AtomArray, AtomArrayStack
 
 
+class RadiiTable:
+    def __init__(
+        self,
+        residue_radii: Optional[Dict[str, Dict[str, float]]] = None,
+        element_radii: Optional[Dict[str, float]] = None,
+        default: Optional[float] = None
+    ) -> None: ...
+    def get_radius(
+        self, res_name: str, atom_name: str, element: str
+    ) -> float: ...
+    def get_radii(
+        self,
+        atoms: Union[AtomArray, AtomArrayStack],
+        atom_filter: Optional[np.ndarray] = None
+    ) -> np.ndarray: ...
+
+
 def sasa(
-    array: AtomArray,
+    array: Union[AtomArray, AtomArrayStack],
     probe_radius: float = 1.4,
     atom_filter: Optional[np.ndarray] = None,
-    gnore_ions: bool = True,
+    ignore_ions: bool = True,
     point_number: int = 1000,
     point_distr: Union[str, Callable[[int], np.ndarray]] = "Fibonacci",
-    vdw_radii: Union[str, np.ndarray] = "ProtOr"
+    vdw_radii: Union[str, np.ndarray, RadiiTable] = "ProtOr",
+    threads: int = 1,
+    method: str = "ShrakeRupley"
 ) -> np.ndarray: ...
\ No newline at end of file
@@ -15,6 +15,7 @@ from .atoms import Atom, AtomArray, AtomArrayStack, coord
 from .geometry import distance, angle, dihedral
 from .filter import filter_amino_acids
 from .error import BadStructureError
+from .celllist import CellList
 
 
 _radians_to_angle = 2*np.pi/360
@@ -33,7 +34,7 @@ _d3_strand = ((9.9-0.9), (9.9+0.9))
 _d4_strand = ((12.4-1.1), (12.4+1.1))
 
 
-def annotate_sse(atom_array, chain_id):
+def annotate_sse(atom_array, chain_id=None):
     r"""
     Calculate the secondary structure elements (SSE) of a
     peptide chain based on the `P-SEA` algorithm. [1]_
@@ -43,18 +44,23 @@ def annotate_sse(atom_array, chain_id):
     
     Parameters
     ----------
-    atom_array : AtomArray
+    atom_array : AtomArray or AtomArrayStack
         The atom array to annotate for.
-    chain_id : str
+        If an `AtomArrayStack` is given, each model is annotated.
+    chain_id : str, optional
         The chain ID to annotate for.
+        By default, all chains are annotated, each chain independently
+        of the other chains.
     
     Returns
     -------
-    sse : ndarray
+    sse : ndarray, shape=(n,) or shape=(m,n)
         An array containing the secondary structure elements,
         where the index corresponds to the index of the CA-filtered
         `atom_array`. 'a' means :math:`{\alpha}`-helix, 'b' means
         :math:`{\beta}`-strand/sheet, 'c' means coil.
+        If an `AtomArrayStack` is given, the SSE are given for each
+        model *m*.
     
     Notes
     -----
@@ -81,130 +87,188 @@ def annotate_sse(atom_array, chain_id):
     ['c' 'a' 'a' 'a' 'a' 'a' 'a' 'a' 'a' 'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c'
      'c' 'c']
     
+    SSE of all models of PDB 1L2Y:
+
+    >>> stack = get_structure(file)
+    >>> sse = annotate_sse(stack)
+    >>> print(sse.shape)
+    (38, 20)
     """
-    # Filter all CA atoms in the relevant chain.
-    ca_coord = atom_array[filter_amino_acids(atom_array) &
-                          (atom_array.atom_name == "CA") &
-                          (atom_array.chain_id == chain_id)].coord
+    # Filter all CA atoms in the relevant chain(s)
+    ca_filter = filter_amino_acids(atom_array) & \
+                (atom_array.atom_name == "CA")
+    if chain_id is not None:
+        ca_filter &= (atom_array.chain_id == chain_id)
+    ca_coord = atom_array.coord[..., ca_filter, :]
+    chain_ids = atom_array.chain_id[ca_filter]
     
-    d2i_coord = np.full(( len(ca_coord), 2, 3 ), np.nan)
-    d3i_coord = np.full(( len(ca_coord), 2, 3 ), np.nan)
-    d4i_coord = np.full(( len(ca_coord), 2, 3 ), np.nan)
-    ri_coord = np.full(( len(ca_coord), 3, 3 ), np.nan)
-    ai_coord = np.full(( len(ca_coord), 4, 3 ), np.nan)
+    # Annotate the models of each chain at once
+    single_model = (ca_coord.ndim == 2)
+    if single_model:
+        ca_coord = ca_coord[np.newaxis, ...]
+    sse = np.full(ca_coord.shape[:2], "c", dtype="U1")
+    chain_bounds = np.concatenate((
+        [0],
+        np.where(chain_ids[1:] != chain_ids[:-1])[0] + 1,
+        [len(chain_ids)]
+    ))
+    for start, stop in zip(chain_bounds[:-1], chain_bounds[1:]):
+        sse[:, start:stop] = _annotate_sse(ca_coord[:, start:stop])
+    
+    if single_model:
+        return sse[0]
+    else:
+        return sse
+
+
+def _annotate_sse(ca_coord):
+    """
+    Annotate the SSE for the given CA coordinates of a single chain
+    in *m* models.
+    """
+    n_models, length = ca_coord.shape[:2]
+    sse = np.full((n_models, length), "c", dtype="U1")
+    if length == 0:
+        return sse
     
     # The distances and angles are not defined for the entire interval,
     # therefore the indices do not have the full range
     # Values that are not defined are NaN
-    for i in range(1, len(ca_coord)-1):
-        d2i_coord[i] = (ca_coord[i-1], ca_coord[i+1])
-    for i in range(1, len(ca_coord)-2):
-        d3i_coord[i] = (ca_coord[i-1], ca_coord[i+2])
-    for i in range(1, len(ca_coord)-3):
-        d4i_coord[i] = (ca_coord[i-1], ca_coord[i+3])
-    for i in range(1, len(ca_coord)-1):
-        ri_coord[i] = (ca_coord[i-1], ca_coord[i], ca_coord[i+1])
-    for i in range(1, len(ca_coord)-2):
-        ai_coord[i] = (ca_coord[i-1], ca_coord[i],
-                       ca_coord[i+1], ca_coord[i+2])
-    
-    d2i = distance(d2i_coord[:,0], d2i_coord[:,1])
-    d3i = distance(d3i_coord[:,0], d3i_coord[:,1])
-    d4i = distance(d4i_coord[:,0], d4i_coord[:,1])
-    ri = angle(ri_coord[:,0], ri_coord[:,1], ri_coord[:,2])
-    ai = dihedral(ai_coord[:,0], ai_coord[:,1],
-                  ai_coord[:,2], ai_coord[:,3])
-    
-    sse = np.full(len(ca_coord), "c", dtype="U1")
+    d2i = np.full((n_models, length), np.nan)
+    d3i = np.full((n_models, length), np.nan)
+    d4i = np.full((n_models, length), np.nan)
+    ri = np.full((n_models, length), np.nan)
+    ai = np.full((n_models, length), np.nan)
+    # Calculate the geometry with double precision
+    ca = ca_coord.astype(np.float64, copy=False)
+    if length > 2:
+        d2i[:, 1:-1] = distance(ca[:, :-2], ca[:, 2:])
+        ri[:, 1:-1] = angle(ca[:, :-2], ca[:, 1:-1], ca[:, 2:])
+    if length > 3:
+        d3i[:, 1:-2] = distance(ca[:, :-3], ca[:, 3:])
+        ai[:, 1:-2] = dihedral(
+            ca[:, :-3], ca[:, 1:-2], ca[:, 2:-1], ca[:, 3:]
+        )
+    if length > 4:
+        d4i[:, 1:-3] = distance(ca[:, :-4], ca[:, 4:])
     
     # Annotate helices
     # Find CA that meet criteria for potential helices
-    is_pot_helix = np.zeros(len(sse), dtype=bool)
-    for i in range(len(sse)):
-        if (
-                d3i[i] >= _d3_helix[0] and d3i[i] <= _d3_helix[1]
-            and d4i[i] >= _d4_helix[0] and d4i[i] <= _d4_helix[1]
-           ) or (
-                ri[i] >= _r_helix[0] and ri[i] <= _r_helix[1]
-            and ai[i] >= _a_helix[0] and ai[i] <= _a_helix[1]
-           ):
-                is_pot_helix[i] = True
+    is_pot_helix = (
+        _in_range(d3i, _d3_helix) & _in_range(d4i, _d4_helix)
+    ) | (
+        _in_range(ri, _r_helix) & _in_range(ai, _a_helix)
+    )
     # Real helices are 5 consecutive helix elements
-    is_helix = np.zeros(len(sse), dtype=bool)
-    counter = 0
-    for i in range(len(sse)):
-        if is_pot_helix[i]:
-            counter += 1
-        else:
-            if counter >= 5:
-                is_helix[i-counter : i] = True
-            counter = 0
+    starts, stops = _find_runs(is_pot_helix)
+    is_long = (stops - starts >= 5)
+    is_helix = _runs_to_mask(starts[is_long], stops[is_long], sse.shape)
     # Extend the helices by one at each end if CA meets extension criteria
-    i = 0
-    while i < len(sse):
-        if is_helix[i]:
-            sse[i] = "a"
-            if (
-                d3i[i-1] >= _d3_helix[0] and d3i[i-1] <= _d3_helix[1]
-               ) or (
-                ri[i-1] >= _r_helix[0] and ri[i-1] <= _r_helix[1]
-               ):
-                    sse[i-1] = "a"
-            sse[i] = "a"
-            if (
-                d3i[i+1] >= _d3_helix[0] and d3i[i+1] <= _d3_helix[1]
-               ) or (
-                ri[i+1] >= _r_helix[0] and ri[i+1] <= _r_helix[1]
-               ):
-                    sse[i+1] = "a"
-        i += 1
+    is_helix_ext = _in_range(d3i, _d3_helix) | _in_range(ri, _r_helix)
+    sse[_extend(is_helix, is_helix_ext)] = "a"
     
     # Annotate sheets
     # Find CA that meet criteria for potential strands
-    is_pot_strand = np.zeros(len(sse), dtype=bool)
-    for i in range(len(sse)):
-        if (    d2i[i] >= _d2_strand[0] and d2i[i] <= _d2_strand[1]
-            and d3i[i] >= _d3_strand[0] and d3i[i] <= _d3_strand[1]
-            and d4i[i] >= _d4_strand[0] and d4i[i] <= _d4_strand[1]
-           ) or (
-                ri[i] >= _r_strand[0] and ri[i] <= _r_strand[1]
-            and (   (ai[i] >= _a_strand[0] and ai[i] <= _a_strand[1])
-                 or (ai[i] >= _a_strand[2] and ai[i] <= _a_strand[3]))
-           ):
-                is_pot_strand[i] = True
-    # Real strands are 5 consecutive strand elements,
-    # or shorter fragments of at least 3 consecutive strand residues,
+    is_pot_strand = (
+            _in_range(d2i, _d2_strand)
+        &   _in_range(d3i, _d3_strand)
+        &   _in_range(d4i, _d4_strand)
+    ) | (
+            _in_range(ri, _r_strand)
+        & (
+                _in_range(ai, _a_strand[:2])
+            |   _in_range(ai, _a_strand[2:])
+        )
+    )
+    # Real strands are 4 consecutive strand elements,
+    # or shorter fragments of 3 consecutive strand residues,
     # if they are in hydrogen bond proximity to 5 other residues
-    pot_strand_coord = ca_coord[is_pot_strand]
-    is_strand = np.zeros(len(sse), dtype=bool)
-    counter = 0
-    contacts = 0
-    for i in range(len(sse)):
-        if is_pot_strand[i]:
-            counter += 1
-            coord = ca_coord[i]
-            for strand_coord in ca_coord:
-                dist = distance(coord, strand_coord)
-                if dist >= 4.2 and dist <= 5.2:
-                    contacts += 1
-        else:
-            if counter >= 4:
-                is_strand[i-counter : i] = True
-            elif counter == 3 and contacts >= 5:
-                is_strand[i-counter : i] = True
-            counter = 0
-            contacts = 0
+    contacts = np.zeros((n_models, length), dtype=int)
+    for model_i in range(n_models):
+        contacts[model_i, is_pot_strand[model_i]] = _count_contacts(
+            ca_coord[model_i], ca_coord[model_i, is_pot_strand[model_i]],
+            4.2, 5.2
+        )
+    # The runs do not span multiple models
+    # -> the cumulative sum can be taken over the flattened array
+    cum_contacts = np.concatenate(([0], np.cumsum(contacts)))
+    starts, stops = _find_runs(is_pot_strand)
+    run_lengths = stops - starts
+    run_contacts = cum_contacts[stops] - cum_contacts[starts]
+    is_real = (run_lengths >= 4) | ((run_lengths == 3) & (run_contacts >= 5))
+    is_strand = _runs_to_mask(starts[is_real], stops[is_real], sse.shape)
     # Extend the strands by one at each end if CA meets extension criteria
-    i = 0
-    while i < len(sse):
-        if is_strand[i]:
-            sse[i] = "b"
-            if d3i[i-1] >= _d3_strand[0] and d3i[i-1] <= _d3_strand[1]:
-                sse[i-1] = "b"
-            sse[i] = "b"
-            if d3i[i+1] >= _d3_strand[0] and d3i[i+1] <= _d3_strand[1]:
-                sse[i+1] = "b"
-        i += 1
+    is_strand_ext = _in_range(d3i, _d3_strand)
+    sse[_extend(is_strand, is_strand_ext)] = "b"
     
     return sse
-            
+
+
+def _in_range(values, interval):
+    """
+    Check which values are within the closed interval.
+    NaN values are never in the interval.
+    """
+    with np.errstate(invalid="ignore"):
+        return (values >= interval[0]) & (values <= interval[1])
+
+
+def _find_runs(mask):
+    """
+    Get the start and exclusive stop indices of consecutive runs of
+    *True* values in each row of a 2D boolean mask.
+    The indices refer to the flattened mask.
+    """
+    n_rows, length = mask.shape
+    padded = np.zeros((n_rows, length + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    diff = np.diff(padded, axis=-1)
+    # The index in 'diff' corresponds to the index in 'mask',
+    # where a run starts or stops
+    start_rows, start_cols = np.where(diff == 1)
+    stop_rows, stop_cols = np.where(diff == -1)
+    return start_rows * length + start_cols, stop_rows * length + stop_cols
+
+
+def _runs_to_mask(starts, stops, shape):
+    """
+    Create a boolean mask that is *True* within the given runs of the
+    flattened mask.
+    """
+    size = np.prod(shape)
+    marks = np.zeros(size + 1, dtype=int)
+    np.add.at(marks, starts, 1)
+    np.add.at(marks, stops, -1)
+    return (np.cumsum(marks[:-1]) > 0).reshape(shape)
+
+
+def _extend(mask, extension_mask):
+    """
+    Extend each *True* value in `mask` by one element at each side
+    along the last dimension, if the respective element fulfills the
+    `extension_mask`.
+    """
+    extended = mask.copy()
+    extended[..., :-1] |= mask[..., 1:] & extension_mask[..., :-1]
+    extended[..., 1:] |= mask[..., :-1] & extension_mask[..., 1:]
+    return extended
+
+
+def _count_contacts(coord, pos, min_distance, max_distance):
+    """
+    Count the number of atoms in `coord` within the given distance range
+    for each position in `pos`.
+    """
+    if len(pos) == 0:
+        return np.zeros(0, dtype=int)
+    cell_list = CellList(coord, cell_size=max_distance)
+    # The cell list is only used to find candidates:
+    # The small margin prevents that atoms at the boundary are lost
+    # due to rounding errors
+    adjacent = cell_list.get_atoms(pos, max_distance + 0.1)
+    is_adjacent = (adjacent != -1)
+    dist = np.full(adjacent.shape, np.nan, dtype=coord.dtype)
+    pos_i, _ = np.where(is_adjacent)
+    dist[is_adjacent] = distance(pos[pos_i], coord[adjacent[is_adjacent]])
+    return np.count_nonzero(_in_range(dist, (min_distance, max_distance)),
+                            axis=-1)
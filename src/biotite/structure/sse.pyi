@@ -2,8 +2,12 @@
 # under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
 # information.
 
-from biotite.structure.atoms import AtomArray
+from typing import Optional, Union
+from biotite.structure.atoms import AtomArray, AtomArrayStack
 from numpy import ndarray
 
 
-def annotate_sse(atom_array: AtomArray, chain_id: str) -> ndarray: ...
+def annotate_sse(
+    atom_array: Union[AtomArray, AtomArrayStack],
+    chain_id: Optional[str] = None
+) -> ndarray: ...
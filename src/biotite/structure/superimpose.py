@@ -44,7 +44,7 @@ def superimpose(fixed, mobile, atom_mask=None):
     fitted : AtomArray or AtomArrayStack
         A copy of the `mobile` structure(s),
         superimposed on the fixed structure.
-    transformation : tuple or tuple list
+    transformation : tuple(ndarray, ndarray, ndarray)
         The tuple contains the transformations that were applied on
         `mobile`. This can be used in `apply_superimposition()` in order
         to transform another AtomArray in the same way.
@@ -54,6 +54,10 @@ def superimpose(fixed, mobile, atom_mask=None):
         The third element contains the translation vector for moving the
         structure onto the fixed.
         The three transformations are performed sequentially.
+        If `mobile` is an `AtomArrayStack`, each element has an
+        additional first dimension for the *m* models, i.e. the
+        translation vectors have shape *(m,3)* and the rotation matrices
+        have shape *(m,3,3)*.
     
     See Also
     --------
@@ -129,46 +133,36 @@ def superimpose(fixed, mobile, atom_mask=None):
     if not isinstance(fixed, AtomArray):
         raise ValueError("Reference must be AtomArray")
    
-    if isinstance(mobile, AtomArray):
-        # Simply superimpose without loop
-        rotation = _superimpose(fix_centered, mob_centered)
-        superimposed = mobile.copy()
-        superimposed.coord -= mob_centroid[..., np.newaxis, :]
-        superimposed.coord = np.dot(superimposed.coord, rotation)
-        superimposed.coord += fix_centroid
-        return superimposed, (-mob_centroid, rotation, fix_centroid)
-    
-    elif isinstance(mobile, AtomArrayStack):
-        superimposed = mobile.copy()
-        superimposed.coord -= mob_centroid[..., np.newaxis, :]
-        # Perform Kabsch algorithm for every model
-        transformations = [None] * len(superimposed.coord)
-        for i in range(len(superimposed.coord)):
-            rotation = _superimpose(fix_centered, mob_centered[i])
-            superimposed.coord[i] = np.dot(superimposed.coord[i], rotation)
-            transformations[i] = (-mob_centroid[i], rotation, fix_centroid)
-        superimposed.coord += fix_centroid
-        return superimposed, transformations
-   
-    else:
+    if not isinstance(mobile, (AtomArray, AtomArrayStack)):
         raise ValueError("Mobile structure must be AtomArray "
                          "or AtomArrayStack")
+    
+    # For a stack, the Kabsch algorithm is performed
+    # for all models at once
+    rotation = _superimpose(fix_centered, mob_centered)
+    if isinstance(mobile, AtomArrayStack):
+        fix_centroid = np.tile(fix_centroid, (mobile.stack_depth(), 1))
+    transformation = (-mob_centroid, rotation, fix_centroid)
+    return superimpose_apply(mobile, transformation), transformation
 
 
 def _superimpose(fix_centered, mob_centered):
     """
     Perform the Kabsch algorithm using only the coordinates.
+    
+    If `mob_centered` contains multiple models, a rotation matrix is
+    calculated for each model.
     """
     # Calculating rotation matrix
     y = mob_centered
     x = fix_centered
     # Calculate covariance matrix
-    cov = np.dot(y.T, x)
+    cov = np.matmul(np.swapaxes(y, -1, -2), x)
     v, s, w = np.linalg.svd(cov)
     # Remove possibility of reflected atom coordinates
-    if np.linalg.det(v) * np.linalg.det(w) < 0:
-        v[:,-1] *= -1
-    rotation = np.dot(v,w)
+    is_reflected = np.linalg.det(v) * np.linalg.det(w) < 0
+    v[..., -1] *= np.where(is_reflected, -1, 1)[..., np.newaxis]
+    rotation = np.matmul(v, w)
     return rotation
 
 
@@ -180,10 +174,13 @@ def superimpose_apply(atoms, transformation):
     
     Parameters
     ----------
-    atoms : AtomArray
+    atoms : AtomArray or AtomArrayStack
         The structure to apply the transformation on.
     transformation: tuple, size=3
         The transfomration tuple, obtained by `superimpose()`.
+        If the transformation was obtained for an `AtomArrayStack`
+        with *m* models, `atoms` must be an `AtomArrayStack` with *m*
+        models, too.
     
     Returns
     -------
@@ -196,7 +193,13 @@ def superimpose_apply(atoms, transformation):
     superimpose
     """
     transformed = atoms.copy()
-    transformed.coord += transformation[0]
-    transformed.coord = np.dot(transformed.coord, transformation[1])
-    transformed.coord += transformation[2]
+    # The translation vectors may contain a dimension for models
+    # -> add dimension for atoms
+    transformed.coord += transformation[0][..., np.newaxis, :]
+    # Retain the precision of the coordinates
+    transformed.coord = np.matmul(
+        transformed.coord,
+        transformation[1].astype(transformed.coord.dtype, copy=False)
+    )
+    transformed.coord += transformation[2][..., np.newaxis, :]
     return transformed
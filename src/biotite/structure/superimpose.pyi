@@ -2,7 +2,7 @@
 # under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
 # information.
 
-from typing import Tuple, List, Optional, overload
+from typing import Tuple, Optional, Union, overload
 import numpy as np
 from .atoms import AtomArray, AtomArrayStack
 
@@ -20,9 +20,15 @@ def superimpose(
     mobile: AtomArrayStack,
     atom_mask: Optional[np.ndarray] = None
 ) -> Tuple[AtomArrayStack,
-           List[Tuple[np.ndarray, np.ndarray, np.ndarray]]]: ...
+           Tuple[np.ndarray, np.ndarray, np.ndarray]]: ...
 
+@overload
 def superimpose_apply(
     atoms: AtomArray,
     transformation: Tuple[np.ndarray, np.ndarray, np.ndarray]
 ) -> AtomArray: ...
+@overload
+def superimpose_apply(
+    atoms: AtomArrayStack,
+    transformation: Tuple[np.ndarray, np.ndarray, np.ndarray]
+) -> AtomArrayStack: ...
@@ -78,9 +78,11 @@ def rotate(atoms, angles):
     # Copy AtomArray(Stack) and apply rotations
     # Note that the coordinates are treated as row vector
     transformed = atoms.copy()
-    transformed.coord = np.dot(transformed.coord, rot_x)
-    transformed.coord = np.dot(transformed.coord, rot_y)
-    transformed.coord = np.dot(transformed.coord, rot_z)
+    # Retain the precision of the coordinates
+    dtype = transformed.coord.dtype
+    transformed.coord = np.dot(transformed.coord, rot_x.astype(dtype))
+    transformed.coord = np.dot(transformed.coord, rot_y.astype(dtype))
+    transformed.coord = np.dot(transformed.coord, rot_z.astype(dtype))
     return transformed
 
 def rotate_centered(atoms, angles):
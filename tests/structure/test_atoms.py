@@ -2,6 +2,7 @@
 # under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
 # information.
 
+import pickle
 import biotite.structure as struc
 import numpy as np
 import pytest
@@ -121,4 +122,124 @@ def test_bonds(array):
                                                       [5, 6, 0],
                                                       [5, 7, 0],
                                                       [7, 8, 0],
-                                                      [7, 9, 0]]
\ No newline at end of file
+                                                      [7, 9, 0]]
+
+def test_pickle(array, stack):
+    assert pickle.loads(pickle.dumps(array)) == array
+    assert pickle.loads(pickle.dumps(stack)) == stack
+
+def test_view(array, stack):
+    """
+    A view should be equal to the subarray obtained via indexing, but
+    should share the annotation arrays and coordinates.
+    """
+    array.bonds = struc.BondList(5, np.array([(0,1),(0,2),(2,3),(2,4)]))
+    for index in [slice(None), slice(1, 4), slice(None, None, 2)]:
+        view = array.view(index)
+        assert view == array[index]
+        assert view.bonds == array[index].bonds
+        for category in array.get_annotation_categories():
+            assert np.shares_memory(
+                view.get_annotation(category), array.get_annotation(category)
+            )
+        assert np.shares_memory(view.coord, array.coord)
+    # Modifications of the view affect the original array
+    view = array.view(slice(2, 5))
+    view.res_id[0] = 42
+    assert array.res_id[2] == 42
+    # Assigning new annotations to the view does not
+    view.chain_id = np.array(["X", "X", "X"])
+    assert array.chain_id.tolist() == ["A","A","B","B","B"]
+    with pytest.raises(IndexError):
+        array.view(array.chain_id == "A")
+
+    for index in [
+        slice(None), slice(1, 3), 1,
+        (slice(None, 2), slice(1, 4)), (2, slice(None)), (..., slice(3))
+    ]:
+        view = stack.view(index)
+        assert view == stack[index]
+        assert np.shares_memory(view.coord, stack.coord)
+        assert np.shares_memory(view.res_name, stack.res_name)
+    with pytest.raises(IndexError):
+        stack.view([0, 2])
+
+def test_atom_view(array, stack):
+    """
+    An atom view should give the same annotations and coordinates as
+    the corresponding atom and write modifications into the parent
+    array.
+    """
+    for i in range(-array.array_length(), array.array_length()):
+        assert array.view(i) == array[i]
+        assert array.view(i).to_atom() == array[i]
+        assert array.view(i).res_name == array[i].res_name
+    assert stack.view((1, 2)) == stack[1, 2]
+    view = array.view(2)
+    view.res_id = 42
+    view.coord = [4, 5, 6]
+    assert array.res_id[2] == 42
+    assert array.coord[2].tolist() == [4, 5, 6]
+    with pytest.raises(AttributeError):
+        view.foo
+    with pytest.raises(IndexError):
+        array.view(5)
+    assert pickle.loads(pickle.dumps(view)) == view
+
+def test_atom_view_interoperability(array):
+    """
+    Atom views should be accepted wherever an `Atom` is accepted.
+    """
+    # The atoms of the fixture are collinear
+    # -> move them to obtain defined angles and dihedral angles
+    array.coord = np.array(
+        [[0, 0, 0], [1, 0, 0], [1, 1, 0], [1, 1, 1], [2, 1, 1]], dtype=float
+    )
+    views = [array.view(i) for i in range(array.array_length())]
+    assert struc.array(views) == array
+    assert struc.array([views[0], array[1]]) == array[:2]
+    assert np.shares_memory(struc.coord(views[1]), array.coord)
+    assert struc.distance(views[0], views[1]) \
+        == struc.distance(array[0], array[1])
+    assert struc.angle(views[0], views[1], views[2]) \
+        == pytest.approx(np.pi / 2)
+    assert abs(struc.dihedral(views[0], views[1], views[2], views[3])) \
+        == pytest.approx(np.pi / 2)
+    # The comparison is symmetric
+    assert array[1] == views[1]
+    assert views[1] == array[1]
+    assert array[1] != views[2]
+    assert views[2] != array[1]
+
+def test_records(array):
+    """
+    The records should contain the annotations and coordinates of
+    each atom.
+    """
+    records = array.as_records()
+    assert len(records) == array.array_length()
+    for i, atom in enumerate(array):
+        for category in array.get_annotation_categories():
+            assert records[i][category] == getattr(atom, category)
+        assert records[i]["coord"].tolist() == atom.coord.tolist()
+
+def test_coord_dtype(array):
+    """
+    Single precision coordinates should be retained by the common
+    operations on atom arrays and stacks.
+    """
+    assert struc.AtomArray(3, np.float32).coord.dtype == np.float32
+    assert struc.AtomArrayStack(2, 3, np.float32).coord.dtype == np.float32
+    array.coord = array.coord.astype(np.float32)
+    stack = struc.stack([array, array])
+    for atoms in [
+        array, array.copy(), array[1:], array + array,
+        stack, stack.copy(), stack[0], stack[:, 1:]
+    ]:
+        assert atoms.coord.dtype == np.float32
+    assert struc.rotate(array, [1, 2, 3]).coord.dtype == np.float32
+    assert struc.superimpose(array, array)[0].coord.dtype == np.float32
+    # No conversion and hence no copy is required
+    assert struc.coord(array.coord) is array.coord
+    # Integers are still converted
+    assert struc.coord(np.ones((3,3), dtype=int)).dtype == float
@@ -22,7 +22,7 @@ def test_creation(bond_list):
                                              [3, 4, 0],
                                              [0, 4, 0],
                                              [4, 6, 0]]
-    assert bond_list._max_bonds_per_atom == 3
+    assert bond_list.get_all_bonds()[0].shape[1] == 3
     assert bond_list._atom_count == 7
 
 
@@ -63,6 +63,45 @@ def test_access(bond_list):
     assert bonds.tolist() == [3, 0, 6]
     assert bond_types.tolist() == [0, 0, 0]
 
+def test_get_all_bonds(bond_list):
+    """
+    The padded arrays from :func:`BondList.get_all_bonds()` should
+    contain the same bonds as :func:`BondList.get_bonds()` for each
+    atom.
+    """
+    bond_list.add_bond(1, 3, 1)
+    test_bonds, test_types = bond_list.get_all_bonds()
+    assert test_bonds.shape == (bond_list.get_atom_count(), 3)
+    for i in range(bond_list.get_atom_count()):
+        ref_bonds, ref_types = bond_list.get_bonds(i)
+        assert test_bonds[i, test_bonds[i] != -1].tolist() \
+            == ref_bonds.tolist()
+        assert test_types[i, test_types[i] != -1].tolist() \
+            == ref_types.tolist()
+
+def test_adjacency_invalidation(bond_list):
+    """
+    Bond queries should reflect modifications of the bond list after
+    a previous query.
+    """
+    assert bond_list.get_bonds(2)[0].tolist() == [1]
+    bond_list.add_bond(2, 5)
+    assert bond_list.get_bonds(2)[0].tolist() == [1, 5]
+    bond_list.add_bond(2, 5, 2)
+    assert bond_list.get_bonds(2)[1].tolist() == [0, 2]
+    bond_list.remove_bond(1, 2)
+    assert bond_list.get_bonds(2)[0].tolist() == [5]
+    bond_list.remove_bonds(struc.BondList(10, np.array([(2,5)])))
+    assert bond_list.get_bonds(2)[0].tolist() == []
+    bond_list.offset_indices(1)
+    assert bond_list.get_bonds(1)[0].tolist() == [2, 5]
+    # The result must not alter the bond list
+    bond_list.get_bonds(1)[0][:] = 0
+    assert bond_list.get_bonds(1)[0].tolist() == [2, 5]
+    # Concatenation and indexing create new bond lists
+    assert (bond_list + bond_list).get_bonds(9)[0].tolist() == [10, 13]
+    assert bond_list[1:].get_bonds(0)[0].tolist() == [1, 4]
+
 def test_merge(bond_list):
     merged_list = bond_list.merge(struc.BondList(8, np.array([(4,6),(6,7)])))
     assert merged_list.as_array().tolist() == [[0, 1, 0],
@@ -83,7 +122,7 @@ def test_concatenation(bond_list):
                                              [4, 6, 0],
                                              [7, 8, 2],
                                              [8, 9, 2]]
-    assert bond_list._max_bonds_per_atom == 3
+    assert bond_list.get_all_bonds()[0].shape[1] == 3
     assert bond_list._atom_count == 10
 
 def test_indexing(bond_list):
@@ -0,0 +1,129 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+from .util import data_dir
+import biotite.structure as struc
+import biotite.structure.io as strucio
+from os.path import join
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def stack():
+    return strucio.load_structure(join(data_dir, "1l2y.mmtf"))
+
+
+@pytest.mark.parametrize("capacity", [0, 1, 1000])
+def test_array_builder(stack, capacity):
+    """
+    Building an array from residues and single atoms should give the
+    same result as the concatenation of the residues.
+    """
+    array = stack[0]
+    starts = np.append(struc.get_residue_starts(array), array.array_length())
+    # Bonds between subsequent atoms within each residue
+    res_ids = struc.spread_residue_wise(array, np.arange(len(starts) - 1))
+    atom_i = np.arange(array.array_length() - 1)
+    atom_i = atom_i[res_ids[:-1] == res_ids[1:]]
+    array.bonds = struc.BondList(
+        array.array_length(), np.stack([atom_i, atom_i + 1], axis=-1)
+    )
+    builder = struc.AtomArrayBuilder(capacity)
+    for start, stop in zip(starts[:-2], starts[1:-1]):
+        builder.append(array[start:stop])
+    # Append the last residue atom-wise
+    for atom in array[starts[-2]:]:
+        builder.append(atom)
+    assert builder.array_length() == array.array_length()
+    test_array = builder.build()
+    assert builder.array_length() == 0
+    # The last residue is appended without bonds
+    ref_array = array[:starts[-2]] + array[starts[-2]:]
+    ref_array.bonds = ref_array.bonds[:starts[-2]] \
+                      + struc.BondList(ref_array.array_length() - starts[-2])
+    assert test_array == ref_array
+    assert test_array.bonds == ref_array.bonds
+
+
+def test_array_builder_annotations():
+    """
+    Only annotations existing in all appended arrays should be kept
+    and string annotations should be able to grow.
+    """
+    array1 = struc.AtomArray(2)
+    array1.res_name = np.array(["A", "B"])
+    array1.add_annotation("b_factor", dtype=float)
+    array2 = struc.AtomArray(1)
+    array2.res_name = np.array(["LONG"])
+    builder = struc.AtomArrayBuilder()
+    builder.append(array1)
+    builder.append(array2)
+    test_array = builder.build()
+    assert "b_factor" not in test_array.get_annotation_categories()
+    assert test_array.res_name.tolist() == ["A", "B", "LONG"]
+
+
+@pytest.mark.parametrize("capacity, use_template", [
+    (0, False), (5, True), (100, True)
+])
+def test_stack_builder(stack, capacity, use_template):
+    """
+    Building a stack from models and coordinates should give the
+    original stack.
+    """
+    template = stack[0] if use_template else None
+    builder = struc.StackBuilder(template, capacity)
+    builder.append(stack[:3])
+    builder.append(stack[3])
+    builder.append(stack.coord[4])
+    builder.append(stack.coord[5:])
+    assert builder.stack_depth() == stack.stack_depth()
+    test_stack = builder.build()
+    assert builder.stack_depth() == 0
+    assert test_stack == stack
+    with pytest.raises(ValueError):
+        builder.append(stack[0][:10])
+    with pytest.raises(IndexError):
+        builder.append(stack.coord[:, :10])
+
+
+def test_stack_builder_independence(stack):
+    """
+    The built stacks should not share their annotations and bonds with
+    the template.
+    """
+    template = stack[0]
+    template.bonds = struc.BondList(
+        template.array_length(), np.array([(0, 1), (1, 2)])
+    )
+    builder = struc.StackBuilder(template)
+    builder.append(stack.coord[:2])
+    test_stack = builder.build()
+    test_stack.res_name[0] = "ZZZ"
+    test_stack.bonds.add_bond(3, 4)
+    assert template.res_name[0] != "ZZZ"
+    assert template.bonds.as_array().tolist() == [[0, 1, 0], [1, 2, 0]]
+    builder.append(stack.coord[:2])
+    assert builder.build().res_name[0] != "ZZZ"
+
+
+def test_stack_builder_dtype(stack):
+    """
+    The coordinates should have the data type of the template, unless
+    more precise coordinates are appended.
+    """
+    template = stack[0]
+    template.coord = template.coord.astype(np.float32)
+    builder = struc.StackBuilder(template)
+    assert builder.build().coord.dtype == np.float32
+    builder.append(stack.coord[:2].astype(np.float32))
+    assert builder.build().coord.dtype == np.float32
+    builder.append(stack.coord[:2].astype(np.float32))
+    builder.append(stack.coord[2:4].astype(np.float64))
+    test_stack = builder.build()
+    assert test_stack.coord.dtype == np.float64
+    assert np.array_equal(
+        test_stack.coord[2:], stack.coord[2:4].astype(np.float64)
+    )
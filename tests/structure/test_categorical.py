@@ -0,0 +1,149 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+from .util import data_dir
+import biotite.structure as struc
+import biotite.structure.io as strucio
+import biotite.structure.io.mmtf as mmtf
+from os.path import join
+import numpy as np
+import pytest
+
+
+CATEGORICAL_ANNOTATIONS = ["chain_id", "res_name", "atom_name", "element"]
+
+
+@pytest.fixture
+def array():
+    return strucio.load_structure(join(data_dir, "1l2y.mmtf"))[0]
+
+
+@pytest.fixture
+def categorical_array(array):
+    array = array.copy()
+    for category in CATEGORICAL_ANNOTATIONS:
+        array.set_annotation(
+            category, struc.CategoricalArray(array.get_annotation(category))
+        )
+    return array
+
+
+def test_array_semantics():
+    """
+    A categorical array should behave like the equivalent
+    :class:`ndarray`.
+    """
+    values = np.array(["CA", "N", "C", "CA", "O", "N", "CA"])
+    array = struc.CategoricalArray(values)
+    assert np.asarray(array).tolist() == values.tolist()
+    assert array.codes.dtype == np.uint8
+    assert array.categories.tolist() == ["C", "CA", "N", "O"]
+    assert len(array) == len(values)
+    assert array.dtype == values.dtype
+    assert array[1] == "N"
+    assert array[2:5].tolist() == values[2:5].tolist()
+    assert array[values == "CA"].tolist() == values[values == "CA"].tolist()
+    assert (array == "CA").tolist() == (values == "CA").tolist()
+    assert (array != "CA").tolist() == (values != "CA").tolist()
+    assert (array == "CB").tolist() == [False] * len(values)
+    assert (array == values).tolist() == [True] * len(values)
+    assert (values == array).tolist() == [True] * len(values)
+    assert np.isin(array, ["N", "O"]).tolist() \
+        == np.isin(values, ["N", "O"]).tolist()
+    assert np.in1d(array, ["N", "O"], invert=True).tolist() \
+        == np.in1d(values, ["N", "O"], invert=True).tolist()
+    assert np.unique(array).tolist() == np.unique(values).tolist()
+    assert np.delete(array, 2).tolist() == np.delete(values, 2).tolist()
+    assert isinstance(np.delete(array, 2), struc.CategoricalArray)
+    # Concatenation of arrays with different categories
+    other_values = np.array(["CB", "CA"])
+    concat = np.concatenate([array, struc.CategoricalArray(other_values)])
+    assert isinstance(concat, struc.CategoricalArray)
+    assert concat.tolist() == np.concatenate([values, other_values]).tolist()
+    # Setting values, that are not part of the categories yet
+    array[0] = "CB"
+    values[0] = "CB"
+    array[1:3] = ["CG", "C"]
+    values[1:3] = ["CG", "C"]
+    assert array.tolist() == values.tolist()
+    # Comparison of arrays with different categories
+    assert (array == concat[:len(array)]).tolist() \
+        == (values == np.asarray(concat[:len(array)])).tolist()
+
+
+def test_views():
+    """
+    A slice of a categorical array should share its values with the
+    original array, even if new categories are added.
+    """
+    array = struc.CategoricalArray(["A", "B", "C", "D"])
+    view = array[1:3]
+    array[2] = "E"
+    assert view.tolist() == ["B", "E"]
+    view[0] = "F"
+    assert array.tolist() == ["A", "F", "E", "D"]
+
+
+def test_code_expansion():
+    """
+    The codes should be converted into a larger integer type, if the
+    number of categories exceeds the range of the current type.
+    """
+    values = np.array([str(i) for i in range(256)])
+    array = struc.CategoricalArray(values)
+    assert array.codes.dtype == np.uint8
+    array[0] = "new"
+    assert array.codes.dtype == np.uint16
+    assert array.tolist() == ["new"] + values[1:].tolist()
+
+
+def test_filters(array, categorical_array):
+    """
+    Filters should give the same results for categorical annotations.
+    """
+    for filter_function in [
+        struc.filter_amino_acids, struc.filter_backbone,
+        struc.filter_solvent, struc.filter_monoatomic_ions
+    ]:
+        assert filter_function(categorical_array).tolist() \
+            == filter_function(array).tolist()
+
+
+def test_atom_array(array, categorical_array):
+    """
+    Common atom array operations should give the same results for
+    categorical annotations and preserve them.
+    """
+    assert categorical_array == array
+    assert struc.get_residue_starts(categorical_array).tolist() \
+        == struc.get_residue_starts(array).tolist()
+    for test_array, ref_array in [
+        (categorical_array[10:20], array[10:20]),
+        (categorical_array[categorical_array.element == "C"],
+         array[array.element == "C"]),
+        (categorical_array + categorical_array, array + array),
+        (categorical_array.copy(), array),
+    ]:
+        assert test_array == ref_array
+        assert isinstance(test_array.res_name, struc.CategoricalArray)
+    atom = categorical_array[5]
+    assert atom == array[5]
+    del categorical_array[5]
+    del array[5]
+    assert categorical_array == array
+    assert isinstance(categorical_array.res_name, struc.CategoricalArray)
+    stack = struc.stack([categorical_array, categorical_array])
+    assert stack[0] == array
+
+
+def test_mmtf(array, categorical_array):
+    """
+    An atom array with categorical annotations should be written
+    correctly into an MMTF file.
+    """
+    file = mmtf.MMTFFile()
+    mmtf.set_structure(file, categorical_array)
+    test_array = mmtf.get_structure(file, model=1)
+    assert test_array.equal_annotations(array)
+    assert np.allclose(test_array.coord, array.coord, atol=1e-3)
@@ -7,6 +7,7 @@ import biotite.structure as struc
 import biotite.structure.io as strucio
 from os.path import join
 import itertools
+import pickle
 import numpy as np
 import pytest
 
@@ -71,4 +72,175 @@ def test_outside_location():
     cell_list = struc.CellList(array, cell_size=5)
     outside_coord = np.min(array.coord, axis=0) - 100
     # Expect empty array
-    assert len(cell_list.get_atoms(outside_coord, 5)) == 0
\ No newline at end of file
+    assert len(cell_list.get_atoms(outside_coord, 5)) == 0
+
+
+@pytest.mark.parametrize("cell_size, threshold", itertools.product(
+                            [0.5, 1, 2, 5, 10],
+                            [2,5,10])
+                        )
+def test_sparse_adjacency_matrix(cell_size, threshold):
+    """
+    The sparse adjacency matrix should be equivalent to the dense one.
+    """
+    array = strucio.load_structure(join(data_dir, "3o5r.mmtf"))
+    array = array[struc.filter_amino_acids(array)]
+    cell_list = struc.CellList(array, cell_size=cell_size)
+    ref_matrix = cell_list.create_adjacency_matrix(threshold)
+    indptr, indices = cell_list.create_adjacency_matrix(threshold, sparse=True)
+    matrix = np.zeros(ref_matrix.shape, dtype=bool)
+    for i in range(len(indptr)-1):
+        matrix[i, indices[indptr[i] : indptr[i+1]]] = True
+    assert matrix.tolist() == ref_matrix.tolist()
+
+
+@pytest.mark.parametrize("cell_size, radius", itertools.product(
+                            [0.5, 1, 2, 5, 10],
+                            [2,5,10])
+                        )
+def test_atom_pairs(cell_size, radius):
+    """
+    The atom pairs should contain each pair of atoms in the adjacency
+    matrix exactly once, without self-pairs.
+    """
+    array = strucio.load_structure(join(data_dir, "3o5r.mmtf"))
+    array = array[struc.filter_amino_acids(array)]
+    cell_list = struc.CellList(array, cell_size=cell_size)
+    pairs = cell_list.get_atom_pairs(radius)
+    assert (pairs[:,0] < pairs[:,1]).all()
+    ref_matrix = cell_list.create_adjacency_matrix(radius)
+    ref_pairs = np.stack(np.where(np.triu(ref_matrix, k=1)), axis=-1)
+    assert sorted(map(tuple, pairs.tolist())) \
+        == sorted(map(tuple, ref_pairs.tolist()))
+
+
+@pytest.mark.parametrize("cell_size, radius, box", itertools.product(
+    [1, 2, 5],
+    [2, 4],
+    [np.diag([10.0, 15.0, 20.0]),
+     np.array([[10.0,  0.0,  0.0],
+               [ 3.0, 15.0,  0.0],
+               [-4.0,  5.0, 20.0]])]
+))
+def test_periodic(cell_size, radius, box):
+    """
+    With periodic boundary conditions, the found atoms should be the
+    atoms with a periodic distance within the radius.
+    """
+    np.random.seed(0)
+    # Some atoms are also outside of the box
+    coord = np.dot(np.random.rand(200, 3) * 1.2 - 0.1, box)
+    cell_list = struc.CellList(coord, cell_size=cell_size, box=box)
+    pos = np.dot(np.random.rand(20, 3) * 2 - 0.5, box)
+    indices = cell_list.get_atoms(pos, radius)
+    for i in range(len(pos)):
+        dist = struc.distance(pos[i], coord, box=box)
+        ref_indices = np.where(dist <= radius)[0]
+        assert sorted(indices[i][indices[i] != -1].tolist()) \
+            == ref_indices.tolist()
+    # Atom pairs must be consistent with periodic distances as well
+    pairs = cell_list.get_atom_pairs(radius)
+    dist = struc.distance(
+        coord[:, np.newaxis, :], coord[np.newaxis, :, :], box=box
+    )
+    ref_pairs = np.stack(np.where(np.triu(dist <= radius, k=1)), axis=-1)
+    assert sorted(map(tuple, pairs.tolist())) \
+        == sorted(map(tuple, ref_pairs.tolist()))
+
+
+@pytest.mark.parametrize("periodic", [False, True])
+def test_pickle(periodic):
+    """
+    A pickled and unpickled cell list should give the same results as
+    the original one.
+    """
+    array = strucio.load_structure(join(data_dir, "3o5r.mmtf"))
+    array = array[struc.filter_amino_acids(array)]
+    box = np.diag(np.max(array.coord, axis=0) - np.min(array.coord, axis=0)) \
+          if periodic else None
+    cell_list = struc.CellList(array, cell_size=5, box=box)
+    restored_cell_list = pickle.loads(pickle.dumps(cell_list))
+    assert restored_cell_list.get_atom_pairs(5).tolist() \
+        == cell_list.get_atom_pairs(5).tolist()
+    assert restored_cell_list.get_atoms(array.coord[:10], 5).tolist() \
+        == cell_list.get_atoms(array.coord[:10], 5).tolist()
+
+
+@pytest.mark.parametrize("periodic", [False, True])
+def test_update(periodic):
+    """
+    Updating a cell list with new coordinates should give the same
+    atoms as a newly created cell list.
+    """
+    stack = strucio.load_structure(join(data_dir, "1l2y.mmtf"))
+    box = np.diag([30.0, 30.0, 30.0]) if periodic else None
+    cell_list = struc.CellList(stack[0], cell_size=3, box=box)
+    for model in stack[1:]:
+        cell_list.update(model)
+        ref_cell_list = struc.CellList(model, cell_size=3, box=box)
+        test_pairs = cell_list.get_atom_pairs(5)
+        ref_pairs = ref_cell_list.get_atom_pairs(5)
+        assert sorted(map(tuple, test_pairs.tolist())) \
+            == sorted(map(tuple, ref_pairs.tolist()))
+        test_mask = cell_list.get_atoms(model.coord[::10], 4, as_mask=True)
+        ref_mask = ref_cell_list.get_atoms(model.coord[::10], 4, as_mask=True)
+        assert test_mask.tolist() == ref_mask.tolist()
+    # Move all atoms outside of the current grid
+    coord = stack.coord[0] + 100
+    cell_list.update(coord)
+    ref_cell_list = struc.CellList(coord, cell_size=3, box=box)
+    assert cell_list.get_atoms(coord, 4, as_mask=True).tolist() \
+        == ref_cell_list.get_atoms(coord, 4, as_mask=True).tolist()
+
+
+@pytest.mark.parametrize("periodic", [False, True])
+def test_sparse_backend(periodic):
+    """
+    The sparse backend should give the same results as the dense one,
+    also for a structure with a very distant atom.
+    """
+    array = strucio.load_structure(join(data_dir, "3o5r.mmtf"))
+    coord = array.coord.copy()
+    # Move one atom far away from the rest of the structure
+    coord[0] += 300
+    if periodic:
+        box = np.diag(np.max(coord, axis=0) - np.min(coord, axis=0) + 10)
+    else:
+        box = None
+    dense_cell_list = struc.CellList(coord, cell_size=2, box=box)
+    sparse_cell_list = struc.CellList(
+        coord, cell_size=2, box=box, backend="sparse"
+    )
+    assert sparse_cell_list.get_atom_pairs(5).tolist() \
+        == dense_cell_list.get_atom_pairs(5).tolist()
+    assert sparse_cell_list.get_atoms(coord[::10], 5).tolist() \
+        == dense_cell_list.get_atoms(coord[::10], 5).tolist()
+    assert sparse_cell_list.get_atoms_in_cells(coord[::10], 2).tolist() \
+        == dense_cell_list.get_atoms_in_cells(coord[::10], 2).tolist()
+    # Test update
+    coord += np.random.rand(*coord.shape)
+    dense_cell_list.update(coord)
+    sparse_cell_list.update(coord)
+    assert sparse_cell_list.get_atom_pairs(5).tolist() \
+        == dense_cell_list.get_atom_pairs(5).tolist()
+
+
+@pytest.mark.parametrize("periodic, threads", itertools.product(
+    [False, True],
+    [2, 3, 50]
+))
+def test_threads(periodic, threads):
+    """
+    Processing the query positions in multiple threads should give the
+    same results as in a single thread.
+    """
+    array = strucio.load_structure(join(data_dir, "3o5r.mmtf"))
+    box = np.diag(np.max(array.coord, axis=0) - np.min(array.coord, axis=0)) \
+          if periodic else None
+    cell_list = struc.CellList(array, cell_size=3, box=box)
+    coord = array.coord[::20]
+    radii = np.linspace(1, 6, len(coord))
+    assert cell_list.get_atoms(coord, radii, threads=threads).tolist() \
+        == cell_list.get_atoms(coord, radii).tolist()
+    assert cell_list.get_atoms_in_cells(coord, 2, threads=threads).tolist() \
+        == cell_list.get_atoms_in_cells(coord, 2).tolist()
@@ -2,7 +2,11 @@
 # under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
 # information.
 
+from .util import data_dir
 import biotite.structure as struc
+import biotite.structure.io as strucio
+from os.path import join
+import itertools
 import numpy as np
 import pytest
 
@@ -20,4 +24,79 @@ def test_rmsd(stack):
 
 def test_rmsf(stack):
     assert struc.rmsf(struc.average(stack), stack).tolist() \
-           == pytest.approx([21.21320344] * 5)
\ No newline at end of file
+           == pytest.approx([21.21320344] * 5)
+
+
+@pytest.mark.parametrize("fit, threads, block_size", itertools.product(
+    [False, True],
+    [1, 3],
+    [1, 7, 1024]
+))
+def test_pairwise_rmsd(fit, threads, block_size):
+    """
+    The pairwise RMSD should be equal to the RMSD calculated for each
+    pair of models, optionally after superimposition.
+    """
+    stack = strucio.load_structure(join(data_dir, "1l2y.mmtf"))
+    # Rotate some models, so that the models are not prealigned
+    stack.coord[::2] = struc.rotate(stack[::2], (1,2,3)).coord
+    test_rmsd = struc.pairwise_rmsd(
+        stack, fit=fit, threads=threads, block_size=block_size
+    )
+    ref_rmsd = np.zeros(test_rmsd.shape)
+    for i, model in enumerate(stack):
+        if fit:
+            fitted, _ = struc.superimpose(model, stack)
+            ref_rmsd[i] = struc.rmsd(model, fitted)
+        else:
+            ref_rmsd[i] = struc.rmsd(model, stack)
+    assert np.allclose(test_rmsd, ref_rmsd, atol=1e-3)
+
+
+def test_pairwise_rmsd_memmap(tmpdir):
+    """
+    Writing the pairwise RMSD into a memory-mapped file should give
+    the same result as an in-memory calculation.
+    """
+    stack = strucio.load_structure(join(data_dir, "1l2y.mmtf"))
+    n_models = stack.stack_depth()
+    out = np.memmap(
+        join(tmpdir, "rmsd.dat"), dtype=np.float32, mode="w+",
+        shape=(n_models, n_models)
+    )
+    struc.pairwise_rmsd(stack, out=out, block_size=5)
+    del out
+    test_rmsd = np.memmap(
+        join(tmpdir, "rmsd.dat"), dtype=np.float32, mode="r",
+        shape=(n_models, n_models)
+    )
+    ref_rmsd = struc.pairwise_rmsd(stack)
+    assert test_rmsd.tolist() == ref_rmsd.tolist()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 38, 100])
+def test_stream(chunk_size):
+    """
+    The streaming variants of the comparison functions should give the
+    same results as the functions working on the entire stack.
+    """
+    stack = strucio.load_structure(join(data_dir, "1l2y.mmtf"))
+    reference = stack[0]
+    chunks = [
+        stack.coord[i : i+chunk_size]
+        for i in range(0, stack.stack_depth(), chunk_size)
+    ]
+    assert np.allclose(
+        struc.rmsd_stream(reference, chunks), struc.rmsd(reference, stack)
+    )
+    assert np.allclose(
+        struc.rmsf_stream(reference, chunks), struc.rmsf(reference, stack)
+    )
+    ref_average = struc.average(stack)
+    test_average = struc.average_stream(reference, chunks)
+    assert np.allclose(test_average.coord, ref_average.coord, atol=1e-5)
+    assert np.allclose(
+        struc.rmsf_stream(None, iter(chunks)),
+        struc.rmsf(ref_average, stack),
+        atol=1e-5
+    )
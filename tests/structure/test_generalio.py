@@ -8,6 +8,7 @@ import biotite.structure.io as strucio
 import numpy as np
 import glob
 import itertools
+import functools
 from os.path import join, basename, splitext
 from .util import data_dir
 import pytest
@@ -37,3 +38,64 @@ def test_saving(suffix):
     array = strucio.load_structure(join(data_dir, "1l2y.mmtf"))
     strucio.save_structure(biotite.temp_file("1l2y." + suffix),
                            array)
+
+
+@pytest.mark.parametrize(
+    "suffix, single_model",
+    itertools.product(["pdb", "cif", "gro", "mmtf"], [False, True])
+)
+def test_coord_dtype(suffix, single_model):
+    """
+    The file readers should create coordinates with the requested data
+    type.
+    """
+    model = 1 if single_model else None
+    path = join(data_dir, "1l2y." + suffix)
+    if suffix == "pdb":
+        import biotite.structure.io.pdb as pdb
+        file = pdb.PDBFile()
+        file.read(path)
+        get_structure = file.get_structure
+    elif suffix == "cif":
+        import biotite.structure.io.pdbx as pdbx
+        file = pdbx.PDBxFile()
+        file.read(path)
+        get_structure = functools.partial(pdbx.get_structure, file)
+    elif suffix == "gro":
+        import biotite.structure.io.gro as gro
+        file = gro.GROFile()
+        file.read(path)
+        get_structure = file.get_structure
+    elif suffix == "mmtf":
+        import biotite.structure.io.mmtf as mmtf
+        file = mmtf.MMTFFile()
+        file.read(path)
+        get_structure = functools.partial(mmtf.get_structure, file)
+    ref_atoms = get_structure(model=model)
+    # By default the readers keep the native precision of the format
+    if suffix == "mmtf":
+        assert ref_atoms.coord.dtype == np.float32
+    else:
+        assert ref_atoms.coord.dtype == np.float64
+    for dtype in (np.float32, np.float64):
+        test_atoms = get_structure(model=model, coord_dtype=dtype)
+        assert test_atoms.coord.dtype == dtype
+        assert test_atoms.equal_annotations(ref_atoms)
+        assert np.allclose(test_atoms.coord, ref_atoms.coord, atol=1e-3)
+
+
+def test_load_structure_coord_dtype():
+    """
+    Loading a multi-model MMTF file must keep the single precision
+    coordinates, unless a data type is given explicitly.
+    """
+    path = join(data_dir, "1l2y.mmtf")
+    stack = strucio.load_structure(path)
+    assert isinstance(stack, struc.AtomArrayStack)
+    assert stack.coord.dtype == np.float32
+    stack = strucio.load_structure(path, coord_dtype=np.float64)
+    assert stack.coord.dtype == np.float64
+    array = strucio.load_structure(
+        join(data_dir, "1l2y.pdb"), coord_dtype=np.float32
+    )
+    assert array.coord.dtype == np.float32
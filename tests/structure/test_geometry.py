@@ -4,6 +4,7 @@
 
 import biotite.structure as struc
 import biotite.structure.io.npz as npz
+import itertools
 import numpy as np
 from os.path import join
 from .util import data_dir
@@ -33,6 +34,52 @@ def test_dihedral():
     assert struc.dihedral(coord1, coord2, coord3, coord4) \
            == pytest.approx(0.5*np.pi)
 
+@pytest.mark.parametrize("box", [
+    np.diag([10.0, 20.0, 30.0]),
+    np.array([[10.0,  0.0,  0.0],
+              [ 3.0, 20.0,  0.0],
+              [-4.0,  5.0, 30.0]])
+])
+def test_periodic_distance(box):
+    """
+    The distance with periodic boundary conditions should be equal to
+    the distance of the closest periodic copy, found by brute force.
+    """
+    np.random.seed(0)
+    fractions = np.random.rand(2, 100, 3) * 3 - 1
+    coord1, coord2 = np.dot(fractions, box)
+    ref_dist = np.full(100, np.inf)
+    for shift in itertools.product(range(-3, 4), repeat=3):
+        dist = struc.distance(coord1, coord2 + np.dot(shift, box))
+        ref_dist = np.minimum(ref_dist, dist)
+    assert struc.distance(coord1, coord2, box=box).tolist() \
+        == pytest.approx(ref_dist.tolist())
+
+def test_periodic_geometry():
+    """
+    Moving atoms by multiples of the box vectors must not change
+    periodic distances, angles and dihedral angles.
+    """
+    stack = npz.NpzFile()
+    stack.read(join(data_dir, "1l2y.npz"))
+    stack = stack.get_structure()
+    box = np.array([[80.0,  0.0,  0.0],
+                    [10.0, 90.0,  0.0],
+                    [ 5.0, 10.0, 70.0]])
+    boxes = np.repeat(box[np.newaxis, ...], stack.stack_depth(), axis=0)
+    np.random.seed(0)
+    shifts = np.random.randint(-2, 3, size=(stack.array_length(), 3))
+    shifted_coord = stack.coord + np.dot(shifts, box)
+    for function, n_atoms in [
+        (struc.distance, 2), (struc.angle, 3), (struc.dihedral, 4)
+    ]:
+        indices = [np.arange(i, stack.array_length() - n_atoms + i)
+                   for i in range(n_atoms)]
+        ref = function(*[stack.coord[:, i] for i in indices])
+        test = function(*[shifted_coord[:, i] for i in indices], box=boxes)
+        assert test.flatten().tolist() \
+            == pytest.approx(ref.flatten().tolist(), abs=1e-5)
+
 def test_dihedral_backbone():
     file = npz.NpzFile()
     file.read(join(data_dir, "1l2y.npz"))
@@ -8,6 +8,7 @@ import pytest
 import biotite
 import biotite.structure as struc
 from biotite.structure.io import load_structure, save_structure
+import biotite.structure.io.mmtf as mmtf
 from .util import data_dir
 
 
@@ -121,6 +122,51 @@ def test_hbond_single_selection():
     assert len(triplets) == 2
 
 
+@pytest.mark.parametrize("pdb_id", ["1l2y", "1gya"])
+def test_hbond_with_bonds(pdb_id):
+    """
+    The hydrogen atoms of donors taken from the associated `BondList`
+    should give the same hydrogen bonds as the hydrogen atoms found by
+    distance.
+    """
+    mmtf_file = mmtf.MMTFFile()
+    mmtf_file.read(join(data_dir, pdb_id+".mmtf"))
+    stack = mmtf.get_structure(mmtf_file, include_bonds=True)
+    assert stack.bonds is not None
+    ref_triplets, ref_mask = struc.hbond(stack)
+    stack.bonds = None
+    test_triplets, test_mask = struc.hbond(stack)
+    assert test_triplets.tolist() == ref_triplets.tolist()
+    assert test_mask.tolist() == ref_mask.tolist()
+
+
+@pytest.mark.parametrize("chunk_size, processes", [(1, 1), (7, 1), (7, 2)])
+def test_hbond_stream(chunk_size, processes):
+    """
+    The hydrogen bonds found in chunks of a trajectory should be the
+    same as the ones found in the entire trajectory.
+    """
+    stack = load_structure(join(data_dir, "1l2y.mmtf"))
+    ref_triplets, ref_mask = struc.hbond(stack)
+    chunks = (
+        stack.coord[i : i+chunk_size]
+        for i in range(0, stack.stack_depth(), chunk_size)
+    )
+    test_triplets, (indptr, indices) = struc.hbond_stream(
+        stack[0], chunks, processes=processes
+    )
+    assert len(indptr) == stack.stack_depth() + 1
+    # The order of triplets may differ -> compare sets of triplets
+    for model_i in range(stack.stack_depth()):
+        test_set = set(map(
+            tuple,
+            test_triplets[indices[indptr[model_i] : indptr[model_i+1]]]
+            .tolist()
+        ))
+        ref_set = set(map(tuple, ref_triplets[ref_mask[model_i]].tolist()))
+        assert test_set == ref_set
+
+
 def test_hbond_frequency():
     mask = np.array([
         [True, True, True, True, True], # 1.0
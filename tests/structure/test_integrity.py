@@ -41,4 +41,37 @@ def test_bond_continuity_check(gapped_sample_array):
 
 def test_duplicate_atoms_check(duplicate_sample_array):
     discon = struc.check_duplicate_atoms(duplicate_sample_array)
-    assert discon.tolist() == [42,234]
\ No newline at end of file
+    assert discon.tolist() == [42,234]
+
+def test_duplicate_atoms_order(sample_array):
+    """
+    The first occurence of an atom should not be counted as duplicate,
+    even if the atom is duplicated to a lower index.
+    """
+    sample_array[5] = sample_array[100]
+    sample_array[6] = sample_array[100]
+    sample_array[200] = sample_array[100]
+    duplicates = struc.check_duplicate_atoms(sample_array)
+    assert duplicates.tolist() == [6, 100, 200]
+    # Concatenating an array with itself duplicates all atoms
+    doubled_array = sample_array + sample_array
+    duplicates = struc.check_duplicate_atoms(doubled_array)
+    length = sample_array.array_length()
+    assert duplicates.tolist() \
+        == [6, 100, 200] + list(range(length, 2*length))
+
+def test_duplicate_atoms_nan(sample_array):
+    """
+    As *NaN* is not equal to *NaN*, atoms with *NaN* annotations should
+    not be counted as duplicates.
+    """
+    atoms = sample_array[:3]
+    atoms.coord[:] = 0
+    for category in atoms.get_annotation_categories():
+        atoms.get_annotation(category)[:] = atoms.get_annotation(category)[0]
+    atoms.add_annotation("b_factor", dtype=float)
+    atoms.b_factor[:] = np.nan
+    assert struc.check_duplicate_atoms(atoms).tolist() == []
+    # Finite float annotations are still compared by value
+    atoms.b_factor[:] = [np.nan, 1.0, 1.0]
+    assert struc.check_duplicate_atoms(atoms).tolist() == [2]
@@ -6,6 +6,8 @@ import biotite.structure as struc
 import biotite.structure.io.npz as npz
 import numpy as np
 from os.path import join
+import glob
+import itertools
 from .util import data_dir
 import pytest
 
@@ -32,4 +34,74 @@ def test_get_residues(array):
     assert names.tolist() == ["ASN","LEU","TYR","ILE","GLN","TRP","LEU","LYS",
                               "ASP","GLY","GLY","PRO","SER","SER","GLY","ARG",
                               "PRO","PRO","PRO","SER"]
-    assert len(ids) == struc.get_residue_count(array)
\ No newline at end of file
+    assert len(ids) == struc.get_residue_count(array)
+
+@pytest.mark.parametrize("path", glob.glob(join(data_dir, "*.npz")))
+def test_get_residue_starts(path):
+    """
+    The residue starts should be the atoms, where the chain ID, the
+    residue ID or, for residue ID *-1*, the residue name differs from
+    the previous atom.
+    """
+    file = npz.NpzFile()
+    file.read(path)
+    array = file.get_structure()
+    if isinstance(array, struc.AtomArrayStack):
+        array = array[0]
+    # Treat some residues as hetero residues
+    array.res_id[array.hetero] = -1
+    ref_starts = [0]
+    for i in range(1, array.array_length()):
+        if array.res_id[i] == -1:
+            is_change = array.res_name[i] != array.res_name[i-1]
+        else:
+            is_change = array.res_id[i] != array.res_id[i-1]
+        if is_change or array.chain_id[i] != array.chain_id[i-1]:
+            ref_starts.append(i)
+    assert struc.get_residue_starts(array).tolist() == ref_starts
+
+def test_residue_starts_cache(array):
+    """
+    Cached residue starts should be reused, until the annotations are
+    changed.
+    """
+    starts = struc.get_residue_starts(array, cache=True)
+    assert starts.tolist() == struc.get_residue_starts(array).tolist()
+    # Modifying the returned array must not affect the cache
+    starts[:] = 0
+    assert struc.get_residue_count(array) == 20
+    # Setting an annotation discards the cache
+    array.res_id = np.zeros(array.array_length(), dtype=int)
+    assert struc.get_residue_count(array) == 1
+    # In-place modifications are not detected without recomputation
+    struc.get_residue_starts(array, cache=True)
+    array.res_id[100:] = 1
+    assert struc.get_residue_count(array) == 1
+    del array[0]
+    assert struc.get_residue_count(array) == 2
+
+@pytest.mark.parametrize("function, axis, dtype", itertools.product(
+    [np.sum, np.nansum, np.mean, np.average, np.min, np.max],
+    [None, 0],
+    [np.float32, np.float64, np.int32, bool]
+))
+def test_apply_residue_wise_reduction(array, function, axis, dtype):
+    """
+    The fast path for NumPy reductions should give the same result as
+    applying the function to each residue individually.
+    """
+    np.random.seed(0)
+    if axis is None:
+        data = np.random.rand(array.array_length()) * 10
+    else:
+        data = np.random.rand(array.array_length(), 3) * 10
+    data = data.astype(dtype)
+    if dtype in (np.float32, np.float64):
+        data[::7] = np.nan
+    test_data = struc.apply_residue_wise(array, data, function, axis)
+    # Wrapping the function disables the fast path
+    ref_data = struc.apply_residue_wise(
+        array, data, lambda *args, **kwargs: function(*args, **kwargs), axis
+    )
+    assert test_data.dtype == ref_data.dtype
+    assert np.allclose(test_data, ref_data, equal_nan=True)
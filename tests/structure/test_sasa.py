@@ -3,6 +3,7 @@
 # information.
 
 from os.path import join
+import itertools
 import pytest
 import numpy as np
 import biotite.structure as struc
@@ -72,4 +73,81 @@ def test_coarse_grained(pdb_id):
     # have less than 50% SASA difference
     assert np.count_nonzero(
         np.isclose(sasa, sasa_exp, rtol=5e-1, atol=1)
-    ) / len(sasa) > 0.98
\ No newline at end of file
+    ) / len(sasa) > 0.98
+
+@pytest.mark.parametrize("threads, method", itertools.product(
+    [1, 2, 4],
+    ["ShrakeRupley", "Probabilistic"]
+))
+def test_stack(threads, method):
+    """
+    The SASA of each model in a stack should be equal to the SASA of
+    the respective model given as single array, independent of the
+    number of threads.
+    """
+    file = mmtf.MMTFFile()
+    file.read(join(data_dir, "1l2y.mmtf"))
+    stack = mmtf.get_structure(file)
+    sasa = struc.sasa(stack, threads=threads, method=method)
+    assert sasa.shape == (stack.stack_depth(), stack.array_length())
+    for i, model in enumerate(stack):
+        ref_sasa = struc.sasa(model, method=method)
+        assert np.allclose(sasa[i], ref_sasa, equal_nan=True)
+
+
+def test_radii_table():
+    """
+    The vectorized radius assignment of a `RadiiTable` should be equal
+    to the lookup of each single atom and follow the lookup order.
+    """
+    file = mmtf.MMTFFile()
+    file.read(join(data_dir, "1l2y.mmtf"))
+    array = mmtf.get_structure(file, model=1)
+    table = struc.RadiiTable(
+        residue_radii={"ASN": {"CA": 2.0}, "TRP": {"CB": 2.1}},
+        element_radii={"c": 1.7, "N": 1.55},
+        default=1.0
+    )
+    radii = table.get_radii(array)
+    ref_radii = [
+        table.get_radius(res_name, atom_name, element)
+        for res_name, atom_name, element
+        in zip(array.res_name, array.atom_name, array.element)
+    ]
+    assert radii.tolist() == np.array(ref_radii, dtype=np.float32).tolist()
+    assert table.get_radius("ASN", "CA", "C") == 2.0
+    assert table.get_radius("GLY", "CA", "C") == 1.7
+    assert table.get_radius("GLY", "O", "O") == 1.0
+    # Filtered atoms are not looked up
+    mask = array.element != "H"
+    assert np.isnan(table.get_radii(array, mask)[~mask]).all()
+    # Without default, unknown atoms raise an error
+    with pytest.raises(KeyError):
+        struc.RadiiTable(element_radii={"C": 1.7}).get_radii(array)
+    # A table can be used for SASA calculation
+    assert np.allclose(
+        struc.sasa(array, vdw_radii=table),
+        struc.sasa(array, vdw_radii=radii),
+        equal_nan=True
+    )
+
+
+@pytest.mark.parametrize("pdb_id", ["1l2y", "1gya", "3o5r"])
+def test_probabilistic(pdb_id):
+    """
+    The per-residue SASA from the probabilistic approximation should
+    correlate with the Shrake-Rupley results within the documented
+    accuracy.
+    """
+    file = mmtf.MMTFFile()
+    file.read(join(data_dir, pdb_id+".mmtf"))
+    array = mmtf.get_structure(file, model=1)
+    array = array[struc.filter_amino_acids(array)]
+    ref_sasa = struc.sasa(array)
+    test_sasa = struc.sasa(array, method="Probabilistic")
+    # SASA is calculated for the same atoms
+    assert (np.isnan(test_sasa) == np.isnan(ref_sasa)).all()
+    ref_res_sasa = struc.apply_residue_wise(array, ref_sasa, np.nansum)
+    test_res_sasa = struc.apply_residue_wise(array, test_sasa, np.nansum)
+    assert np.corrcoef(test_res_sasa, ref_res_sasa)[0,1] > 0.85
+    assert np.nansum(test_sasa) == pytest.approx(np.nansum(ref_sasa), rel=0.2)
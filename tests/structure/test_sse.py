@@ -16,4 +16,41 @@ def test_sse():
     sse_str = "".join(sse.tolist())
     assert sse_str == ("caaaaaacccccccccccccbbbbbccccccbbbbccccccccccccccc"
                        "ccccccccccccbbbbbbcccccccaaaaaaaaaccccccbbbbbccccc"
-                       "ccccccccccccbbbbbbbccccccccc")
\ No newline at end of file
+                       "ccccccccccccbbbbbbbccccccccc")
+
+@pytest.mark.parametrize("length", [0, 1, 2, 3, 4, 5, 10])
+def test_short_chain(length):
+    """
+    Chains with only a few residues should be annotated without errors.
+    """
+    array = strucio.load_structure(join(data_dir, "3o5r.mmtf"))
+    array = array[struc.filter_amino_acids(array) & (array.chain_id == "A")]
+    array = array[array.res_id < array.res_id[0] + length]
+    sse = struc.annotate_sse(array, "A")
+    assert len(sse) == length
+    assert np.isin(sse, ["a", "b", "c"]).all()
+
+
+def test_all_chains():
+    """
+    Annotating all chains at once should give the same result as
+    annotating each chain separately.
+    """
+    array = strucio.load_structure(join(data_dir, "1igy.mmtf"))
+    ref_sse = np.concatenate([
+        struc.annotate_sse(array, chain_id)
+        for chain_id in np.unique(array.chain_id)
+    ])
+    assert struc.annotate_sse(array).tolist() == ref_sse.tolist()
+
+
+def test_stack():
+    """
+    Annotating a stack should give the same result as annotating each
+    model separately.
+    """
+    stack = strucio.load_structure(join(data_dir, "1l2y.mmtf"))
+    sse = struc.annotate_sse(stack)
+    assert sse.shape == (stack.stack_depth(), 20)
+    for model, model_sse in zip(stack, sse):
+        assert model_sse.tolist() == struc.annotate_sse(model, "A").tolist()
@@ -51,3 +51,33 @@ def test_superimposition_stack(ca_only):
         # The superimpositions are better than the superimpositions
         # in the structure file
         assert (struc.rmsd(fixed, fitted) < struc.rmsd(fixed, mobile)).all()
+
+
+def test_superimposition_batched():
+    """
+    The superimposition of all models of a stack at once should give
+    the same result as the superimposition of each model separately.
+    """
+    path = join(data_dir, "1l2y.cif")
+    pdbx_file = pdbx.PDBxFile()
+    pdbx_file.read(path)
+    stack = pdbx.get_structure(pdbx_file)
+    fixed = stack[0]
+    mobile = stack[1:]
+    # Rotate some models, so that the models are not prealigned
+    mobile.coord[::2] = struc.rotate(mobile[::2], (1,2,3)).coord
+    fitted, (translation1, rotation, translation2) \
+        = struc.superimpose(fixed, mobile)
+    assert translation1.shape == (mobile.stack_depth(), 3)
+    assert rotation.shape == (mobile.stack_depth(), 3, 3)
+    assert translation2.shape == (mobile.stack_depth(), 3)
+    for i, model in enumerate(mobile):
+        ref_fitted, ref_transformation = struc.superimpose(fixed, model)
+        assert np.allclose(fitted.coord[i], ref_fitted.coord, atol=1e-4)
+        assert np.allclose(rotation[i], ref_transformation[1], atol=1e-6)
+    # Applying the transformation to the stack should give the same
+    # coordinates
+    applied = struc.superimpose_apply(
+        mobile, (translation1, rotation, translation2)
+    )
+    assert np.allclose(applied.coord, fitted.coord)
@@ -30,4 +30,27 @@ def test_PDBx_consistency(format):
     for cat in array1. get_annotation_categories():
         assert array1.get_annotation(cat).tolist() == \
                array2.get_annotation(cat).tolist()
-        assert array1.coord == pytest.approx(array2.coord)
\ No newline at end of file
+        assert array1.coord == pytest.approx(array2.coord)
+
+@pytest.mark.xfail(raises=ImportError)
+@pytest.mark.parametrize(
+    "format, chunk_size, start, stop",
+    [(format, chunk_size, start, stop)
+     for format in ["trr", "xtc"]
+     for chunk_size in [1, 3, 100]
+     for start, stop in [(None, None), (5, None), (5, 20), (0, 7)]]
+)
+def test_read_chunks(format, chunk_size, start, stop):
+    """
+    The concatenated chunks should give the same coordinates as reading
+    the same frame range at once.
+    """
+    if format == "trr":
+        traj_file = trr.TRRFile()
+    if format == "xtc":
+        traj_file = xtc.XTCFile()
+    path = join(data_dir, "1l2y." + format)
+    traj_file.read(path, start, stop)
+    chunks = list(traj_file.read_chunks(path, chunk_size, start, stop))
+    assert all(len(chunk) <= chunk_size for chunk in chunks)
+    assert np.concatenate(chunks) == pytest.approx(traj_file.get_coord())